@@ -101,6 +101,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, TclError, simpledialog
 _label_match_startup_trace("after_tkinter_import")
 from collections import defaultdict
+from collections.abc import Mapping
 import csv
 import io
 import threading
@@ -111,6 +112,7 @@ import shutil
 import tkinter.font as tkFont
 import queue
 import socket
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 _label_match_startup_trace("before_requests_import")
 import requests
 from item_catalog_sync import (
@@ -137,7 +139,11 @@ from package_logistics import (
     PackageCommandDraft,
     PackageLogisticsError,
     PackageOutbox,
+    PACKAGE_OUTBOX_DRAIN_BATCH,
+    PACKAGE_OUTBOX_IDLE_POLL_SECONDS,
     PackageOutboxProcessor,
+    PackageOutboxScheduler,
+    PooledHttpsTransport,
     canonical_barcodes,
     package_client_from_env,
 )
@@ -165,8 +171,22 @@ from phs_label_workflow import (
     normalize_packaging_phs_label_evidence,
 )
 from logistics_runtime_profile import logistics_runtime_required
+from label_match_event_index import (
+    EVENT_INDEX_FILENAME,
+    EventIndexError,
+    EventLogTail,
+    LabelMatchEventIndex,
+    event_index_keys,
+    read_csv_record,
+)
+from label_match_duplicate_index import (
+    DUPLICATE_INDEX_FILENAME,
+    DuplicateBarcodeIndex,
+    DuplicateIndexError,
+)
 from ui.operator_layout import build_operator_layout
 from ui.style_tokens import build_style_tokens
+from ui.text_measure_cache import TextMeasureCache
 from ui.workflow_snapshot_adapter import adapt_workflow_snapshot
 from ui.workflow_view_state import WorkflowNotice, operator_safe_message, present_workflow
 
@@ -194,6 +214,16 @@ LABEL_MATCH_DURABLE_EVENT_TYPES = {
     "POST_REVIEW_REQUIRED",
 }
 LABEL_MATCH_SAVE_DIR_ENV = "LABEL_MATCH_SAVE_DIR"
+LABEL_MATCH_EVENT_INDEX_ENV = "LABEL_MATCH_EVENT_INDEX"
+# Completed sets stay duplicate-protected across days for this many days;
+# ``duplicate_index_retention_days`` in app_settings.json overrides it and 0
+# turns the persistent index off (same-day checks are unaffected).
+LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS = 90
+LABEL_MATCH_DUPLICATE_INDEX_EVENT_TYPES = {
+    "TRAY_COMPLETE": "set_id",
+    "SET_DELETED": "set_id",
+    "TRAY_COMPLETION_CANCELLED": "cancelled_set_id",
+}
 LABEL_MATCH_DEFAULT_SAVE_SUBDIR = ("KMTech", "Label_Match", "data")
 LABEL_MATCH_DIRECT_SYNC_BOOTSTRAP_ENV = "LABEL_MATCH_DIRECT_SYNC_BOOTSTRAP"
 LABEL_MATCH_DIRECT_SYNC_SERVER_BASE_URL_ENV = "LABEL_MATCH_DIRECT_SYNC_SERVER_BASE_URL"
@@ -208,13 +238,26 @@ LABEL_MATCH_DIRECT_SYNC_ALLOW_INTERACTIVE_TASK_FOR_LOCAL_TEST_ENV = (
     "LABEL_MATCH_DIRECT_SYNC_ALLOW_INTERACTIVE_TASK_FOR_LOCAL_TEST"
 )
 LABEL_MATCH_SESSION_SYNC_TRIGGER_ENV = "LABEL_MATCH_SESSION_SYNC_TRIGGER"
+LABEL_MATCH_SESSION_SYNC_RESIDENT_ENV = "LABEL_MATCH_SESSION_SYNC_RESIDENT"
+LABEL_MATCH_SESSION_SYNC_SERVE_FLAG = "--serve"
 LABEL_MATCH_SESSION_SYNC_REQUEST_TIMEOUT_SECONDS = 15
 LABEL_MATCH_SESSION_SYNC_PROCESS_TIMEOUT_SECONDS = 45
 LABEL_MATCH_SESSION_SYNC_TERMINATION_GRACE_SECONDS = 5
+# After the targeted delta, a session sync also catches up queued backlog for
+# a few seconds; the worst case (targeted upload, drain budget, one batch
+# still in flight) stays inside the request budget.
+LABEL_MATCH_SESSION_SYNC_MAX_BATCHES = 20
+LABEL_MATCH_SESSION_SYNC_MAX_DRAIN_SECONDS = 5
+LABEL_MATCH_SESSION_SYNC_MAX_CONCURRENT_UPLOADS = 2
 LABEL_MATCH_APP_CLOSE_LOG_TIMEOUT_SECONDS = 10
 LABEL_MATCH_APP_CLOSE_TOTAL_TIMEOUT_SECONDS = 105
 LABEL_MATCH_TK_SHUTDOWN_THREAD_TIMEOUT_SECONDS = 5
 _LABEL_MATCH_SESSION_SYNC_LOCK = threading.Lock()
+_LABEL_MATCH_SESSION_SYNC_HELPER_LOCK = threading.Lock()
+_LABEL_MATCH_SESSION_SYNC_HELPER = None
+_LABEL_MATCH_SESSION_SYNC_HELPER_UNSUPPORTED = set()
+_LABEL_MATCH_SESSION_SYNC_LATENCY = {}
+_LABEL_MATCH_SESSION_SYNC_LATENCY_LOCK = threading.Lock()
 LABEL_MATCH_AUDIO_ENABLED_ENV = "LABEL_MATCH_AUDIO_ENABLED"
 LABEL_MATCH_AUTOMATED_TEST_ENV = "LABEL_MATCH_AUTOMATED_TEST"
 LABEL_MATCH_CAPTURE_STARTUP_GEOMETRY_ENV = "LABEL_MATCH_CAPTURE_STARTUP_GEOMETRY"
@@ -321,6 +364,16 @@ def _label_match_session_sync_trigger_enabled():
     return value not in {"0", "false", "no", "off", "disabled"}
 
 
+def _label_match_session_sync_resident_enabled():
+    value = os.environ.get(LABEL_MATCH_SESSION_SYNC_RESIDENT_ENV, "on").strip().lower()
+    return value not in {"0", "false", "no", "off", "disabled"}
+
+
+def _label_match_event_index_enabled():
+    value = os.environ.get(LABEL_MATCH_EVENT_INDEX_ENV, "on").strip().lower()
+    return value not in {"0", "false", "no", "off", "disabled"}
+
+
 def _label_match_audio_enabled():
     if _label_match_automated_test_mode():
         return False
@@ -348,8 +401,12 @@ def label_match_test_tools_enabled(*, run_tests: bool = False) -> bool:
 
 
 def label_match_startup_package_client():
-    """Load the protected profile without probing the network before Tk."""
-    return package_client_from_env(probe_required=False)
+    """Load the protected profile without probing the network before Tk.
+
+    The session client keeps its logistics HTTPS connections alive, so the
+    back-to-back resolve/receipt/create calls of one scan share a handshake.
+    """
+    return package_client_from_env(probe_required=False, transport=PooledHttpsTransport())
 
 
 def _label_match_capture_startup_request():
@@ -1064,6 +1121,200 @@ def _label_match_run_direct_sync_task(context):
         return {"status": "FAIL", "error": str(exc)}
 
 
+class _LabelMatchSessionSyncHelperUnavailable(RuntimeError):
+    """The resident relay runner could not take or answer a request."""
+
+
+class _LabelMatchSessionSyncHelper:
+    """Resident ``direct_sync_relay_runner --serve`` process for session syncs.
+
+    Requests and responses are JSON lines over the helper's stdin/stdout.  A
+    helper that times out is terminated like a one-shot runner; the next
+    request starts a fresh one.
+    """
+
+    def __init__(self, program, env):
+        self.program = list(program)
+        self.env = dict(env)
+        self.process = None
+        self.responses = queue.Queue()
+        self.requests_answered = 0
+
+    def matches(self, program, env):
+        return (
+            self.program == list(program)
+            and self.env.get(LABEL_MATCH_SAVE_DIR_ENV) == env.get(LABEL_MATCH_SAVE_DIR_ENV)
+        )
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        creationflags = _label_match_subprocess_creationflags()
+        if os.name == "nt":
+            creationflags |= getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+        self.process = subprocess.Popen(
+            self.program + [LABEL_MATCH_SESSION_SYNC_SERVE_FLAG],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=self.env,
+            creationflags=creationflags,
+        )
+        responses = self.responses
+        stdout = self.process.stdout
+
+        def read_responses():
+            try:
+                for line in stdout:
+                    responses.put(line)
+            except (OSError, ValueError):
+                pass
+            finally:
+                responses.put(None)
+
+        threading.Thread(
+            target=read_responses,
+            daemon=True,
+            name="label-match-session-sync-helper-reader",
+        ).start()
+
+    def request(self, args, *, timeout_seconds):
+        started = time.monotonic()
+        try:
+            self.process.stdin.write(json.dumps({"argv": list(args)}) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            raise _LabelMatchSessionSyncHelperUnavailable(f"helper request failed: {exc}") from exc
+        try:
+            line = self.responses.get(timeout=max(0.1, float(timeout_seconds)))
+        except queue.Empty:
+            termination = self.close(terminate=True)
+            return {
+                "returncode": int(self.process.returncode if self.process.returncode is not None else -1),
+                "stdout": "",
+                "stderr": "",
+                "timed_out": True,
+                "process_tree_termination": termination,
+                "elapsed_seconds": round(time.monotonic() - started, 3),
+            }
+        if line is None:
+            raise _LabelMatchSessionSyncHelperUnavailable("helper exited before answering")
+        try:
+            response = json.loads(line)
+        except ValueError as exc:
+            self.close(terminate=True)
+            raise _LabelMatchSessionSyncHelperUnavailable("helper answered with a malformed line") from exc
+        self.requests_answered += 1
+        return {
+            "returncode": int(response.get("returncode") or 0),
+            "stdout": str(response.get("stdout") or ""),
+            "stderr": str(response.get("stderr") or ""),
+            "timed_out": False,
+            "process_tree_termination": {"attempted": False, "tree_terminated": True, "method": "resident_helper"},
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+        }
+
+    def close(self, *, terminate=False):
+        process = self.process
+        if process is None:
+            return {"attempted": False, "tree_terminated": True, "method": "not_started"}
+        if not terminate:
+            try:
+                process.stdin.close()
+                process.wait(timeout=LABEL_MATCH_SESSION_SYNC_TERMINATION_GRACE_SECONDS)
+                return {"attempted": False, "tree_terminated": True, "method": "stdin_closed"}
+            except Exception:
+                pass
+        return _label_match_terminate_process_tree(process)
+
+
+def _label_match_runner_program_length(command):
+    if len(command) > 1 and str(command[1]).lower().endswith(".py"):
+        return 2
+    return 1
+
+
+def _label_match_close_session_sync_helper():
+    global _LABEL_MATCH_SESSION_SYNC_HELPER
+    with _LABEL_MATCH_SESSION_SYNC_HELPER_LOCK:
+        helper = _LABEL_MATCH_SESSION_SYNC_HELPER
+        _LABEL_MATCH_SESSION_SYNC_HELPER = None
+    if helper is None:
+        return None
+    return helper.close()
+
+
+def _label_match_run_session_sync_command(command, *, timeout_seconds, env):
+    """Run one runner cycle on the resident helper, or as a one-shot process.
+
+    Runner builds without ``--serve`` support exit before answering the first
+    request; they are remembered and keep the one-shot path.
+    """
+
+    global _LABEL_MATCH_SESSION_SYNC_HELPER
+    program_length = _label_match_runner_program_length(command)
+    program = tuple(command[:program_length])
+    if not _label_match_session_sync_resident_enabled() or program in _LABEL_MATCH_SESSION_SYNC_HELPER_UNSUPPORTED:
+        completed = _label_match_run_bounded_subprocess(command, timeout_seconds=timeout_seconds, env=env)
+        return {**completed, "transport": "subprocess"}
+    with _LABEL_MATCH_SESSION_SYNC_HELPER_LOCK:
+        helper = _LABEL_MATCH_SESSION_SYNC_HELPER
+        if helper is not None and not (helper.matches(program, env) and helper.alive()):
+            helper.close()
+            helper = _LABEL_MATCH_SESSION_SYNC_HELPER = None
+        try:
+            if helper is None:
+                helper = _LabelMatchSessionSyncHelper(program, env)
+                helper.start()
+                _LABEL_MATCH_SESSION_SYNC_HELPER = helper
+            completed = helper.request(command[program_length:], timeout_seconds=timeout_seconds)
+        except (OSError, _LabelMatchSessionSyncHelperUnavailable) as exc:
+            _LABEL_MATCH_SESSION_SYNC_HELPER = None
+            if helper is not None and helper.requests_answered == 0:
+                _LABEL_MATCH_SESSION_SYNC_HELPER_UNSUPPORTED.add(program)
+            _label_match_startup_trace(
+                "session_direct_sync_helper_unavailable",
+                error_type=exc.__class__.__name__,
+                error=str(exc),
+            )
+            completed = _label_match_run_bounded_subprocess(command, timeout_seconds=timeout_seconds, env=env)
+            return {**completed, "transport": "subprocess"}
+        if completed["timed_out"]:
+            _LABEL_MATCH_SESSION_SYNC_HELPER = None
+        return {**completed, "transport": "resident_helper"}
+
+
+def _label_match_record_session_sync_latency(reason, latency_seconds):
+    with _LABEL_MATCH_SESSION_SYNC_LATENCY_LOCK:
+        stats = _LABEL_MATCH_SESSION_SYNC_LATENCY.setdefault(
+            str(reason),
+            {"count": 0, "last_seconds": 0.0, "max_seconds": 0.0, "total_seconds": 0.0},
+        )
+        stats["count"] += 1
+        stats["last_seconds"] = latency_seconds
+        stats["max_seconds"] = max(stats["max_seconds"], latency_seconds)
+        stats["total_seconds"] += latency_seconds
+
+
+def _label_match_session_sync_latency_snapshot():
+    """Return per-reason session sync latency (trigger to recorded result)."""
+
+    with _LABEL_MATCH_SESSION_SYNC_LATENCY_LOCK:
+        return {
+            reason: {
+                "count": stats["count"],
+                "last_seconds": round(stats["last_seconds"], 3),
+                "max_seconds": round(stats["max_seconds"], 3),
+                "mean_seconds": round(stats["total_seconds"] / stats["count"], 3),
+            }
+            for reason, stats in _LABEL_MATCH_SESSION_SYNC_LATENCY.items()
+        }
+
+
 def _label_match_direct_sync_runtime_paths(context):
     root = os.path.abspath(context["program_data_root"])
     return {
@@ -1133,6 +1384,12 @@ def _label_match_direct_sync_runner_command(context, *, min_source_file_age_seco
         "1",
         "--min-source-file-age-seconds",
         str(max(0, int(min_source_file_age_seconds or 0))),
+        "--max-batches",
+        str(LABEL_MATCH_SESSION_SYNC_MAX_BATCHES),
+        "--max-drain-seconds",
+        str(LABEL_MATCH_SESSION_SYNC_MAX_DRAIN_SECONDS),
+        "--max-concurrent-uploads",
+        str(LABEL_MATCH_SESSION_SYNC_MAX_CONCURRENT_UPLOADS),
     ])
     return command
 
@@ -1218,7 +1475,7 @@ def _label_match_run_session_direct_sync_once(
             "error_code": "session_sync_deadline_exhausted",
         }
     try:
-        completed = _label_match_run_bounded_subprocess(
+        completed = _label_match_run_session_sync_command(
             command,
             timeout_seconds=timeout_seconds,
             env=env,
@@ -1241,6 +1498,7 @@ def _label_match_run_session_direct_sync_once(
             "timed_out": completed["timed_out"],
             "process_tree_termination": completed["process_tree_termination"],
             "elapsed_seconds": completed["elapsed_seconds"],
+            "transport": completed.get("transport", "subprocess"),
             "current_delta_ack": ack_report,
         }
     except Exception as exc:
@@ -1257,6 +1515,7 @@ def _label_match_write_session_direct_sync_result(context, *, reason, result, wr
         "source_host_id": context["source_host_id"],
         "scan_source_dir": context["scan_source_dir"],
         "result": result,
+        "session_sync_latency": _label_match_session_sync_latency_snapshot(),
     }
     reason_key = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(reason)).strip("_").lower() or "unknown"
     latest_path = os.path.join(context["status_dir"], "label_match_session_direct_sync_trigger.json")
@@ -1279,6 +1538,7 @@ def _label_match_run_and_record_session_direct_sync(
     reason,
     deadline_monotonic=None,
 ):
+    triggered_monotonic = time.monotonic()
     lock_timeout = float(LABEL_MATCH_SESSION_SYNC_PROCESS_TIMEOUT_SECONDS + 10)
     if deadline_monotonic is not None:
         lock_timeout = min(lock_timeout, max(0.0, deadline_monotonic - time.monotonic()))
@@ -1305,6 +1565,9 @@ def _label_match_run_and_record_session_direct_sync(
         if deadline_monotonic is not None:
             run_kwargs["deadline_monotonic"] = deadline_monotonic
         result = _label_match_run_session_direct_sync_once(context, **run_kwargs)
+        latency_seconds = round(time.monotonic() - triggered_monotonic, 3)
+        _label_match_record_session_sync_latency(reason, latency_seconds)
+        result = {**result, "sync_latency_seconds": latency_seconds}
         try:
             evidence = _label_match_write_session_direct_sync_result(
                 context,
@@ -1552,18 +1815,50 @@ def _label_match_summary_date(details):
     ).strip()
 
 
-def _label_match_local_completion_event_exists(data_manager, set_id):
-    """Find an already-flushed TRAY_COMPLETE after a local commit crash window."""
+# Durable CSV projections that crash recovery must find exactly once, keyed by
+# the event-index column that carries their identity.
+LABEL_MATCH_DURABLE_PROJECTION_KEYS = {
+    "TRAY_COMPLETE": "set_id",
+    "PHS_REPLACEMENT_WAITING_MARKED": "dedupe_key",
+    "POST_REVIEW_REQUIRED": "review_event_id",
+}
+
 
-    identity = str(set_id or "").strip()
+def _label_match_event_log_scope(data_manager):
     save_directory = str(
         getattr(data_manager, "save_directory", "") or ""
     ).strip()
     process_name = str(getattr(data_manager, "process_name", "") or "").strip()
     unique_id = str(getattr(data_manager, "unique_id", "") or "").strip()
-    if not identity or not save_directory or not os.path.isdir(save_directory):
-        return False
-    prefix = f"{process_name}작업이벤트로그_{unique_id}_"
+    return save_directory, f"{process_name}작업이벤트로그_{unique_id}_"
+
+
+def _label_match_indexed_projection_key_exists(
+    data_manager, event_type, key_column, identity
+):
+    save_directory, prefix = _label_match_event_log_scope(data_manager)
+    event_index = getattr(data_manager, "event_index", None)
+    if isinstance(event_index, LabelMatchEventIndex):
+        # The owning writer indexes each row it appends, so after one catch-up
+        # of the files written before this session a lookup is a single query.
+        event_index.ensure_directory_synced(save_directory, prefix)
+        return event_index.event_exists(key_column, identity, event=event_type)
+    if not _label_match_event_index_enabled():
+        return None
+    event_index = LabelMatchEventIndex(
+        os.path.join(save_directory, EVENT_INDEX_FILENAME)
+    )
+    try:
+        event_index.sync_directory(save_directory, prefix)
+        return event_index.event_exists(key_column, identity, event=event_type)
+    finally:
+        event_index.close()
+
+
+def _label_match_scan_projection_key_exists(
+    data_manager, event_type, key_column, identity
+):
+    save_directory, prefix = _label_match_event_log_scope(data_manager)
     try:
         candidates = [
             os.path.join(save_directory, name)
@@ -1576,100 +1871,63 @@ def _label_match_local_completion_event_exists(data_manager, set_id):
         try:
             with open(path, "r", encoding="utf-8-sig", newline="") as handle:
                 for row in csv.DictReader(handle):
-                    if row.get("event") != "TRAY_COMPLETE":
+                    if row.get("event") != event_type:
                         continue
                     try:
                         details = json.loads(row.get("details") or "{}")
                     except (TypeError, ValueError, json.JSONDecodeError):
                         continue
-                    if str(details.get("set_id") or "").strip() == identity:
+                    if event_index_keys(event_type, details)[key_column] == identity:
                         return True
         except (OSError, csv.Error):
             continue
     return False
 
 
-def _label_match_replacement_waiting_event_exists(data_manager, dedupe_key):
-    """Find an fsynced replacement-waiting CSV projection by durable key."""
+def _label_match_durable_projection_key_exists(data_manager, event_type, key):
+    """Find an already-flushed durable CSV projection by its identity key."""
 
-    identity = str(dedupe_key or "").strip()
-    save_directory = str(
-        getattr(data_manager, "save_directory", "") or ""
-    ).strip()
-    process_name = str(getattr(data_manager, "process_name", "") or "").strip()
-    unique_id = str(getattr(data_manager, "unique_id", "") or "").strip()
+    identity = str(key or "").strip()
+    save_directory, _prefix = _label_match_event_log_scope(data_manager)
     if not identity or not save_directory or not os.path.isdir(save_directory):
         return False
-    prefix = f"{process_name}작업이벤트로그_{unique_id}_"
+    key_column = LABEL_MATCH_DURABLE_PROJECTION_KEYS[event_type]
     try:
-        candidates = [
-            os.path.join(save_directory, name)
-            for name in os.listdir(save_directory)
-            if name.startswith(prefix) and name.lower().endswith(".csv")
-        ]
-    except OSError:
-        return False
-    for path in sorted(candidates, reverse=True):
-        try:
-            with open(path, "r", encoding="utf-8-sig", newline="") as handle:
-                for row in csv.DictReader(handle):
-                    if row.get("event") != "PHS_REPLACEMENT_WAITING_MARKED":
-                        continue
-                    try:
-                        details = json.loads(row.get("details") or "{}")
-                    except (TypeError, ValueError, json.JSONDecodeError):
-                        continue
-                    if str(
-                        details.get("dedupe_key")
-                        or details.get("intent_id")
-                        or ""
-                    ).strip() == identity:
-                        return True
-        except (OSError, csv.Error):
-            continue
-    return False
+        found = _label_match_indexed_projection_key_exists(
+            data_manager, event_type, key_column, identity
+        )
+    except (EventIndexError, OSError) as exc:
+        print(f"이벤트 인덱스 조회 실패, CSV 전체 확인으로 대체: {exc}")
+        found = None
+    if found is not None:
+        return found
+    return _label_match_scan_projection_key_exists(
+        data_manager, event_type, key_column, identity
+    )
+
+
+def _label_match_local_completion_event_exists(data_manager, set_id):
+    """Find an already-flushed TRAY_COMPLETE after a local commit crash window."""
+
+    return _label_match_durable_projection_key_exists(
+        data_manager, "TRAY_COMPLETE", set_id
+    )
+
+
+def _label_match_replacement_waiting_event_exists(data_manager, dedupe_key):
+    """Find an fsynced replacement-waiting CSV projection by durable key."""
+
+    return _label_match_durable_projection_key_exists(
+        data_manager, "PHS_REPLACEMENT_WAITING_MARKED", dedupe_key
+    )
 
 
 def _label_match_post_review_event_exists(data_manager, review_event_id):
     """Find an fsynced POST_REVIEW_REQUIRED projection by durable case ID."""
 
-    identity = str(review_event_id or "").strip()
-    save_directory = str(
-        getattr(data_manager, "save_directory", "") or ""
-    ).strip()
-    process_name = str(getattr(data_manager, "process_name", "") or "").strip()
-    unique_id = str(getattr(data_manager, "unique_id", "") or "").strip()
-    if not identity or not save_directory or not os.path.isdir(save_directory):
-        return False
-    prefix = f"{process_name}작업이벤트로그_{unique_id}_"
-    try:
-        candidates = [
-            os.path.join(save_directory, name)
-            for name in os.listdir(save_directory)
-            if name.startswith(prefix) and name.lower().endswith(".csv")
-        ]
-    except OSError:
-        return False
-    for path in sorted(candidates, reverse=True):
-        try:
-            with open(path, "r", encoding="utf-8-sig", newline="") as handle:
-                for row in csv.DictReader(handle):
-                    if row.get("event") != "POST_REVIEW_REQUIRED":
-                        continue
-                    try:
-                        details = json.loads(row.get("details") or "{}")
-                    except (TypeError, ValueError, json.JSONDecodeError):
-                        continue
-                    if str(
-                        details.get("review_event_id")
-                        or details.get("dedupe_key")
-                        or details.get("case_id")
-                        or ""
-                    ).strip() == identity:
-                        return True
-        except (OSError, csv.Error):
-            continue
-    return False
+    return _label_match_durable_projection_key_exists(
+        data_manager, "POST_REVIEW_REQUIRED", review_event_id
+    )
 
 
 def _label_match_manual_complete_block_reason(current_set_info):
@@ -2077,6 +2335,14 @@ def _label_match_parse_sealed_transfer_qr(raw_value):
     return parsed
 
 
+def _label_match_phs_scan_provisional_set_id(physical_qr):
+    """Return the stand-in set ID used while a PHS2 scan is being resolved."""
+
+    return "phs-scan-" + hashlib.sha256(
+        str(physical_qr or "").strip().encode("utf-8")
+    ).hexdigest()[:24]
+
+
 def _label_match_has_central_source_identity(raw_value):
     """Return whether one scan can resolve an exact server package source."""
 
@@ -4562,7 +4828,151 @@ class CalendarWindow(tk.Toplevel):
         self.result = self.cal.selection_get()
         self.destroy()
 
+_HISTORY_RECORD_ABSENT = object()
+# Marks an operator render section that has not been drawn yet, or a widget
+# option the renderer could not read back.
+_OPERATOR_RENDER_KEY_UNSET = object()
+
+
+def _operator_widget_option(widget, option):
+    try:
+        return widget.cget(option)
+    except (TclError, AttributeError, TypeError):
+        pass
+    try:
+        return widget[option]
+    except (TclError, AttributeError, TypeError, KeyError):
+        return _OPERATOR_RENDER_KEY_UNSET
+
+
+def _operator_widget_shows(widget, option, value):
+    """Return True when ``widget`` already displays ``value`` for ``option``.
+
+    Headline, hint and progress are also written directly (lookup notices,
+    ``update_big_display``, progress resets), so the renderer compares with
+    the live widget instead of the value it applied last.
+    """
+    current = _operator_widget_option(widget, option)
+    if current is _OPERATOR_RENDER_KEY_UNSET:
+        return False
+    if isinstance(value, (int, float)):
+        try:
+            return float(current) == float(value)
+        except (TypeError, ValueError):
+            return False
+    return str(current) == str(value)
+
+
+class _HistorySetRecord(Mapping):
+    """Compact read-only view of one TRAY_COMPLETE row kept by the history maps.
+
+    Only the fields used by the history table, summary counts, duplicate checks
+    and cancellation lookups are held; any other key re-reads the full details
+    from the CSV by byte range, so enriched payloads are not kept resident.
+    """
+
+    FIELDS = (
+        "set_id",
+        "final_result",
+        "result_display",
+        "result",
+        "has_error_or_reset",
+        "master_label_code",
+        "item_code",
+        "item_name",
+        "phase",
+        "production_date",
+        "packaging_completed_date",
+        "start_time",
+        "end_time",
+        "timestamp",
+        "scanned_product_barcodes",
+        "parsed_product_barcodes",
+        "is_unique_master_label",
+        "item_name_override",
+    )
+    __slots__ = FIELDS + ("source_path", "byte_offset", "byte_length")
+
+    def __init__(self, details, source_path, byte_offset, byte_length):
+        for field in self.FIELDS:
+            value = details.get(field, _HISTORY_RECORD_ABSENT)
+            if isinstance(value, list):
+                value = tuple(value)
+            object.__setattr__(self, field, value)
+        object.__setattr__(self, "source_path", source_path)
+        object.__setattr__(self, "byte_offset", byte_offset)
+        object.__setattr__(self, "byte_length", byte_length)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("history records are read-only")
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is _HISTORY_RECORD_ABSENT:
+                raise KeyError(key)
+            return value
+        return self.full_details()[key]
+
+    def __iter__(self):
+        return iter(self.full_details())
+
+    def __len__(self):
+        return len(self.full_details())
+
+    def __bool__(self):
+        # ``details or {}`` is common in the helpers; truthiness must not
+        # trigger a re-read.
+        return True
+
+    def __repr__(self):
+        return f"_HistorySetRecord(set_id={self.get('set_id')!r})"
+
+    def compact_details(self):
+        details = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is _HISTORY_RECORD_ABSENT:
+                continue
+            details[field] = list(value) if isinstance(value, tuple) else value
+        return details
+
+    def full_details(self):
+        # The log is append-only, so the byte range normally still holds this
+        # row; a replaced file degrades to the compact fields instead of
+        # returning another set's payload.
+        try:
+            fields = read_csv_record(self.source_path, self.byte_offset, self.byte_length)
+            details = json.loads(fields[3])
+        except (EventIndexError, OSError, IndexError, ValueError):
+            return self.compact_details()
+        if not isinstance(details, dict) or details.get("set_id") != self.get("set_id"):
+            return self.compact_details()
+        return details
+
+
+def _label_match_full_history_details(details):
+    if isinstance(details, _HistorySetRecord):
+        return details.full_details()
+    return details
+
+
+class _PendingLogEvent:
+    __slots__ = ("log_item", "durability")
+
+    def __init__(self, log_item):
+        self.log_item = log_item
+        self.durability = Future()
+
+class _LogFlushBarrier:
+    __slots__ = ("reached",)
+
+    def __init__(self):
+        self.reached = threading.Event()
+
 class DataManager:
+    LOG_WRITER_BATCH_LIMIT = 256
+
     def __init__(
         self,
         save_dir,
@@ -4571,6 +4981,7 @@ class DataManager:
         unique_id,
         *,
         authenticated_admin=False,
+        duplicate_index_retention_days=LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS,
     ):
         self.save_directory = save_dir
         self.process_name = redact_protected_admin_code(process_name)
@@ -4586,8 +4997,76 @@ class DataManager:
         self._close_lock = threading.Lock()
         self._close_requested = False
         self._writer_errors = []
+        self._event_index_errors = []
+        self._log_handle = None
+        self._log_handle_path = None
+        self._log_handle_durable = False
+        self.event_index = self._open_event_index()
+        self.duplicate_index_retention_days = duplicate_index_retention_days
+        self.duplicate_index = self._open_duplicate_index()
         self.log_thread = threading.Thread(target=self._log_writer_thread, daemon=True)
         self.log_thread.start()
+    def _open_event_index(self):
+        # The daily CSV stays authoritative; the key index is a rebuildable
+        # projection, so an unavailable index only disables fast lookups.
+        if not self.save_directory or not _label_match_event_index_enabled():
+            return None
+        try:
+            return LabelMatchEventIndex(
+                os.path.join(self.save_directory, EVENT_INDEX_FILENAME)
+            )
+        except (EventIndexError, OSError) as e:
+            print(f"이벤트 인덱스 사용 불가: {e}")
+            return None
+    def _open_duplicate_index(self):
+        try:
+            retention_days = int(self.duplicate_index_retention_days)
+        except (TypeError, ValueError):
+            retention_days = LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS
+        if not self.save_directory or retention_days <= 0:
+            return None
+        try:
+            return DuplicateBarcodeIndex(
+                os.path.join(self.save_directory, DUPLICATE_INDEX_FILENAME),
+                retention_days=retention_days,
+            )
+        except (DuplicateIndexError, OSError) as e:
+            print(f"중복 바코드 인덱스 사용 불가: {e}")
+            return None
+    def _update_duplicate_index(self, pending):
+        # Runs on the writer thread after the CSV rows are committed, so a set
+        # only becomes a cross-day duplicate once its completion is on disk.
+        duplicate_index = getattr(self, "duplicate_index", None)
+        if duplicate_index is None:
+            return
+        try:
+            for entry in pending:
+                event_type = str(entry.log_item[2] or "")
+                key_field = LABEL_MATCH_DUPLICATE_INDEX_EVENT_TYPES.get(event_type)
+                if key_field is None:
+                    continue
+                details = json.loads(entry.log_item[3] or "{}")
+                set_id = str(details.get(key_field) or "").strip()
+                day = str(entry.log_item[0])[:10]
+                if event_type == "TRAY_COMPLETE":
+                    duplicate_index.add_set(
+                        set_id, _label_match_duplicate_index_barcodes(details), day
+                    )
+                else:
+                    duplicate_index.remove_set(set_id, day)
+            duplicate_index.persist()
+        except (DuplicateIndexError, OSError, ValueError, AttributeError) as e:
+            print(f"중복 바코드 인덱스 갱신 오류: {e}")
+    def _sync_event_index(self, filepath):
+        event_index = getattr(self, "event_index", None)
+        if event_index is None:
+            return
+        try:
+            event_index.sync_file(filepath)
+        except (EventIndexError, OSError) as e:
+            self._event_index_errors.append(e)
+            print(f"이벤트 인덱스 갱신 오류: {e}")
+            event_index.mark_stale()
     def _get_log_filepath(self, target_date=None):
         if target_date is None:
             target_date = datetime.now()
@@ -4599,32 +5078,115 @@ class DataManager:
         except Exception:
             return self._get_log_filepath()
     def _log_writer_thread(self):
-        while True:
-            log_item = None
-            got_item = False
+        stopping = False
+        while not stopping:
+            batch = self._drain_log_batch(self.log_queue.get())
             try:
-                log_item = self.log_queue.get()
-                got_item = True
-                if log_item is None: break
-                filepath = self._get_log_filepath_for_item(log_item)
-                file_exists = os.path.exists(filepath)
-                os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                with open(filepath, 'a', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f)
-                    if not file_exists or os.stat(filepath).st_size == 0:
-                        writer.writerow(["timestamp", "worker_name", "event", "details"])
-                    writer.writerow(log_item)
-                    if str(log_item[2] or "") in LABEL_MATCH_DURABLE_EVENT_TYPES:
-                        f.flush()
-                        os.fsync(f.fileno())
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self._writer_errors.append(e)
-                print(f"로그 쓰기 스레드 오류: {e}")
+                stopping = self._write_log_batch(batch)
             finally:
-                if got_item:
+                for _entry in batch:
                     self.log_queue.task_done()
+        try:
+            self._finish_log_handle()
+        except Exception as e:
+            self._writer_errors.append(e)
+            print(f"로그 쓰기 스레드 오류: {e}")
+    def _drain_log_batch(self, first_entry):
+        batch = [first_entry]
+        while first_entry is not None and len(batch) < self.LOG_WRITER_BATCH_LIMIT:
+            try:
+                entry = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(entry)
+            if entry is None:
+                break
+        return batch
+    def _write_log_batch(self, batch):
+        # Group commit: every row of the wakeup goes through one open handle,
+        # and the batch is flushed (and fsynced once when it carries a durable
+        # event) before any caller's durability future resolves.
+        stopping = batch[-1] is None
+        barriers = [entry for entry in batch if isinstance(entry, _LogFlushBarrier)]
+        pending = [
+            entry if isinstance(entry, _PendingLogEvent) else _PendingLogEvent(entry)
+            for entry in batch
+            if entry is not None and not isinstance(entry, _LogFlushBarrier)
+        ]
+        try:
+            if pending:
+                self._write_log_entries(pending)
+        finally:
+            # A barrier is released only after every row queued before it has
+            # been committed (or has failed and been recorded as a writer error).
+            for barrier in barriers:
+                barrier.reached.set()
+        return stopping
+    def _write_log_entries(self, pending):
+        try:
+            for entry in pending:
+                handle = self._log_handle_for(
+                    self._get_log_filepath_for_item(entry.log_item)
+                )
+                csv.writer(handle).writerow(entry.log_item)
+                if str(entry.log_item[2] or "") in LABEL_MATCH_DURABLE_EVENT_TYPES:
+                    self._log_handle_durable = True
+            self._commit_log_handle()
+        except Exception as e:
+            self._writer_errors.append(e)
+            print(f"로그 쓰기 스레드 오류: {e}")
+            self._discard_log_handle()
+            for entry in pending:
+                if not entry.durability.done():
+                    entry.durability.set_exception(e)
+            return
+        self._update_duplicate_index(pending)
+        for entry in pending:
+            if not entry.durability.done():
+                entry.durability.set_result(True)
+    def _log_handle_for(self, filepath):
+        if self._log_handle is not None and self._log_handle_path == filepath:
+            return self._log_handle
+        self._finish_log_handle()
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        handle = open(filepath, 'a', newline='', encoding='utf-8-sig')
+        try:
+            if os.fstat(handle.fileno()).st_size == 0:
+                csv.writer(handle).writerow(["timestamp", "worker_name", "event", "details"])
+        except Exception:
+            handle.close()
+            raise
+        self._log_handle = handle
+        self._log_handle_path = filepath
+        self._log_handle_durable = False
+        return handle
+    def _commit_log_handle(self):
+        handle = self._log_handle
+        if handle is None:
+            return
+        handle.flush()
+        if self._log_handle_durable:
+            os.fsync(handle.fileno())
+            self._log_handle_durable = False
+        self._sync_event_index(self._log_handle_path)
+    def _finish_log_handle(self):
+        handle = getattr(self, "_log_handle", None)
+        if handle is None:
+            return
+        try:
+            self._commit_log_handle()
+        finally:
+            self._discard_log_handle()
+    def _discard_log_handle(self):
+        handle = self._log_handle
+        self._log_handle = None
+        self._log_handle_path = None
+        self._log_handle_durable = False
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
     def log_event(self, event_type, details):
         enriched_details = sanitize_persistent_value(
             _enrich_label_match_event(event_type, details or {}, self.unique_id)
@@ -4640,10 +5202,12 @@ class DataManager:
             redact_protected_admin_code(event_type),
             redact_protected_admin_code(detail_text),
         ]
+        entry = _PendingLogEvent(log_item)
         with self._close_lock:
             if self._close_requested:
                 raise RuntimeError("DataManager is closing; new log events are not accepted")
-            self.log_queue.put(log_item)
+            self.log_queue.put(entry)
+        return entry.durability
     def close(self, timeout=None):
         with self._close_lock:
             if not self._close_requested:
@@ -4653,15 +5217,29 @@ class DataManager:
         self.log_thread.join(timeout)
         if self.log_thread.is_alive():
             raise TimeoutError("Log writer did not stop before timeout")
+        event_index = getattr(self, "event_index", None)
+        self.event_index = None
+        if event_index is not None:
+            event_index.close()
         if self._writer_errors:
             raise RuntimeError(f"Log writer failed: {self._writer_errors[-1]}")
         return True
     def flush(self, timeout=None):
-        deadline = None if timeout is None else time.monotonic() + timeout
-        while self.log_queue.unfinished_tasks:
-            if deadline is not None and time.monotonic() >= deadline:
+        barrier = _LogFlushBarrier()
+        with self._close_lock:
+            writer_running = self.log_thread.is_alive()
+            if writer_running and not self._close_requested:
+                self.log_queue.put(barrier)
+            else:
+                barrier = None
+        if barrier is not None:
+            if not barrier.reached.wait(timeout):
+                raise TimeoutError("Log writer did not flush before timeout")
+        elif writer_running:
+            # Closing: the shutdown sentinel is already queued behind the rows.
+            self.log_thread.join(timeout)
+            if self.log_thread.is_alive():
                 raise TimeoutError("Log writer did not flush before timeout")
-            time.sleep(0.01)
         if self._writer_errors:
             raise RuntimeError(f"Log writer failed: {self._writer_errors[-1]}")
         return True
@@ -4725,6 +5303,11 @@ class DataManager:
 
 class Label_Match(tk.Tk):
     WORKER_HISTORY_LIMIT = 20
+    HISTORY_LOG_STATE_LIMIT = 3
+    _HISTORY_LOG_STATE_LOCK = threading.Lock()
+    # History rows are inserted/refreshed this many at a time, one slice per
+    # Tk tick, so a busy day never blocks scan input while it renders.
+    HISTORY_TREE_CHUNK_SIZE = 200
 
     UI_PROFILES = {
         "small": {
@@ -5097,6 +5680,7 @@ class Label_Match(tk.Tk):
             self.worker_name,
             self.unique_id,
             authenticated_admin=False,
+            duplicate_index_retention_days=self._duplicate_index_retention_days(),
         )
         package_outbox_path = os.path.join(self.save_directory, "package_logistics_outbox.sqlite3")
         self.package_outbox = PackageOutbox(package_outbox_path)
@@ -5163,6 +5747,9 @@ class Label_Match(tk.Tk):
         self.package_outbox_thread = None
         self.package_outbox_after_id = None
         self.package_outbox_poll_after_id = None
+        self.package_outbox_scheduler = PackageOutboxScheduler()
+        self.package_outbox_metrics = {}
+        self._package_outbox_drain_result = None
         _label_match_startup_trace(
             "app_init_after_data_manager",
             worker_role=self.worker_role,
@@ -5294,20 +5881,28 @@ class Label_Match(tk.Tk):
             return current
 
         def worker():
+            drained = {}
+            failed = False
             try:
                 # CREATE_PACKAGE always drains first so a cancellation recorded
                 # before its ACK can be promoted and sent in the same cycle.
-                if package_processor is not None:
-                    package_processor.drain(limit=20)
-                if cancellation_processor is not None:
-                    cancellation_processor.drain(limit=20)
+                for processor in (package_processor, cancellation_processor):
+                    if processor is None:
+                        continue
+                    counts = processor.drain(limit=PACKAGE_OUTBOX_DRAIN_BATCH)
+                    if isinstance(counts, dict):
+                        for name, count in counts.items():
+                            drained[name] = drained.get(name, 0) + int(count or 0)
                 exchange_coordinator = self.__dict__.get(
                     "sealed_transfer_exchange_coordinator"
                 )
                 if exchange_coordinator is not None:
                     exchange_coordinator.drain_pending()
             except Exception as exc:
+                failed = True
                 print(f"포장 물류 outbox 처리 오류: {exc}")
+            # Read by the Tk-thread poll once this worker has finished.
+            self._package_outbox_drain_result = (drained, failed)
             try:
                 self._reconcile_post_review_required_events()
             except Exception as exc:
@@ -5343,15 +5938,52 @@ class Label_Match(tk.Tk):
         self._refresh_package_cancellation_review_notice()
         self._reconcile_pending_sealed_transfer_exchanges(prompt_operator=True)
         self._reconcile_active_package_submission()
-        if self.__dict__.get("package_outbox_after_id") is None:
+        delay_ms = self._next_package_outbox_drain_delay_ms()
+        previous = self.__dict__.get("package_outbox_after_id")
+        if previous is not None:
+            # An enqueue-triggered drain may finish before an older timer;
+            # re-arm so the next wake-up follows the current queue state.
             try:
-                self.package_outbox_after_id = self.after(
-                    30000, self._run_scheduled_package_outbox_drain
-                )
+                self.after_cancel(previous)
             except (TclError, RuntimeError):
-                self.package_outbox_after_id = None
+                pass
+            self.package_outbox_after_id = None
+        try:
+            self.package_outbox_after_id = self.after(
+                delay_ms, self._run_scheduled_package_outbox_drain
+            )
+        except (TclError, RuntimeError):
+            self.package_outbox_after_id = None
         return None
 
+    def _next_package_outbox_drain_delay_ms(self):
+        """Publish outbox depth/age metrics and return the next drain delay."""
+
+        scheduler = self.__dict__.get("package_outbox_scheduler")
+        if scheduler is None:
+            return int(PACKAGE_OUTBOX_IDLE_POLL_SECONDS * 1000)
+        metrics = {}
+        for name, outbox in (
+            ("create_package", self.__dict__.get("package_outbox")),
+            ("cancel_package", self.__dict__.get("package_cancellation_outbox")),
+        ):
+            read_metrics = getattr(outbox, "queue_metrics", None)
+            if not callable(read_metrics):
+                continue
+            try:
+                metrics[name] = read_metrics()
+            except Exception as exc:
+                print(f"포장 물류 outbox 지표 조회 오류: {exc}")
+        drained, failed = (
+            self.__dict__.get("_package_outbox_drain_result") or (None, False)
+        )
+        self._package_outbox_drain_result = None
+        delay = scheduler.next_delay_seconds(
+            metrics, drained=drained, failed=failed
+        )
+        self.package_outbox_metrics = dict(scheduler.last_metrics)
+        return max(1, int(round(delay * 1000)))
+
     def _run_scheduled_package_outbox_drain(self):
         self.package_outbox_after_id = None
         return self._start_package_outbox_drain()
@@ -5959,6 +6591,18 @@ class Label_Match(tk.Tk):
         configured_path = str(self.app_settings.get("custom_save_path", "") or "").strip()
         return configured_path or _default_label_match_save_path()
 
+    def _duplicate_index_retention_days(self):
+        settings = self.__dict__.get("app_settings") or {}
+        try:
+            return int(
+                settings.get(
+                    "duplicate_index_retention_days",
+                    LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS,
+                )
+            )
+        except (TypeError, ValueError):
+            return LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS
+
     def _load_app_settings(self):
         try:
             with open(self.app_settings_path, 'r', encoding='utf-8') as f:
@@ -6146,6 +6790,8 @@ class Label_Match(tk.Tk):
         changed = force or new_name != self.__dict__.get("ui_profile_name")
         self.ui_profile_name = new_name
         self.ui_profile = new_profile
+        if changed:
+            self._text_measure_cache().invalidate()
         self._apply_responsive_layout()
         if changed and getattr(self, "initialized_successfully", False):
             self._update_ui_scaling()
@@ -6210,9 +6856,33 @@ class Label_Match(tk.Tk):
         except TclError as e:
             print(f"Sash 위치 적용 중 오류 발생 (무시 가능): {e}")
 
+    def _text_measure_cache(self):
+        # Widths are only valid for the font metrics they were measured with;
+        # a profile, zoom/DPI or base font change starts a fresh scope.
+        state = self.__dict__
+        cache = state.get("text_measure_cache")
+        if cache is None:
+            cache = state["text_measure_cache"] = TextMeasureCache()
+        cache.ensure_scope(
+            (
+                state.get("ui_profile_name"),
+                state.get("scale_factor"),
+                state.get("base_font_size"),
+            )
+        )
+        return cache
+
+    def _text_measure_font(self, cache, font_spec):
+        return cache.handle(font_spec, lambda: tkFont.Font(root=self, font=font_spec))
+
     def _text_pixel_width(self, text, font_tuple):
         try:
-            return tkFont.Font(root=self, font=font_tuple).measure(str(text))
+            cache = self._text_measure_cache()
+            return cache.width(
+                font_tuple,
+                text,
+                self._text_measure_font(cache, font_tuple).measure,
+            )
         except Exception:
             try:
                 font_size = abs(int(font_tuple[1]))
@@ -6782,6 +7452,7 @@ class Label_Match(tk.Tk):
                     reason=self.Events.APP_CLOSE,
                     deadline_monotonic=deadline_monotonic,
                 )
+            _label_match_close_session_sync_helper()
         except Exception as exc:
             result = self._record_app_close_failure(
                 context,
@@ -7121,6 +7792,11 @@ class Label_Match(tk.Tk):
                     and getattr(failed_manager, "worker_name", "")
                     == PROTECTED_ADMIN_OPERATOR_ID
                 ),
+                duplicate_index_retention_days=getattr(
+                    failed_manager,
+                    "duplicate_index_retention_days",
+                    LABEL_MATCH_DUPLICATE_INDEX_RETENTION_DAYS,
+                ),
             )
             return True
         except Exception as replacement_error:
@@ -7420,7 +8096,16 @@ class Label_Match(tk.Tk):
     def _delete_current_set_state(self):
         self.data_manager.delete_current_state()
 
-    def _flush_data_manager_if_supported(self, timeout=5.0):
+    def _flush_data_manager_if_supported(self, timeout=5.0, durability=None):
+        if isinstance(durability, Future):
+            # Wait for the one logged event instead of the whole queue.
+            try:
+                durability.result(timeout=timeout)
+            except FutureTimeoutError as exc:
+                raise TimeoutError("Log writer did not persist the event before timeout") from exc
+            except Exception as exc:
+                raise RuntimeError(f"Log writer failed: {exc}") from exc
+            return
         flush = getattr(self.data_manager, "flush", None)
         if callable(flush):
             flush(timeout=timeout)
@@ -7453,6 +8138,8 @@ class Label_Match(tk.Tk):
             self.scan_count.clear()
             self.global_scanned_set.clear()
             self.set_details_map.clear()
+        self._cancel_history_tree_job("insert")
+        self._cancel_history_tree_job("refresh")
         self.history_tree.delete(*self.history_tree.get_children())
         self.summary_tree.delete(*self.summary_tree.get_children())
 
@@ -7484,59 +8171,94 @@ class Label_Match(tk.Tk):
         self._history_loader_threads = active_loaders
         loader_thread.start()
 
+    def _history_log_state(self, log_filepath):
+        """Return the tail-following parse state of one daily log, most recent last."""
+        states = self.__dict__.setdefault("_history_log_states", {})
+        state = states.pop(log_filepath, None)
+        if state is None:
+            state = {
+                'tail': EventLogTail(log_filepath),
+                'completed_sets': {},
+                'voided_set_ids': set(),
+                'cancelled_set_ids': set(),
+            }
+        states[log_filepath] = state
+        while len(states) > self.HISTORY_LOG_STATE_LIMIT:
+            states.pop(next(iter(states)))
+        return state
+
+    def _apply_new_history_log_rows(self, state):
+        # Only rows appended since the previous load are decoded; a replaced
+        # or truncated file resets the accumulated sets and is read again.
+        completed_sets = state['completed_sets']
+        voided_set_ids = state['voided_set_ids']
+        cancelled_set_ids = state['cancelled_set_ids']
+        log_filepath = state['tail'].path
+        rows = None
+        try:
+            reset, rows = state['tail'].read_new_rows()
+            if reset:
+                completed_sets.clear()
+                voided_set_ids.clear()
+                cancelled_set_ids.clear()
+            for byte_offset, byte_length, row in rows:
+                event = row.get('event')
+                details_str = row.get('details', '{}')
+                if not details_str: continue
+                try:
+                    details = json.loads(details_str)
+                except json.JSONDecodeError:
+                    print(f"경고: JSON 파싱 오류. 건너뜁니다: {details_str}")
+                    continue
+
+                set_id = details.get('set_id')
+                if event == self.Events.SET_DELETED and details.get('set_id'):
+                    voided_set_ids.add(details['set_id'])
+                    continue
+                if event == self.Events.TRAY_COMPLETION_CANCELLED and details.get('cancelled_set_id'):
+                    cancelled_set_ids.add(details.get('cancelled_set_id'))
+                    continue
+
+                if set_id is None: continue
+
+                if event == self.Events.TRAY_COMPLETE:
+                    displays = details.get('parsed_product_barcodes', [])
+                    first_scan = displays[0] if displays else "N/A"
+                    other_scans = displays[1:self.TOTAL_SCAN_COUNT]
+
+                    timestamp_str = datetime.fromisoformat(row.get('timestamp', '')).strftime('%H:%M:%S')
+                    result_display = _label_match_tray_complete_result(details)
+                    values_to_display = (
+                        set_id,
+                        first_scan,
+                        *other_scans + [""] * ((self.TOTAL_SCAN_COUNT - 1) - len(other_scans)),
+                        result_display,
+                        timestamp_str,
+                    )
+
+                    completed_sets[set_id] = {
+                        'values': values_to_display,
+                        'tags': ("success" if _label_match_tray_complete_passed(details) else "error",),
+                        'details': _HistorySetRecord(details, log_filepath, byte_offset, byte_length),
+                    }
+
+        except Exception as e:
+            print(f"기록 파일 로드 오류 ({log_filepath}): {e}")
+        finally:
+            if rows is not None:
+                rows.close()
+
     def _async_load_history_task(self, result_queue, target_date=None, updates_active_state=None, load_generation=None):
         try:
             if updates_active_state is None:
                 updates_active_state = self._history_load_updates_active_state(target_date)
-            completed_sets = {}
-            voided_set_ids = set()
-            cancelled_set_ids = set()
-
             log_filepath = self.data_manager._get_log_filepath(target_date)
-
-            if os.path.exists(log_filepath):
-                try:
-                    with open(log_filepath, 'r', encoding='utf-8-sig') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            event = row.get('event')
-                            details_str = row.get('details', '{}')
-                            if not details_str: continue
-                            try:
-                                details = json.loads(details_str)
-                            except json.JSONDecodeError:
-                                print(f"경고: JSON 파싱 오류. 건너뜁니다: {details_str}")
-                                continue
-
-                            set_id = details.get('set_id')
-                            if event == self.Events.SET_DELETED and details.get('set_id'):
-                                voided_set_ids.add(details['set_id'])
-                                continue
-                            if event == self.Events.TRAY_COMPLETION_CANCELLED and details.get('cancelled_set_id'):
-                                cancelled_set_ids.add(details.get('cancelled_set_id'))
-                                continue
-
-                            if set_id is None: continue
-
-                            if event == self.Events.TRAY_COMPLETE:
-                                displays = details.get('parsed_product_barcodes', [])
-                                first_scan = displays[0] if displays else "N/A"
-                                other_scans = displays[1:self.TOTAL_SCAN_COUNT]
-
-                                timestamp_str = datetime.fromisoformat(row.get('timestamp', '')).strftime('%H:%M:%S')
-                                result_display = _label_match_tray_complete_result(details)
-                                values_to_display = (
-                                    set_id,
-                                    first_scan,
-                                    *other_scans + [""] * ((self.TOTAL_SCAN_COUNT - 1) - len(other_scans)),
-                                    result_display,
-                                    timestamp_str,
-                                )
-
-                                completed_sets[set_id] = {'values': values_to_display, 'tags': ("success" if _label_match_tray_complete_passed(details) else "error",), 'details': details}
-
-                except Exception as e:
-                    print(f"기록 파일 로드 오류 ({log_filepath}): {e}")
+            with self._HISTORY_LOG_STATE_LOCK:
+                state = self._history_log_state(log_filepath)
+                self._apply_new_history_log_rows(state)
+                completed_sets = dict(state['completed_sets'])
+                voided_set_ids = set(state['voided_set_ids'])
+                cancelled_set_ids = set(state['cancelled_set_ids'])
 
             final_sets = {sid: data for sid, data in completed_sets.items() if sid not in voided_set_ids and sid not in cancelled_set_ids}
             def _history_sort_key(item):
@@ -7553,6 +8275,14 @@ class Label_Match(tk.Tk):
             temp_scan_count = defaultdict(lambda: defaultdict(int))
             temp_global_scanned_set = set()
             temp_set_details_map = {sid: data['details'] for sid, data in final_sets.items()}
+            # Today's log is authoritative: re-adding its passed sets repairs a
+            # cross-day index that missed a write (no-op for indexed sets).
+            duplicate_index = (
+                getattr(self.data_manager, "duplicate_index", None)
+                if updates_active_state
+                else None
+            )
+            log_day = (target_date or datetime.now()).strftime('%Y-%m-%d')
             for set_id, data in sorted_final_sets:
                 details = data['details']
                 if _label_match_tray_complete_passed(details):
@@ -7561,7 +8291,15 @@ class Label_Match(tk.Tk):
                     phase = details.get('phase') or '-'
                     if passed_code and production_date:
                         temp_scan_count[production_date][(passed_code, phase)] += 1
-                    temp_global_scanned_set.update(_label_match_duplicate_index_barcodes(details))
+                    duplicate_keys = _label_match_duplicate_index_barcodes(details)
+                    temp_global_scanned_set.update(duplicate_keys)
+                    if duplicate_index is not None:
+                        duplicate_index.add_set(set_id, duplicate_keys, log_day)
+            if duplicate_index is not None:
+                try:
+                    duplicate_index.persist()
+                except DuplicateIndexError as e:
+                    print(f"중복 바코드 인덱스 갱신 오류: {e}")
 
             result_queue.put({
                 'sorted_sets': sorted_final_sets,
@@ -7606,17 +8344,12 @@ class Label_Match(tk.Tk):
                 self.global_scanned_set = result['global_scanned_set']
                 self.set_details_map = result['set_details_map']
             self.history_row_details_map = result.get('set_details_map', {})
-            sorted_final_sets = result['sorted_sets']
-            for index, (set_id, data) in enumerate(sorted_final_sets, 1):
-                values = list(data['values'])
-                values[0] = index
-                display_values = self._history_values_for_display(values)
-                self.history_tree.insert("", "end", iid=str(set_id), values=display_values, tags=data['tags'])
+            self._insert_history_rows(result['sorted_sets'])
             self._render_summary_tree(result['scan_count'] if not updates_active_state else self.scan_count)
             self._apply_history_view_mode()
             self._render_history_detail()
             self._refresh_session_tree()
-            self._render_operator_workbench()
+            self._request_operator_workbench_render()
             print("비동기 기록 로드 및 UI 적용 완료.")
         except queue.Empty:
             if (
@@ -7639,6 +8372,78 @@ class Label_Match(tk.Tk):
                     "계속 실패하면 관리자에게 확인을 요청하세요.",
                 )
 
+    def _run_history_tree_job(self, key, chunks):
+        # ``chunks`` yields callables: the first runs now, the rest one per
+        # after() tick.  Starting a job cancels the pending one with its key.
+        self._cancel_history_tree_job(key)
+        jobs = self.__dict__.setdefault("_history_tree_jobs", {})
+
+        def step():
+            jobs.pop(key, None)
+            if self.__dict__.get("_tk_shutdown_requested", False):
+                return
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            chunk()
+            jobs[key] = self.after(1, step)
+
+        step()
+
+    def _cancel_history_tree_job(self, key):
+        after_id = self.__dict__.get("_history_tree_jobs", {}).pop(key, None)
+        if after_id is None:
+            return
+        try:
+            self.after_cancel(after_id)
+        except (TclError, RuntimeError, ValueError):
+            pass
+
+    def _insert_history_rows(self, sorted_final_sets):
+        # The newest slice (what is on screen and in the session list) is
+        # inserted immediately; older slices are prepended on later ticks.
+        rows = [
+            (index, str(set_id), data)
+            for index, (set_id, data) in enumerate(sorted_final_sets, 1)
+        ]
+        chunk_size = max(1, int(self.HISTORY_TREE_CHUNK_SIZE))
+        generation = self.__dict__.get("history_load_generation")
+
+        def insert_slice(start, stop, deferred):
+            if deferred and self.__dict__.get("history_load_generation") != generation:
+                return
+            position = 0
+            for index, iid, data in rows[start:stop]:
+                if deferred and (
+                    self.history_tree.exists(iid)
+                    or self._dict_value_by_string_key(
+                        self.__dict__.get("history_row_details_map", {}), iid
+                    ) is None
+                ):
+                    # Deleted or cancelled while this slice was waiting.
+                    continue
+                values = list(data['values'])
+                values[0] = index
+                self.history_tree.insert(
+                    "",
+                    position if deferred else "end",
+                    iid=iid,
+                    values=self._history_values_for_display(values),
+                    tags=data['tags'],
+                )
+                position += 1
+
+        def slices():
+            stop = len(rows)
+            deferred = False
+            while stop > 0:
+                start = max(0, stop - chunk_size)
+                yield lambda start=start, stop=stop, deferred=deferred: insert_slice(start, stop, deferred)
+                stop = start
+                deferred = True
+
+        self._run_history_tree_job("insert", slices())
+
     def _parse_new_format_label(self, raw_input):
         return _label_match_parse_new_format_fields(raw_input)
 
@@ -8178,9 +8983,7 @@ class Label_Match(tk.Tk):
             if reusable is not None:
                 return reusable
         provisional = {
-            "id": "phs-scan-" + hashlib.sha256(
-                physical_qr.encode("utf-8")
-            ).hexdigest()[:24],
+            "id": _label_match_phs_scan_provisional_set_id(physical_qr),
             "raw": [physical_qr],
             "parsed": [fields["CLC"]],
             "central_inherit_all": True,
@@ -8198,8 +9001,57 @@ class Label_Match(tk.Tk):
         evidence, snapshot, sealed = self._central_phs2_response_parts(
             physical_qr, response
         )
+        remember = getattr(client, "remember_source_resolution", None)
+        if callable(remember):
+            # Held under the provisional ID until the scan is accepted, so
+            # CREATE_PACKAGE building can reuse this exact resolver answer.
+            remember(draft, response)
         return evidence, snapshot, sealed, None
 
+    def _prefetch_package_source_resolution(self, label_fields, item_code):
+        """Resolve a structured first scan's source while products are scanned.
+
+        Completion builds CREATE_PACKAGE from the same lineage; a matching
+        answer captured here saves that resolver round trip.  Any failure is
+        ignored because the command path resolves again on a miss.
+        """
+
+        client = self.__dict__.get("package_logistics_client")
+        prefetch = getattr(client, "prefetch_source_resolution", None)
+        fields = dict(label_fields or {})
+        input_tag_id = str(fields.get("ITG") or "").strip()
+        bundle_hint = str(fields.get("BND") or "").strip()
+        if self.run_tests or not callable(prefetch) or not (
+            input_tag_id or bundle_hint
+        ):
+            return
+        input_tag_label_id = str(fields.get("LBL") or "").strip()
+        input_tag_hash_prefix = str(fields.get("HSH") or "").strip().lower()
+        if not input_tag_label_id or not input_tag_hash_prefix:
+            input_tag_label_id = ""
+            input_tag_hash_prefix = ""
+        request = {
+            "set_id": str(self.current_set_info.get("id") or ""),
+            "item_id": str(item_code or ""),
+            "authority_scope_id": str(fields.get("AUTH_SCOPE") or "").strip(),
+            "input_tag_id": input_tag_id,
+            "input_tag_label_id": input_tag_label_id,
+            "input_tag_hash_prefix": input_tag_hash_prefix,
+            "source_bundle_hint": bundle_hint,
+        }
+
+        def worker():
+            try:
+                prefetch(**request)
+            except Exception:
+                pass
+
+        threading.Thread(
+            target=worker,
+            name="label-match-package-source-prefetch",
+            daemon=True,
+        ).start()
+
     def _accept_resolved_central_phs2_scan(
         self,
         evidence,
@@ -8236,6 +9088,18 @@ class Label_Match(tk.Tk):
             evidence.canonical_input_tag_qr,
             evidence.item_id,
         )
+        source_resolutions = getattr(
+            self.__dict__.get("package_logistics_client"),
+            "source_resolutions",
+            None,
+        )
+        if source_resolutions is not None:
+            source_resolutions.rebind(
+                _label_match_phs_scan_provisional_set_id(
+                    evidence.physical_scanned_qr_payload
+                ),
+                str(self.current_set_info.get("id") or ""),
+            )
         if operation_lease:
             lease_id = str(operation_lease.get("lease_id") or "").strip()
             lease_store = self.__dict__.get("package_operation_lease_store")
@@ -8521,7 +9385,7 @@ class Label_Match(tk.Tk):
                 )
                 duplicate_keys = _label_match_unique_master_index_keys(raw_input)
                 duplicate_keys.update(_label_match_unique_master_index_keys(processed_input))
-                if not reusable_input_master and duplicate_keys & self.global_scanned_set:
+                if not reusable_input_master and self._is_globally_scanned(duplicate_keys):
                     self._handle_input_error(
                         raw_input,
                         title="[현품표 중복 스캔]",
@@ -8553,6 +9417,9 @@ class Label_Match(tk.Tk):
                 if _label_match_has_central_source_identity(processed_input):
                     self.current_set_info["central_inherit_all"] = True
                 self._update_on_success_scan(raw_input, client_code)
+                self._prefetch_package_source_resolution(
+                    new_label_data, client_code
+                )
             else:
                 MASTER_LABEL_LENGTH = 13
                 is_test_code = test_tools_enabled and any(
@@ -8624,7 +9491,7 @@ class Label_Match(tk.Tk):
                     reason=f"세트 내 중복 스캔입니다.\n\n- 중복 제품: {self._truncate_string(raw_input)}\n\n→ 다른 제품을 스캔하세요."
                 )
                 return
-            if raw_input in self.global_scanned_set:
+            if self._is_globally_scanned((raw_input,)):
                 self._handle_input_error(
                     raw_input,
                     title="[전체 작업 내 중복 스캔]",
@@ -9612,8 +10479,10 @@ class Label_Match(tk.Tk):
                 manager, dedupe_key
             ):
                 return
-            log_event(self.Events.PHS_REPLACEMENT_WAITING_MARKED, dict(payload))
-            self._flush_data_manager_if_supported()
+            durability = log_event(
+                self.Events.PHS_REPLACEMENT_WAITING_MARKED, dict(payload)
+            )
+            self._flush_data_manager_if_supported(durability=durability)
 
         return commit_projection(dedupe_key, project)
 
@@ -9638,8 +10507,8 @@ class Label_Match(tk.Tk):
                 manager, review_event_id
             ):
                 return
-            log_event(self.Events.POST_REVIEW_REQUIRED, dict(payload))
-            self._flush_data_manager_if_supported()
+            durability = log_event(self.Events.POST_REVIEW_REQUIRED, dict(payload))
+            self._flush_data_manager_if_supported(durability=durability)
 
         return commit_projection(review_event_id, project)
 
@@ -11284,8 +12153,8 @@ class Label_Match(tk.Tk):
             )
         )
         if not already_logged:
-            self.data_manager.log_event(event_type, details)
-            self._flush_data_manager_if_supported()
+            durability = self.data_manager.log_event(event_type, details)
+            self._flush_data_manager_if_supported(durability=durability)
         if cancellation:
             outbox = self.__dict__.get("package_cancellation_outbox")
             if outbox is None:
@@ -11360,8 +12229,8 @@ class Label_Match(tk.Tk):
                     local_details, cancellation
                 )
                 details["reconciled_after_restart"] = True
-                self.data_manager.log_event(event_type, details)
-                self._flush_data_manager_if_supported()
+                durability = self.data_manager.log_event(event_type, details)
+                self._flush_data_manager_if_supported(durability=durability)
             outbox.mark_local_event_committed(cancellation["cancellation_event_id"])
             reconciled += 1
         return reconciled
@@ -11492,8 +12361,10 @@ class Label_Match(tk.Tk):
                 )
             )
             if not local_event_exists:
-                self.data_manager.log_event(self.Events.TRAY_COMPLETE, details)
-                self._flush_data_manager_if_supported()
+                durability = self.data_manager.log_event(
+                    self.Events.TRAY_COMPLETE, details
+                )
+                self._flush_data_manager_if_supported(durability=durability)
             if central_inherit_all and package_logistics:
                 outbox = self.__dict__.get("package_outbox")
                 if outbox is None:
@@ -11884,6 +12755,13 @@ class Label_Match(tk.Tk):
                     parent=self,
                 )
 
+    def _is_globally_scanned(self, keys):
+        keys = set(keys)
+        if keys & self.global_scanned_set:
+            return True
+        duplicate_index = getattr(self.__dict__.get("data_manager"), "duplicate_index", None)
+        return duplicate_index is not None and duplicate_index.contains_any(keys)
+
     def _rebuild_global_scanned_set_from_details(self):
         rebuilt = set()
         for details in self.set_details_map.values():
@@ -12354,7 +13232,7 @@ class Label_Match(tk.Tk):
             return
 
         # --- 확인 및 취소 절차 (기존과 동일) ---
-        target_details = self.set_details_map[target_set_id]
+        target_details = _label_match_full_history_details(self.set_details_map[target_set_id])
         
         try:
             end_time_dt = _label_match_parse_datetime(target_details.get('end_time'))
@@ -12771,6 +13649,7 @@ class Label_Match(tk.Tk):
             self.worker_name,
             self.unique_id,
             authenticated_admin=authenticated_admin,
+            duplicate_index_retention_days=self._duplicate_index_retention_days(),
         )
         self.title(_label_match_window_title())
         operator_context = self.__dict__.get("operator_header_context_label")
@@ -13137,21 +14016,25 @@ class Label_Match(tk.Tk):
             if style is None:
                 raise AttributeError("Tk style is unavailable")
             font_spec = style.lookup(style_name, "font")
-            font = tkFont.Font(root=self, font=font_spec)
-            if int(font.measure(text)) <= column_width:
-                return text
+            cache = self._text_measure_cache()
+            font = self._text_measure_font(cache, font_spec)
+
+            def fit():
+                if cache.width(font_spec, text, font.measure) <= column_width:
+                    return text
+                low, high = 10, len(text)
+                best = self._middle_ellipsis(text, low)
+                while low <= high:
+                    middle = (low + high) // 2
+                    candidate = self._middle_ellipsis(text, middle)
+                    if int(font.measure(candidate)) <= column_width:
+                        best = candidate
+                        low = middle + 1
+                    else:
+                        high = middle - 1
+                return best
 
-            low, high = 10, len(text)
-            best = self._middle_ellipsis(text, low)
-            while low <= high:
-                middle = (low + high) // 2
-                candidate = self._middle_ellipsis(text, middle)
-                if int(font.measure(candidate)) <= column_width:
-                    best = candidate
-                    low = middle + 1
-                else:
-                    high = middle - 1
-            return best
+            return cache.fitted(font_spec, column_width, text, fit)
         except (TclError, AttributeError, RecursionError, TypeError, ValueError):
             return self._middle_ellipsis(text, 72)
 
@@ -13366,7 +14249,7 @@ class Label_Match(tk.Tk):
             self.summary_tree.item(item_id, values=(self._format_summary_code_cell(code), phase, count))
 
     def _history_values_from_details(self, iid, current_values=None):
-        details = self._history_details_for_iid(iid)
+        details = self._history_record_for_iid(iid)
         if not details:
             return current_values
         current_values = list(current_values or [])
@@ -13390,8 +14273,33 @@ class Label_Match(tk.Tk):
         if "history_tree" not in self.__dict__:
             return
         try:
-            for iid in self.history_tree.get_children():
-                if iid == "loading":
+            children = [
+                iid for iid in self.history_tree.get_children() if iid != "loading"
+            ]
+            try:
+                top_fraction = float(self.history_tree.yview()[0])
+            except (TclError, AttributeError, TypeError, ValueError, IndexError):
+                top_fraction = 0.0
+        except Exception as e:
+            print(f"기록 표시값 갱신 오류: {e}")
+            return
+        # Rows from the visible window down are refreshed first; the rows
+        # scrolled above it follow on later ticks.
+        chunk_size = max(1, int(self.HISTORY_TREE_CHUNK_SIZE))
+        first_visible = max(0, int(top_fraction * len(children)))
+        ordered = children[first_visible:] + children[:first_visible]
+        self._run_history_tree_job(
+            "refresh",
+            (
+                lambda batch=ordered[start:start + chunk_size]: self._refresh_history_rows(batch)
+                for start in range(0, len(ordered), chunk_size)
+            ),
+        )
+
+    def _refresh_history_rows(self, iids):
+        try:
+            for iid in iids:
+                if not self.history_tree.exists(iid):
                     continue
                 current_values = self.history_tree.item(iid, "values")
                 source_values = self._history_values_from_details(iid, current_values)
@@ -13411,7 +14319,9 @@ class Label_Match(tk.Tk):
             "production_date": current.get("production_date"),
         }
 
-    def _history_details_for_iid(self, iid):
+    def _history_record_for_iid(self, iid):
+        # Compact record or plain dict, without re-reading the CSV; enough
+        # for table values.  Use _history_details_for_iid for the full payload.
         if not iid:
             return None
         details = self._dict_value_by_string_key(self.__dict__.get("history_row_details_map", {}), iid)
@@ -13422,6 +14332,9 @@ class Label_Match(tk.Tk):
             return self._details_for_current_set()
         return self._dict_value_by_string_key(self.__dict__.get("set_details_map", {}), iid)
 
+    def _history_details_for_iid(self, iid):
+        return _label_match_full_history_details(self._history_record_for_iid(iid))
+
     def _barcode_detail_text(self, details):
         if not details:
             return "기록을 선택하면 현품표와 제품 바코드 원문이 여기에 표시됩니다."
@@ -14049,7 +14962,7 @@ class Label_Match(tk.Tk):
             if settle:
                 # Column widths are final on the settle pass; rerender only the
                 # presentation model so visible ellipses match those widths.
-                self._render_operator_workbench()
+                self._request_operator_workbench_render()
         except (TclError, AttributeError, KeyError, TypeError):
             return
         finally:
@@ -14588,6 +15501,20 @@ class Label_Match(tk.Tk):
         )
         view = present_workflow(snapshot)
         self._last_workflow_view = view
+        self._cancel_requested_operator_render()
+        # Rebuilding the scan lists (and re-fitting every cell) is the costly
+        # part of a render; it only runs when its inputs changed since the
+        # last pass.  Headline, progress and hint are checked against the
+        # live widgets; entry and button gates are re-applied on every call.
+        applied_keys = self.__dict__.setdefault("_operator_render_keys", {})
+        changed_sections = set()
+
+        def section_changed(name, key):
+            if applied_keys.get(name, _OPERATOR_RENDER_KEY_UNSET) == key:
+                return False
+            applied_keys[name] = key
+            changed_sections.add(name)
+            return True
 
         view_mode_label = self.__dict__.get("view_mode_label")
         if view_mode_label is not None:
@@ -14597,13 +15524,19 @@ class Label_Match(tk.Tk):
                 pass
 
         headline = self.__dict__.get("big_display_label")
-        if headline is not None:
+        headline_text = self._workflow_headline_text(view)
+        if headline is not None and not _operator_widget_shows(headline, "text", headline_text):
+            changed_sections.add("headline")
             try:
-                headline.configure(text=self._workflow_headline_text(view))
+                headline.configure(text=headline_text)
             except (TclError, AttributeError):
                 pass
         progress = self.__dict__.get("progress_bar")
-        if progress is not None:
+        if progress is not None and not (
+            _operator_widget_shows(progress, "maximum", view.qa_total)
+            and _operator_widget_shows(progress, "value", view.qa_completed)
+        ):
+            changed_sections.add("progress")
             try:
                 progress.configure(maximum=view.qa_total)
                 progress["value"] = view.qa_completed
@@ -14614,10 +15547,13 @@ class Label_Match(tk.Tk):
                     pass
         hint_label = self.__dict__.get("operator_left_hint_label")
         if hint_label is not None:
-            try:
-                hint_label.configure(text=self._operator_workflow_hint_text(source))
-            except (TclError, AttributeError):
-                pass
+            hint_text = self._operator_workflow_hint_text(source)
+            if not _operator_widget_shows(hint_label, "text", hint_text):
+                changed_sections.add("hint")
+                try:
+                    hint_label.configure(text=hint_text)
+                except (TclError, AttributeError):
+                    pass
         if "step_labels" in self.__dict__:
             try:
                 self._update_step_rail(
@@ -14632,7 +15568,12 @@ class Label_Match(tk.Tk):
         selected_qa_iid = self._selected_qa_scan_iid()
         qa_detail_rows = {}
         parsed_scans = tuple(source.get("parsed") or ())
-        if qa_tree is not None:
+        if qa_tree is not None and not section_changed(
+            "qa_tree",
+            (view.slots, parsed_scans, self._operator_tree_render_layout_key(qa_tree)),
+        ):
+            qa_detail_rows = dict(self.__dict__.get("_qa_scan_detail_rows") or {})
+        elif qa_tree is not None:
             try:
                 existing = tuple(qa_tree.get_children())
                 if existing:
@@ -14674,7 +15615,7 @@ class Label_Match(tk.Tk):
                         "summary": summary_value,
                     }
             except (TclError, AttributeError, TypeError):
-                pass
+                applied_keys.pop("qa_tree", None)
         self._qa_scan_detail_rows = qa_detail_rows
         if selected_qa_iid not in qa_detail_rows:
             selected_qa_iid = (
@@ -14699,7 +15640,16 @@ class Label_Match(tk.Tk):
         exact_values = tuple(source.get("exact_rescan_barcodes") or ())
         selected_exact_iid = self._selected_exact_rescan_iid()
         exact_detail_rows = {}
-        if exact_tree is not None:
+        if exact_tree is not None and not section_changed(
+            "exact_tree",
+            (
+                exact_values,
+                parsed_scans[:1],
+                self._operator_tree_render_layout_key(exact_tree),
+            ),
+        ):
+            exact_detail_rows = dict(self.__dict__.get("_exact_rescan_detail_rows") or {})
+        elif exact_tree is not None:
             try:
                 existing = tuple(exact_tree.get_children())
                 if existing:
@@ -14730,7 +15680,7 @@ class Label_Match(tk.Tk):
                         "summary": summary_value,
                     }
             except (TclError, AttributeError, TypeError):
-                pass
+                applied_keys.pop("exact_tree", None)
         self._exact_rescan_detail_rows = exact_detail_rows
         if selected_exact_iid not in exact_detail_rows:
             selected_exact_iid = (
@@ -14911,8 +15861,67 @@ class Label_Match(tk.Tk):
                 except (TclError, AttributeError):
                     pass
         self._update_operator_item_panel(view, source)
+        counters = self._operator_render_counters()
+        counters["performed" if changed_sections else "skipped"] += 1
         return view
 
+    def _operator_render_counters(self):
+        return self.__dict__.setdefault(
+            "operator_render_counters",
+            {"performed": 0, "skipped": 0, "coalesced": 0},
+        )
+
+    def _operator_tree_render_layout_key(self, tree):
+        # Fitted cell text depends on the realized column widths and on the
+        # font metrics scope; a change in either forces the list rebuild.
+        try:
+            widths = tuple(
+                int(tree.column(name, "width"))
+                for name in tuple(str(value) for value in tree.cget("columns"))
+            )
+        except (TclError, AttributeError, TypeError, ValueError):
+            widths = None
+        cache = self.__dict__.get("text_measure_cache")
+        return (
+            id(tree),
+            widths,
+            self._operator_scan_tree_viewport_width(tree),
+            cache.scope if cache is not None else None,
+        )
+
+    def _request_operator_workbench_render(self):
+        """Coalesce cosmetic render requests into one after_idle pass.
+
+        Callers that gate input (scan entry, F-keys) keep calling
+        ``_render_operator_workbench`` directly; a synchronous render also
+        satisfies any request still pending.
+        """
+        if self.__dict__.get("_operator_render_after_id") is not None:
+            self._operator_render_counters()["coalesced"] += 1
+            return
+        try:
+            self._operator_render_after_id = self.after_idle(
+                self._run_requested_operator_render
+            )
+        except (TclError, RuntimeError, AttributeError):
+            self._render_operator_workbench()
+
+    def _run_requested_operator_render(self):
+        self._operator_render_after_id = None
+        if self.__dict__.get("_tk_shutdown_requested", False):
+            return
+        self._render_operator_workbench()
+
+    def _cancel_requested_operator_render(self):
+        after_id = self.__dict__.get("_operator_render_after_id")
+        if after_id is None:
+            return
+        self._operator_render_after_id = None
+        try:
+            self.after_cancel(after_id)
+        except (TclError, RuntimeError, AttributeError, ValueError):
+            pass
+
     def _refresh_operator_workbench(self):
         return self._render_operator_workbench()
 
@@ -16742,7 +17751,7 @@ class Label_Match(tk.Tk):
         if not getattr(self, "history_view_updates_active_state", True):
             return
         if self.__dict__.get("operator_workbench_ready"):
-            self._render_operator_workbench()
+            self._request_operator_workbench_render()
             return
         if "big_display_label" in self.__dict__:
             if "progress_bar" in self.__dict__:
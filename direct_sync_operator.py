@@ -17,8 +17,14 @@ from direct_sync_push import (
     RELAY_STATUS_ACKED,
     RELAY_STATUS_FAILED_PERMANENT,
     RELAY_STATUS_OPERATOR_REVIEW,
+    RELAY_STATUS_LEASED,
     RELAY_STATUS_PENDING,
+    RELAY_STATUS_RETRY_WAIT,
+    RELAY_TERMINAL_STATUSES,
     build_raw_artifact_restore_url,
+    oldest_relay_created_at,
+    read_spool_digest,
+    relay_status_totals,
     restore_raw_artifact_to_file,
     utc_now_text,
 )
@@ -84,16 +90,6 @@ def _reason_evidence(reason: str) -> dict[str, Any]:
     }
 
 
-def _read_file_digest(path: Path) -> tuple[str, int]:
-    digest = hashlib.sha256()
-    total = 0
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-            total += len(chunk)
-    return digest.hexdigest(), total
-
-
 def _metadata_for_runtime_retry(raw_metadata: str) -> str:
     """Remove a terminal one-shot lease snapshot before reserving fresh authority."""
 
@@ -219,6 +215,13 @@ def resume_relay(*, pause_path: str | os.PathLike[str], operator_id: str, reason
 
 
 def read_relay_queue_status_read_only(db_path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Report relay queue counts without writing to the database.
+
+    ``terminal_counts`` always lists every status the runner will not pick up
+    again, ``coalesced`` included: those rows are permanent audit records of
+    a merge into a later batch and are never retried or pruned.
+    """
+
     path = Path(db_path)
     if not path.is_file():
         return {"status": "not_initialized", "counts": {}, "oldest_active_created_at": ""}
@@ -227,20 +230,10 @@ def read_relay_queue_status_read_only(db_path: str | os.PathLike[str]) -> dict[s
     except sqlite3.Error as exc:
         return {"status": "blocked", "counts": {}, "oldest_active_created_at": "", "error_code": "relay_db_open_failed", "error_message": _sqlite_error_message(exc)}
     try:
-        counts = {
-            row["status"]: int(row["count"])
-            for row in conn.execute("SELECT status, COUNT(*) AS count FROM direct_sync_relay_batches GROUP BY status").fetchall()
-        }
-        oldest = conn.execute(
-            """
-            SELECT created_at
-            FROM direct_sync_relay_batches
-            WHERE status IN ('pending', 'retry_wait', 'leased')
-            ORDER BY created_at
-            LIMIT 1
-            """
-        ).fetchone()
-        return {"status": "PASS", "counts": counts, "oldest_active_created_at": oldest["created_at"] if oldest else ""}
+        counts = {status: total["count"] for status, total in relay_status_totals(conn).items()}
+        oldest = oldest_relay_created_at(conn, (RELAY_STATUS_PENDING, RELAY_STATUS_RETRY_WAIT, RELAY_STATUS_LEASED))
+        terminal_counts = {status: counts.get(status, 0) for status in RELAY_TERMINAL_STATUSES}
+        return {"status": "PASS", "counts": counts, "terminal_counts": terminal_counts, "oldest_active_created_at": oldest}
     except sqlite3.Error as exc:
         return {"status": "blocked", "counts": {}, "oldest_active_created_at": "", "error_code": "relay_db_schema_unavailable", "error_message": _sqlite_error_message(exc)}
     finally:
@@ -329,7 +322,7 @@ def restore_relay_spool_from_server(
     if spool_path.exists():
         if not spool_path.is_file():
             return blocked("spooled_file_not_regular")
-        actual_hash, actual_bytes = _read_file_digest(spool_path)
+        actual_hash, actual_bytes = read_spool_digest(spool_path)
         if actual_hash != expected_hash or actual_bytes != expected_bytes:
             return blocked(
                 "spooled_file_already_exists_mismatch",
@@ -451,7 +444,7 @@ def retry_dead_relay_batch(
             report = {"status": "BLOCKED", "operation": "retry-dead", "relay_id": relay, "operator_id": operator, "tool_version": OPERATOR_TOOL_VERSION, **reason_fields, "previous_status": previous_status, "error_code": "spooled_file_missing"}
             _append_operator_audit(audit_log_path, action="retry-dead-blocked", report=report)
             return report
-        actual_hash, actual_bytes = _read_file_digest(spool_path)
+        actual_hash, actual_bytes = read_spool_digest(spool_path)
         expected_hash = str(row["content_sha256"] or "")
         expected_bytes = int(row["byte_length"])
         if actual_hash != expected_hash or actual_bytes != expected_bytes:
@@ -3,6 +3,9 @@
 
 from __future__ import annotations
 
+import codecs
+import contextlib
+import gzip
 import hashlib
 import hmac
 import ipaddress
@@ -11,6 +14,8 @@ import math
 import os
 import re
 import sqlite3
+import tempfile
+import threading
 import time
 import unicodedata
 import uuid
@@ -18,9 +23,14 @@ from dataclasses import dataclass, field, replace
 from email.utils import parsedate_to_datetime
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Mapping
 from urllib.parse import parse_qsl, urlencode, urlparse
 
+try:
+    import zstandard
+except ImportError:  # zstd upload encoding is optional; gzip always works.
+    zstandard = None
+
 from producer_runtime_client import (
     METADATA_FIELDS as RUNTIME_METADATA_FIELDS,
     OPERATOR_REVIEW_CODES as RUNTIME_OPERATOR_REVIEW_CODES,
@@ -72,10 +82,19 @@ RELAY_STATUS_RETRY_WAIT = "retry_wait"
 RELAY_STATUS_ACKED = "acked"
 RELAY_STATUS_FAILED_PERMANENT = "failed_permanent"
 RELAY_STATUS_OPERATOR_REVIEW = "operator_review"
+# Never-attempted rows whose bytes were merged into a later batch. Their
+# spool is discarded when they coalesce; the row stays as a permanent audit
+# record of the merge and retention never prunes it.
+RELAY_STATUS_COALESCED = "coalesced"
+# Statuses the runner never picks up again on its own.
+RELAY_TERMINAL_STATUSES = (RELAY_STATUS_ACKED, RELAY_STATUS_FAILED_PERMANENT, RELAY_STATUS_COALESCED)
 DEFAULT_LEASE_SECONDS = 300
 DEFAULT_RETRY_SECONDS = 60
 MAX_RETRY_AFTER_SECONDS = 24 * 60 * 60
 SQLITE_BUSY_TIMEOUT_MS = 30000
+ORPHAN_SPOOL_MIN_AGE_SECONDS = 60 * 60
+LEGACY_SCAN_DELTA_INPUTS_DIR = "_scan_delta_inputs"
+LEGACY_CSV_DELTAS_PREFIX = "legacy_csv_deltas/"
 RELAY_METADATA_IDENTITY_FIELDS = (
     "producer_install_id",
     "source_host_id",
@@ -85,6 +104,14 @@ RELAY_METADATA_IDENTITY_FIELDS = (
     "source_transport",
     "relative_path",
 )
+# Preference order for upload encodings offered by the producer manifest.
+UPLOAD_CONTENT_ENCODINGS = ("zstd", "gzip")
+MANIFEST_UPLOAD_ENCODINGS_FIELD = "upload_content_encodings"
+CONTENT_ENCODING_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+CONTENT_ENCODING_PART_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+UPLOAD_PAYLOAD_MEMORY_BYTES = 8 * 1024 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 AUTHORIZATION_HEADER_RE = re.compile(r"(?i)authorization\s*:\s*[^\r\n\t ]+(?:[ \t]+[^\r\n\t ]+)?")
 CONTROL_TEXT_RE = re.compile(r"[\x00-\x1f\x7f]+")
 
@@ -119,6 +146,22 @@ class SourceFilePlan:
     runtime_fencing_policy: str = RUNTIME_FENCING_POLICY_RUNTIME_REQUIRED
 
 
+@dataclass(frozen=True)
+class SourceByteRange:
+    """Bytes ``[start_byte, end_byte)`` of a growing source file, sent after ``prefix``.
+
+    The range is enqueued in one read: the spool copy, SHA-256, byte length
+    and CSV row count come out of the same pass.  ``relative_path_for_sha256``
+    names the batch once the content hash is known.
+    """
+
+    source_file_path: str
+    start_byte: int
+    end_byte: int
+    relative_path_for_sha256: Callable[[str], str] = field(repr=False)
+    prefix: bytes = field(default=b"", repr=False)
+
+
 @dataclass(frozen=True)
 class UploadResult:
     success: bool
@@ -264,6 +307,14 @@ def _stream_from_manifest(manifest: Mapping[str, Any], stream_name: str) -> Mapp
     raise DirectSyncPushError(f"producer manifest does not include stream: {stream_name}")
 
 
+def _manifest_content_encoding(path: str | os.PathLike[str]) -> str:
+    # Plan building re-reads and validates the manifest; errors surface there.
+    try:
+        return negotiate_content_encoding(_stream_from_manifest(_load_manifest(path), DEFAULT_STREAM_NAME))
+    except (OSError, ValueError, DirectSyncPushError):
+        return ""
+
+
 def _safe_relative_path(value: str) -> str:
     text = str(value or "").replace("\\", "/").strip("/")
     parts = text.split("/")
@@ -284,6 +335,112 @@ def _read_file_digest(path: Path) -> tuple[str, int]:
     return digest.hexdigest(), byte_count
 
 
+def content_encoding_available(encoding: str) -> bool:
+    return encoding == "gzip" or (encoding == "zstd" and zstandard is not None)
+
+
+def negotiate_content_encoding(stream: Mapping[str, Any]) -> str:
+    """Return the preferred upload encoding the manifest stream accepts, or ``""``."""
+    offered = stream.get(MANIFEST_UPLOAD_ENCODINGS_FIELD) or []
+    if not isinstance(offered, (list, tuple)):
+        return ""
+    offered = {str(value).strip().lower() for value in offered}
+    for encoding in UPLOAD_CONTENT_ENCODINGS:
+        if encoding in offered and content_encoding_available(encoding):
+            return encoding
+    return ""
+
+
+def _stored_content_encoding(handle: IO[bytes]) -> str:
+    """Sniff a spool file's encoding from its magic bytes; CSV text never matches."""
+    position = handle.tell()
+    magic = handle.read(len(_ZSTD_MAGIC))
+    handle.seek(position)
+    if magic.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if magic == _ZSTD_MAGIC:
+        return "zstd"
+    return ""
+
+
+@contextlib.contextmanager
+def _encoded_writer(handle: IO[bytes], encoding: str) -> Iterator[IO[bytes]]:
+    if not encoding:
+        yield handle
+    elif encoding == "gzip":
+        with gzip.GzipFile(fileobj=handle, mode="wb", mtime=0) as writer:
+            yield writer
+    elif encoding == "zstd" and zstandard is not None:
+        with zstandard.ZstdCompressor().stream_writer(handle, closefd=False) as writer:
+            yield writer
+    else:
+        raise DirectSyncPushError(f"content encoding is not available: {encoding}")
+
+
+@contextlib.contextmanager
+def _decoded_reader(handle: IO[bytes]) -> Iterator[IO[bytes]]:
+    encoding = _stored_content_encoding(handle)
+    if not encoding:
+        yield handle
+    elif encoding == "gzip":
+        with gzip.GzipFile(fileobj=handle, mode="rb") as reader:
+            yield reader
+    elif zstandard is not None:
+        with zstandard.ZstdDecompressor().stream_reader(handle, closefd=False) as reader:
+            yield reader
+    else:
+        raise DirectSyncPushError("zstd-compressed spool file needs the zstandard package")
+
+
+def read_spool_digest(path: Path) -> tuple[str, int]:
+    """Return (sha256, byte_length) of a spool file's uncompressed content."""
+    digest = hashlib.sha256()
+    byte_count = 0
+    with path.open("rb") as handle, _decoded_reader(handle) as reader:
+        try:
+            for chunk in iter(lambda: reader.read(1024 * 1024), b""):
+                digest.update(chunk)
+                byte_count += len(chunk)
+        except (EOFError, gzip.BadGzipFile) as exc:
+            raise OSError(f"compressed spool file is corrupt: {exc}") from exc
+        except Exception as exc:
+            if zstandard is not None and isinstance(exc, zstandard.ZstdError):
+                raise OSError(f"compressed spool file is corrupt: {exc}") from exc
+            raise
+    return digest.hexdigest(), byte_count
+
+
+def spool_file_suffix(source_path: Path, spool_encoding: str = "") -> str:
+    return (source_path.suffix or ".bin") + CONTENT_ENCODING_SUFFIXES.get(spool_encoding, "")
+
+
+def _upload_file_name(path: Path) -> str:
+    name = path.name
+    for suffix in CONTENT_ENCODING_SUFFIXES.values():
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+@contextlib.contextmanager
+def _upload_payload(path: Path, content_encoding: str) -> Iterator[IO[bytes]]:
+    """Open ``path`` as the bytes to post for ``content_encoding``.
+
+    A spool file already stored in that encoding is sent as-is; anything else
+    is re-encoded once into a spooled temporary file.
+    """
+    with path.open("rb") as handle:
+        if _stored_content_encoding(handle) == content_encoding:
+            yield handle
+            return
+        with tempfile.SpooledTemporaryFile(max_size=UPLOAD_PAYLOAD_MEMORY_BYTES) as payload:
+            with _decoded_reader(handle) as reader, _encoded_writer(payload, content_encoding) as writer:
+                for chunk in iter(lambda: reader.read(1024 * 1024), b""):
+                    writer.write(chunk)
+            payload.seek(0)
+            yield payload
+
+
 def _stable_source_file_key(source_file_id: str, content_sha256: str) -> str:
     digest = hashlib.sha256(f"{source_file_id}\n{content_sha256}".encode("utf-8")).hexdigest()
     return f"source-file:{digest}"
@@ -294,6 +451,28 @@ def count_csv_data_rows(path: str | os.PathLike[str]) -> int:
         return max(0, sum(1 for line in handle if line.strip()) - 1)
 
 
+class _CsvRowCounter:
+    """Streaming equivalent of :func:`count_csv_data_rows` fed with raw bytes."""
+
+    _LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._partial_line = ""
+        self._non_blank_lines = 0
+
+    def feed(self, data: bytes, *, final: bool = False) -> None:
+        # A CR/LF pair split across chunks only adds an empty line, which is
+        # never counted.
+        lines = self._LINE_BREAK.split(self._partial_line + self._decoder.decode(data, final))
+        self._partial_line = "" if final else lines.pop()
+        self._non_blank_lines += sum(1 for line in lines if line.strip())
+
+    @property
+    def data_rows(self) -> int:
+        return max(0, self._non_blank_lines - 1)
+
+
 def build_source_file_plan(
     *,
     source_file_path: str | os.PathLike[str],
@@ -302,9 +481,15 @@ def build_source_file_plan(
     relative_path: str = "",
     client_batch_id: str = "",
     idempotency_key: str = "",
+    content_digest: tuple[str, int, int] | None = None,
 ) -> SourceFilePlan:
+    """Describe one source-file batch.
+
+    ``content_digest`` is ``(content_sha256, byte_length, row_count)`` when the
+    caller already streamed the content; the file is then not read again.
+    """
     file_path = Path(source_file_path)
-    if not file_path.is_file():
+    if content_digest is None and not file_path.is_file():
         raise DirectSyncPushError(f"source file does not exist: {file_path}")
     manifest = _load_manifest(producer_manifest_path)
     identity = manifest.get("pc_identity") or {}
@@ -315,13 +500,17 @@ def build_source_file_plan(
     stream = _stream_from_manifest(manifest, DEFAULT_STREAM_NAME)
     if stream.get("source_system") != DEFAULT_SOURCE_SYSTEM or stream.get("source_transport") != DEFAULT_SOURCE_TRANSPORT:
         raise DirectSyncPushError("producer manifest stream does not match Label_Match legacy CSV")
+    content_encoding = negotiate_content_encoding(stream)
     safe_relative_path = _safe_relative_path(relative_path or f"legacy_csv/{file_path.name}")
     if safe_relative_path.split("/", 1)[0] == DEFAULT_STREAM_NAME:
         raise DirectSyncPushError("relative_path must not include stream_name")
-    content_sha256, byte_length = _read_file_digest(file_path)
+    if content_digest is None:
+        content_sha256, byte_length = _read_file_digest(file_path)
+        row_count = count_csv_data_rows(file_path)
+    else:
+        content_sha256, byte_length, row_count = content_digest
     source_file_id = f"{source_host_id}/{DEFAULT_PRODUCER_ROLE}/{DEFAULT_STREAM_NAME}/{safe_relative_path}"
     stable_key = _stable_source_file_key(source_file_id, content_sha256)
-    row_count = count_csv_data_rows(file_path)
     metadata = {
         "contract_version": CONTRACT_VERSION,
         "producer_install_id": producer_install_id,
@@ -341,6 +530,9 @@ def build_source_file_plan(
         "content_sha256": content_sha256,
         "byte_length": byte_length,
     }
+    if content_encoding:
+        # content_sha256/byte_length stay defined over the uncompressed bytes.
+        metadata["content_encoding"] = content_encoding
     return SourceFilePlan(
         source_file_path=str(file_path),
         metadata=metadata,
@@ -1113,14 +1305,22 @@ def upload_source_file(
 
         session = requests.Session()
     headers = signed_headers(credentials, plan.metadata)
+    content_encoding = str(plan.metadata.get("content_encoding") or "")
+    source_path = Path(plan.source_file_path)
     try:
-        with Path(plan.source_file_path).open("rb") as handle:
+        with _upload_payload(source_path, content_encoding) as handle:
             if before_post is not None:
                 before_post()
             response = session.post(
                 credentials.endpoint_url,
                 data={"metadata": canonical_json(plan.metadata)},
-                files={"file": (Path(plan.source_file_path).name, handle, "application/octet-stream")},
+                files={
+                    "file": (
+                        _upload_file_name(source_path),
+                        handle,
+                        CONTENT_ENCODING_PART_TYPES.get(content_encoding, "application/octet-stream"),
+                    )
+                },
                 headers=headers,
                 timeout=timeout,
                 allow_redirects=False,
@@ -1150,7 +1350,43 @@ def _execute_with_busy_retry(
     raise RuntimeError("unreachable sqlite retry state")
 
 
+# Database files whose relay schema is known to be current, keyed by
+# normalised path and pinned to the file's (device, inode) identity.
+_RELAY_SCHEMA_READY: Dict[str, tuple[int, int]] = {}
+_RELAY_SCHEMA_LOCK = threading.Lock()
+# Per-thread ``{db key: RelayQueue}`` of open queues lending their connection.
+_RELAY_QUEUE_BINDINGS = threading.local()
+
+
+def _relay_db_key(db_path: str | os.PathLike[str]) -> str:
+    return os.path.normcase(os.path.abspath(os.fspath(db_path)))
+
+
+def _relay_db_identity(db_path: str | os.PathLike[str]) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def _bound_relay_queue(db_path: str | os.PathLike[str]) -> RelayQueue | None:
+    bindings = getattr(_RELAY_QUEUE_BINDINGS, "queues", None)
+    if not bindings:
+        return None
+    return bindings.get(_relay_db_key(db_path))
+
+
 def _connect_relay_db(db_path: str | os.PathLike[str]) -> sqlite3.Connection:
+    queue = _bound_relay_queue(db_path)
+    if queue is not None:
+        borrowed = queue._checkout()
+        if borrowed is not None:
+            return borrowed
+    return _open_relay_db(db_path)
+
+
+def _open_relay_db(db_path: str | os.PathLike[str]) -> sqlite3.Connection:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(str(db_path), timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
     conn.row_factory = sqlite3.Row
@@ -1161,6 +1397,11 @@ def _connect_relay_db(db_path: str | os.PathLike[str]) -> sqlite3.Connection:
 
 
 def _connect_relay_db_readonly(db_path: str | os.PathLike[str]) -> sqlite3.Connection | None:
+    queue = _bound_relay_queue(db_path)
+    if queue is not None:
+        borrowed = queue._checkout(create=False)
+        if borrowed is not None:
+            return borrowed
     path = Path(db_path)
     if not path.exists():
         parent = path.parent
@@ -1186,8 +1427,23 @@ def _relay_batches_table_exists(conn: sqlite3.Connection) -> bool:
 
 
 def init_relay_queue_schema(db_path: str | os.PathLike[str]) -> None:
+    """Create or migrate the relay queue schema once per database file.
+
+    Later calls for the same file (same path, device and inode) return
+    without touching the database; a replaced or deleted file is migrated
+    again.
+    """
+    key = _relay_db_key(db_path)
+    identity = _relay_db_identity(db_path)
+    if identity is not None and _RELAY_SCHEMA_READY.get(key) == identity:
+        return
     conn = _connect_relay_db(db_path)
     try:
+        if conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone() is None:
+            # A brand-new database can still switch to incremental vacuum, so
+            # retention can hand freed pages back to the file system.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
         conn.execute("BEGIN IMMEDIATE")
         conn.execute(
             """
@@ -1214,6 +1470,7 @@ def init_relay_queue_schema(db_path: str | os.PathLike[str]) -> None:
                 endpoint_url TEXT,
                 runtime_fencing_policy TEXT NOT NULL DEFAULT 'runtime_required'
                     CHECK(runtime_fencing_policy IN ('runtime_required', 'legacy_exact_replay')),
+                source_order_key TEXT NOT NULL DEFAULT '',
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL
             )
@@ -1227,6 +1484,31 @@ def init_relay_queue_schema(db_path: str | os.PathLike[str]) -> None:
             ON direct_sync_relay_batches(status, next_attempt_at, created_at)
             """
         )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_direct_sync_relay_source_status
+            ON direct_sync_relay_batches(source_file_path, status)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_direct_sync_relay_order_key_status
+            ON direct_sync_relay_batches(source_order_key, status)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_direct_sync_relay_status_created
+            ON direct_sync_relay_batches(status, created_at)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_direct_sync_relay_status_updated
+            ON direct_sync_relay_batches(status, updated_at, created_at, relay_id)
+            """
+        )
+        _ensure_relay_status_summary(conn)
         conn.commit()
     except Exception:
         if conn.in_transaction:
@@ -1234,6 +1516,296 @@ def init_relay_queue_schema(db_path: str | os.PathLike[str]) -> None:
         raise
     finally:
         conn.close()
+    identity = _relay_db_identity(db_path)
+    if identity is not None:
+        with _RELAY_SCHEMA_LOCK:
+            _RELAY_SCHEMA_READY[key] = identity
+
+
+class _BorrowedRelayConnection:
+    """A :class:`RelayQueue` connection lent to one queue helper call.
+
+    Behaves like the underlying ``sqlite3.Connection``; ``close()`` hands it
+    back to the queue (rolling back anything left uncommitted) instead of
+    closing it.
+    """
+
+    __slots__ = ("_queue", "_conn", "_started")
+
+    def __init__(self, queue: RelayQueue, conn: sqlite3.Connection) -> None:
+        object.__setattr__(self, "_queue", queue)
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_started", time.perf_counter())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+    def close(self) -> None:
+        queue = self._queue
+        if queue is None:
+            return
+        object.__setattr__(self, "_queue", None)
+        queue._checkin(self._conn, self._started)
+
+
+class RelayQueue:
+    """Relay queue handle holding one tuned WAL connection while open.
+
+    ``open()`` binds the queue to the current thread; the first helper that
+    needs the database initialises the schema and opens the connection.  From
+    then on every relay queue helper called on that thread for the same
+    database (claim, status updates, stale-lease resets, queue status,
+    retention) borrows the held connection instead of connecting and
+    migrating again, so repeated statements come from its prepared-statement
+    cache.  A helper called while the connection is already lent out falls
+    back to a private connection.  Opening a second queue for a database the
+    thread already has open shares the outer queue.
+    """
+
+    def __init__(self, db_path: str | os.PathLike[str]) -> None:
+        self.db_path = Path(db_path)
+        self._key = _relay_db_key(db_path)
+        self._conn: sqlite3.Connection | None = None
+        self._outer: RelayQueue | None = None
+        self._bound = False
+        self._opening = False
+        self._lent = False
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.nested_connections = 0
+        self.db_seconds = 0.0
+
+    def __enter__(self) -> RelayQueue:
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def open(self) -> RelayQueue:
+        if self._bound or self._outer is not None:
+            return self
+        bindings = getattr(_RELAY_QUEUE_BINDINGS, "queues", None)
+        if bindings is None:
+            bindings = _RELAY_QUEUE_BINDINGS.queues = {}
+        outer = bindings.get(self._key)
+        if outer is not None:
+            self._outer = outer
+            return self
+        bindings[self._key] = self
+        self._bound = True
+        return self
+
+    def close(self) -> None:
+        if self._outer is not None:
+            self._outer = None
+            return
+        if not self._bound:
+            return
+        self._bound = False
+        bindings = getattr(_RELAY_QUEUE_BINDINGS, "queues", None) or {}
+        if bindings.get(self._key) is self:
+            del bindings[self._key]
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # The schema migration runs on a private connection before the
+        # queue holds one, so failures surface in the calling helper.
+        self._opening = True
+        try:
+            init_relay_queue_schema(self.db_path)
+            conn = _open_relay_db(self.db_path)
+        finally:
+            self._opening = False
+        conn.execute("PRAGMA temp_store=MEMORY")
+        self.connections_opened += 1
+        return conn
+
+    def _checkout(self, *, create: bool = True) -> _BorrowedRelayConnection | None:
+        if not self._bound or self._opening:
+            return None
+        if self._lent:
+            self.nested_connections += 1
+            return None
+        if self._conn is None:
+            if not create:
+                return None
+            self._conn = self._connect()
+        self._lent = True
+        self.checkouts += 1
+        return _BorrowedRelayConnection(self, self._conn)
+
+    def _checkin(self, conn: sqlite3.Connection, started: float) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            self._lent = False
+            self.db_seconds += time.perf_counter() - started
+
+    def stats(self) -> dict[str, Any]:
+        """Return connection reuse and database time counters for this queue."""
+
+        queue = self._outer or self
+        return {
+            "connections_opened": queue.connections_opened,
+            "checkouts": queue.checkouts,
+            "nested_connections": queue.nested_connections,
+            "db_seconds": round(queue.db_seconds, 6),
+        }
+
+    def claim(self, *, worker_id: str, **kwargs: Any) -> RelayQueueRow | None:
+        return claim_next_relay_batch(db_path=self.db_path, worker_id=worker_id, **kwargs)
+
+    def reset_stale_leases(self, *, now: str = "") -> int:
+        return reset_stale_relay_leases(db_path=self.db_path, now=now)
+
+    def status(self) -> dict[str, Any]:
+        return relay_queue_status(self.db_path)
+
+
+_RELAY_STATUS_SUMMARY_TRIGGERS = {
+    "trg_direct_sync_relay_summary_insert": """
+        CREATE TRIGGER trg_direct_sync_relay_summary_insert
+        AFTER INSERT ON direct_sync_relay_batches
+        BEGIN
+            INSERT INTO direct_sync_relay_status_summary(status, row_count, byte_length)
+            VALUES (NEW.status, 1, NEW.byte_length)
+            ON CONFLICT(status) DO UPDATE SET
+                row_count = row_count + 1,
+                byte_length = byte_length + excluded.byte_length;
+        END
+    """,
+    "trg_direct_sync_relay_summary_delete": """
+        CREATE TRIGGER trg_direct_sync_relay_summary_delete
+        AFTER DELETE ON direct_sync_relay_batches
+        BEGIN
+            UPDATE direct_sync_relay_status_summary
+            SET row_count = row_count - 1,
+                byte_length = byte_length - OLD.byte_length
+            WHERE status = OLD.status;
+        END
+    """,
+    "trg_direct_sync_relay_summary_update": """
+        CREATE TRIGGER trg_direct_sync_relay_summary_update
+        AFTER UPDATE OF status, byte_length ON direct_sync_relay_batches
+        WHEN OLD.status IS NOT NEW.status OR OLD.byte_length IS NOT NEW.byte_length
+        BEGIN
+            UPDATE direct_sync_relay_status_summary
+            SET row_count = row_count - 1,
+                byte_length = byte_length - OLD.byte_length
+            WHERE status = OLD.status;
+            INSERT INTO direct_sync_relay_status_summary(status, row_count, byte_length)
+            VALUES (NEW.status, 1, NEW.byte_length)
+            ON CONFLICT(status) DO UPDATE SET
+                row_count = row_count + 1,
+                byte_length = byte_length + excluded.byte_length;
+        END
+    """,
+}
+
+
+def _ensure_relay_status_summary(conn: sqlite3.Connection) -> None:
+    """Keep per-status row and byte totals in a trigger-maintained table.
+
+    Every insert, delete and status change of a relay row adjusts the
+    summary inside the same transaction, so status reads never scan the
+    (ever-growing) ACKED history.  The totals are rebuilt from the rows
+    whenever a trigger had to be (re)created.
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS direct_sync_relay_status_summary (
+            status TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            byte_length INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    existing = {
+        str(row["name"])
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'direct_sync_relay_batches'")
+    }
+    missing = [name for name in _RELAY_STATUS_SUMMARY_TRIGGERS if name not in existing]
+    if not missing:
+        return
+    for name in missing:
+        conn.execute(_RELAY_STATUS_SUMMARY_TRIGGERS[name])
+    conn.execute("DELETE FROM direct_sync_relay_status_summary")
+    conn.execute(
+        """
+        INSERT INTO direct_sync_relay_status_summary(status, row_count, byte_length)
+        SELECT status, COUNT(*), COALESCE(SUM(byte_length), 0)
+        FROM direct_sync_relay_batches
+        GROUP BY status
+        """
+    )
+
+
+def _relay_status_summary_exists(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        """
+        SELECT 1
+        FROM sqlite_master
+        WHERE type = 'trigger'
+          AND name = 'trg_direct_sync_relay_summary_update'
+        LIMIT 1
+        """
+    ).fetchone() is not None
+
+
+def relay_status_totals(conn: sqlite3.Connection) -> Dict[str, Dict[str, int]]:
+    """Return ``{status: {"count", "byte_length"}}`` for the relay queue on ``conn``.
+
+    Reads the trigger-maintained summary; a database that predates it (and
+    is only open read-only) falls back to aggregating the rows.
+    """
+
+    if _relay_status_summary_exists(conn):
+        rows = conn.execute(
+            """
+            SELECT status, row_count AS count, byte_length
+            FROM direct_sync_relay_status_summary
+            WHERE row_count > 0
+            """
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            """
+            SELECT status, COUNT(*) AS count, COALESCE(SUM(byte_length), 0) AS byte_length
+            FROM direct_sync_relay_batches
+            GROUP BY status
+            """
+        ).fetchall()
+    return {str(row["status"]): {"count": int(row["count"]), "byte_length": int(row["byte_length"])} for row in rows}
+
+
+def oldest_relay_created_at(conn: sqlite3.Connection, statuses: Iterable[str]) -> str:
+    """Return the earliest ``created_at`` among rows in ``statuses`` (``""`` if none).
+
+    One ``MIN`` per status, each answered from the (status, created_at) index.
+    """
+
+    oldest = ""
+    for status in statuses:
+        row = conn.execute(
+            "SELECT MIN(created_at) AS created_at FROM direct_sync_relay_batches WHERE status = ?",
+            (status,),
+        ).fetchone()
+        created_at = str(row["created_at"] or "") if row else ""
+        if created_at and (not oldest or created_at < oldest):
+            oldest = created_at
+    return oldest
 
 
 def _ensure_relay_queue_columns(conn: sqlite3.Connection) -> None:
@@ -1262,6 +1834,31 @@ def _ensure_relay_queue_columns(conn: sqlite3.Connection) -> None:
             WHERE attempt_count > 0
             """
         )
+    if "source_order_key" not in columns:
+        conn.execute("ALTER TABLE direct_sync_relay_batches ADD COLUMN source_order_key TEXT NOT NULL DEFAULT ''")
+        conn.executemany(
+            "UPDATE direct_sync_relay_batches SET source_order_key = ? WHERE relay_id = ?",
+            [
+                (_relay_source_order_key(str(row["relative_path"]), str(row["source_file_path"])), str(row["relay_id"]))
+                for row in conn.execute("SELECT relay_id, relative_path, source_file_path FROM direct_sync_relay_batches")
+            ],
+        )
+
+
+def _relay_source_order_key(relative_path: str, source_file_path: str) -> str:
+    """Return the key that orders a row's uploads against its siblings.
+
+    Scan deltas share their ``legacy_csv_deltas/<source>/`` prefix; older
+    runners recorded a per-delta staging file as ``source_file_path``, so
+    that path alone does not tie consecutive deltas of one CSV together.
+    """
+
+    text = str(relative_path or "").replace("\\", "/")
+    if text.startswith(LEGACY_CSV_DELTAS_PREFIX):
+        source_part, separator, _ = text[len(LEGACY_CSV_DELTAS_PREFIX):].partition("/")
+        if source_part and separator:
+            return f"{LEGACY_CSV_DELTAS_PREFIX}{source_part}/"
+    return str(source_file_path or "")
 
 
 def _relay_metadata(row: sqlite3.Row) -> tuple[Dict[str, Any], str]:
@@ -1411,20 +2008,49 @@ def _path_within_candidate_roots(path_value: str, roots: tuple[Path, ...]) -> bo
     return False
 
 
-def _acked_relay_retention_report(conn: sqlite3.Connection) -> Dict[str, Any]:
-    rows = conn.execute(
+def _acked_relay_retention_report(
+    conn: sqlite3.Connection,
+    *,
+    acked: Mapping[str, int] | None = None,
+    coalesced: Mapping[str, int] | None = None,
+    audit_files: bool = False,
+) -> Dict[str, Any]:
+    if acked is None or coalesced is None:
+        totals = relay_status_totals(conn)
+        acked = totals.get(RELAY_STATUS_ACKED, {}) if acked is None else acked
+        coalesced = totals.get(RELAY_STATUS_COALESCED, {}) if coalesced is None else coalesced
+    acked_count = int(acked.get("count", 0))
+    report = {
+        **_empty_acked_relay_retention_report(),
+        "status": "RETAIN_REQUIRED" if acked_count else "not_applicable",
+        "coalesced_count": int(coalesced.get("count", 0)),
+        "acked_count": acked_count,
+        "acked_byte_length": int(acked.get("byte_length", 0)),
+        "acked_rollup_count": _acked_relay_rollup_count(conn) if acked_count else 0,
+        "oldest_acked_created_at": oldest_relay_created_at(conn, (RELAY_STATUS_ACKED,)) if acked_count else "",
+    }
+    if not acked_count:
+        return report
+    if not audit_files:
+        # Per-file figures are only known after an audit.
+        report.update(acked_spool_total_bytes=None, missing_acked_spool_count=None, missing_acked_upload_status_count=None)
+        return report
+    spooled_bytes = 0
+    missing_spooled_files = 0
+    missing_upload_status_files = 0
+    compacted = 0
+    for row in conn.execute(
         """
-        SELECT spooled_file_path, upload_status_path, created_at
+        SELECT spooled_file_path, upload_status_path
         FROM direct_sync_relay_batches
         WHERE status = ?
-        ORDER BY created_at, relay_id
         """,
         (RELAY_STATUS_ACKED,),
-    ).fetchall()
-    spooled_bytes = 0
-    missing_spooled_files = 0
-    missing_upload_status_files = 0
-    for row in rows:
+    ):
+        if not row["spooled_file_path"] and not row["upload_status_path"]:
+            # Compacted by retention; the rollup tombstone holds its digests.
+            compacted += 1
+            continue
         try:
             spooled_bytes += Path(str(row["spooled_file_path"] or "")).stat().st_size
         except OSError:
@@ -1432,35 +2058,40 @@ def _acked_relay_retention_report(conn: sqlite3.Connection) -> Dict[str, Any]:
         upload_status_path = str(row["upload_status_path"] or "")
         if not upload_status_path or not Path(upload_status_path).is_file():
             missing_upload_status_files += 1
-    return {
-        "status": "RETAIN_REQUIRED" if rows else "not_applicable",
-        "read_only": True,
-        "cleanup_safe": False,
-        "acked_row_delete_allowed": False,
-        "acked_spool_delete_allowed": False,
-        "acked_upload_status_delete_allowed": False,
-        "acked_count": len(rows),
-        "acked_spool_total_bytes": spooled_bytes,
-        "missing_acked_spool_count": missing_spooled_files,
-        "missing_acked_upload_status_count": missing_upload_status_files,
-        "oldest_acked_created_at": str(rows[0]["created_at"] or "") if rows else "",
-        "blockers": [
-            "acked rows are duplicate/lost-ack replay anchors",
-            "server receipt replay retention proof is not attached",
-            "no prune tombstone manifest exists for acked spool/status artifacts",
-        ],
-    }
+    report.update(
+        files_audited=True,
+        compacted_acked_count=compacted,
+        acked_spool_total_bytes=spooled_bytes,
+        missing_acked_spool_count=missing_spooled_files,
+        missing_acked_upload_status_count=missing_upload_status_files,
+    )
+    return report
 
 
 def _empty_acked_relay_retention_report() -> Dict[str, Any]:
+    # compact_acked_relay_artifacts deletes the spool and upload-status files
+    # of fully evidenced ACKED rows behind a rollup tombstone; the rows
+    # themselves always stay.
     return {
         "status": "not_applicable",
         "read_only": True,
         "cleanup_safe": False,
         "acked_row_delete_allowed": False,
-        "acked_spool_delete_allowed": False,
-        "acked_upload_status_delete_allowed": False,
+        "acked_spool_delete_allowed": True,
+        "acked_upload_status_delete_allowed": True,
+        "acked_artifact_delete_requires": [
+            "committed receipt matching the relay row",
+            "upload-status artifact matching the receipt",
+            "intact spool digest",
+            "rollup tombstone row in direct_sync_relay_acked_rollup",
+        ],
         "acked_count": 0,
+        "acked_byte_length": 0,
+        "acked_rollup_count": 0,
+        "coalesced_count": 0,
+        "coalesced_row_delete_allowed": False,
+        "coalesced_retention": "permanent audit row; spool discarded when coalesced",
+        "files_audited": False,
         "acked_spool_total_bytes": 0,
         "missing_acked_spool_count": 0,
         "missing_acked_upload_status_count": 0,
@@ -1468,11 +2099,19 @@ def _empty_acked_relay_retention_report() -> Dict[str, Any]:
         "blockers": [
             "acked rows are duplicate/lost-ack replay anchors",
             "server receipt replay retention proof is not attached",
-            "no prune tombstone manifest exists for acked spool/status artifacts",
         ],
     }
 
 
+def _acked_relay_rollup_count(conn: sqlite3.Connection) -> int:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'direct_sync_relay_acked_rollup'"
+    ).fetchone()
+    if exists is None:
+        return 0
+    return int(conn.execute("SELECT COUNT(*) FROM direct_sync_relay_acked_rollup").fetchone()[0])
+
+
 def acked_relay_retention_candidates(
     db_path: str | os.PathLike[str],
     *,
@@ -1480,6 +2119,7 @@ def acked_relay_retention_candidates(
     excluded_relay_ids: Iterable[str] | None = None,
     spool_roots: Iterable[str | os.PathLike[str]] | None = None,
     artifact_roots: Iterable[str | os.PathLike[str]] | None = None,
+    acked_before: str = "",
 ) -> tuple[AckedRelayRetentionCandidate, ...]:
     fetch_limit = max(0, int(limit or 0))
     if fetch_limit == 0:
@@ -1489,9 +2129,12 @@ def acked_relay_retention_candidates(
     excluded = tuple(str(relay_id) for relay_id in (excluded_relay_ids or ()) if str(relay_id))
     exclude_clause = ""
     params: list[Any] = [RELAY_STATUS_ACKED]
+    if acked_before:
+        exclude_clause = "AND updated_at <= ?"
+        params.append(str(acked_before))
     if excluded:
         placeholders = ", ".join("?" for _ in excluded)
-        exclude_clause = f"AND relay_id NOT IN ({placeholders})"
+        exclude_clause += f" AND relay_id NOT IN ({placeholders})"
         params.extend(excluded)
     params.append(max(fetch_limit * 5, fetch_limit))
     conn = _connect_relay_db_readonly(db_path)
@@ -1548,7 +2191,7 @@ def acked_relay_retention_candidates(
                 receipt=receipt,
             ):
                 continue
-            spooled_hash, spooled_bytes = _read_file_digest(Path(relay_row.spooled_file_path))
+            spooled_hash, spooled_bytes = read_spool_digest(Path(relay_row.spooled_file_path))
             if spooled_hash != relay_row.content_sha256 or spooled_bytes != relay_row.byte_length:
                 continue
             candidates.append(
@@ -1571,20 +2214,359 @@ def acked_relay_retention_candidates(
     return tuple(candidates)
 
 
-def _copy_file_atomic(source: Path, destination: Path) -> None:
+def _ensure_acked_relay_rollup(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS direct_sync_relay_acked_rollup (
+            relay_id TEXT PRIMARY KEY,
+            relative_path TEXT NOT NULL,
+            content_sha256 TEXT NOT NULL,
+            byte_length INTEGER NOT NULL,
+            receipt_sha256 TEXT NOT NULL,
+            upload_status_sha256 TEXT NOT NULL,
+            spooled_file_path TEXT NOT NULL,
+            upload_status_path TEXT NOT NULL,
+            acked_at TEXT NOT NULL,
+            compacted_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _file_size_or_zero(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _retained_acked_spool_bytes(conn: sqlite3.Connection) -> int:
+    return int(
+        conn.execute(
+            """
+            SELECT COALESCE(SUM(byte_length), 0) AS total
+            FROM direct_sync_relay_batches
+            WHERE status = ?
+              AND spooled_file_path != ''
+            """,
+            (RELAY_STATUS_ACKED,),
+        ).fetchone()["total"]
+    )
+
+
+def _sweep_orphan_relay_spools(
+    conn: sqlite3.Connection,
+    spool_dir: Path,
+    *,
+    cutoff: float,
+) -> tuple[int, int]:
+    """Delete ``relay-*`` spool files no queued row references any more."""
+
+    removed = 0
+    reclaimed = 0
+    if not spool_dir.is_dir():
+        return removed, reclaimed
+    for path in spool_dir.iterdir():
+        name = path.name
+        if not name.startswith("relay-") or not path.is_file():
+            continue
+        try:
+            if path.stat().st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        row = conn.execute(
+            "SELECT spooled_file_path FROM direct_sync_relay_batches WHERE relay_id = ?",
+            (name.split(".", 1)[0],),
+        ).fetchone()
+        referenced = str(row["spooled_file_path"] or "") if row is not None else ""
+        if referenced and Path(referenced).resolve() == path.resolve():
+            continue
+        size = _file_size_or_zero(path)
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        removed += 1
+        reclaimed += size
+    return removed, reclaimed
+
+
+def _sweep_legacy_scan_delta_inputs(
+    conn: sqlite3.Connection,
+    spool_dir: Path,
+    *,
+    cutoff: float,
+) -> tuple[int, int]:
+    """Delete ``_scan_delta_inputs`` staging files no unsent row still reads.
+
+    Older runners staged each scan delta there and never removed it; a file
+    is kept while a non-ACKED row names it as ``source_file_path``.
+    """
+
+    removed = 0
+    reclaimed = 0
+    staging_root = spool_dir / LEGACY_SCAN_DELTA_INPUTS_DIR
+    if not staging_root.is_dir():
+        return removed, reclaimed
+    referenced: set[Path] = set()
+    for row in conn.execute(
+        """
+        SELECT source_file_path
+        FROM direct_sync_relay_batches
+        WHERE status != ?
+          AND source_file_path LIKE ?
+        """,
+        (RELAY_STATUS_ACKED, f"%{LEGACY_SCAN_DELTA_INPUTS_DIR}%"),
+    ):
+        try:
+            referenced.add(Path(str(row["source_file_path"])).resolve())
+        except OSError:
+            continue
+    for key_dir in staging_root.iterdir():
+        if key_dir.is_symlink() or not key_dir.is_dir():
+            continue
+        for path in key_dir.iterdir():
+            if path.is_symlink() or not path.is_file():
+                continue
+            try:
+                if path.stat().st_mtime > cutoff or path.resolve() in referenced:
+                    continue
+            except OSError:
+                continue
+            size = _file_size_or_zero(path)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            reclaimed += size
+        try:
+            key_dir.rmdir()
+        except OSError:
+            pass
+    return removed, reclaimed
+
+
+def compact_acked_relay_artifacts(
+    db_path: str | os.PathLike[str],
+    *,
+    spool_dir: str | os.PathLike[str],
+    upload_status_dir: str | os.PathLike[str],
+    min_age_seconds: int,
+    max_acked_spool_bytes: int = 0,
+    limit: int = 200,
+    now: str = "",
+) -> Dict[str, Any]:
+    """Reclaim disk held by fully evidenced ACKED batches and stray spool files.
+
+    Only :func:`acked_relay_retention_candidates` (committed receipt, matching
+    upload-status artifact, intact spool) are compacted: those acked longer
+    than ``min_age_seconds`` ago, plus the oldest others while the remaining
+    ACKED spool bytes exceed ``max_acked_spool_bytes`` (``0`` disables either
+    rule).  Each compacted row
+    keeps its ACKED status, identity and receipt as the duplicate/lost-ack
+    replay anchor; its artifact digests go to a rollup tombstone and its
+    spool and upload-status files are deleted after commit.  Unreferenced
+    ``relay-*`` spool files older than ``min_age_seconds`` (and at least
+    :data:`ORPHAN_SPOOL_MIN_AGE_SECONDS`, so in-flight staging files of
+    another enqueue survive) are swept, as are ``_scan_delta_inputs`` staging
+    files left by older runners once no unsent row reads them, and the
+    WAL is checkpointed (plus an incremental vacuum where enabled).
+    """
+
+    report: Dict[str, Any] = {
+        "compacted_count": 0,
+        "reclaimed_spool_bytes": 0,
+        "reclaimed_upload_status_bytes": 0,
+        "orphan_spool_count": 0,
+        "reclaimed_orphan_bytes": 0,
+        "reclaimed_bytes": 0,
+        "wal_checkpointed": False,
+        "vacuumed_pages": 0,
+    }
+    if not Path(db_path).is_file():
+        return report
+    init_relay_queue_schema(db_path)
+    now = now or utc_now_text()
+    now_time = datetime.fromisoformat(now.replace("Z", "+00:00"))
+    min_age_seconds = max(0, int(min_age_seconds or 0))
+    cutoff_text = (now_time - timedelta(seconds=min_age_seconds)).isoformat().replace("+00:00", "Z")
+    deleted_paths: list[tuple[str, Path]] = []
+    conn = _connect_relay_db(db_path)
+    try:
+        _ensure_acked_relay_rollup(conn)
+        conn.commit()
+        retained_bytes = _retained_acked_spool_bytes(conn)
+        over_budget = max_acked_spool_bytes > 0 and retained_bytes > max_acked_spool_bytes
+        candidates: tuple[AckedRelayRetentionCandidate, ...] = tuple()
+        if over_budget or min_age_seconds > 0:
+            # Without size pressure only rows already past the age cutoff can
+            # qualify, so filter in SQL before verifying any artifact.
+            candidates = acked_relay_retention_candidates(
+                db_path,
+                limit=limit,
+                spool_roots=[spool_dir],
+                artifact_roots=[upload_status_dir],
+                acked_before="" if over_budget else cutoff_text,
+            )
+        if candidates:
+            conn.execute("BEGIN IMMEDIATE")
+            retained_bytes = _retained_acked_spool_bytes(conn)
+        for candidate in candidates:
+            row = conn.execute(
+                """
+                SELECT updated_at, receipt_json
+                FROM direct_sync_relay_batches
+                WHERE relay_id = ?
+                  AND status = ?
+                  AND spooled_file_path = ?
+                  AND upload_status_path = ?
+                """,
+                (candidate.relay_id, RELAY_STATUS_ACKED, candidate.spooled_file_path, candidate.upload_status_path),
+            ).fetchone()
+            if row is None:
+                continue
+            acked_at = str(row["updated_at"] or "")
+            aged_out = min_age_seconds > 0 and acked_at <= cutoff_text
+            over_budget = max_acked_spool_bytes > 0 and retained_bytes > max_acked_spool_bytes
+            if not aged_out and not over_budget:
+                continue
+            status_path = Path(candidate.upload_status_path)
+            upload_status_sha256, _ = _read_file_digest(status_path)
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO direct_sync_relay_acked_rollup (
+                    relay_id, relative_path, content_sha256, byte_length,
+                    receipt_sha256, upload_status_sha256, spooled_file_path,
+                    upload_status_path, acked_at, compacted_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    candidate.relay_id,
+                    candidate.relative_path,
+                    candidate.content_sha256,
+                    candidate.byte_length,
+                    hashlib.sha256(str(row["receipt_json"] or "").encode("utf-8")).hexdigest(),
+                    upload_status_sha256,
+                    candidate.spooled_file_path,
+                    candidate.upload_status_path,
+                    acked_at,
+                    now,
+                ),
+            )
+            conn.execute(
+                """
+                UPDATE direct_sync_relay_batches
+                SET spooled_file_path = '',
+                    upload_status_path = ''
+                WHERE relay_id = ?
+                """,
+                (candidate.relay_id,),
+            )
+            retained_bytes -= candidate.byte_length
+            report["compacted_count"] += 1
+            deleted_paths.append(("reclaimed_spool_bytes", Path(candidate.spooled_file_path)))
+            deleted_paths.append(("reclaimed_upload_status_bytes", status_path))
+        if conn.in_transaction:
+            conn.commit()
+        for key, path in deleted_paths:
+            size = _file_size_or_zero(path)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            report[key] += size
+        orphan_cutoff = now_time.timestamp() - max(min_age_seconds, ORPHAN_SPOOL_MIN_AGE_SECONDS)
+        orphan_count, orphan_bytes = _sweep_orphan_relay_spools(conn, Path(spool_dir), cutoff=orphan_cutoff)
+        staged_count, staged_bytes = _sweep_legacy_scan_delta_inputs(conn, Path(spool_dir), cutoff=orphan_cutoff)
+        report["orphan_spool_count"] = orphan_count + staged_count
+        report["reclaimed_orphan_bytes"] = orphan_bytes + staged_bytes
+        if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) == 2:
+            freelist = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+            if freelist:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+            report["vacuumed_pages"] = freelist
+        checkpoint = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        report["wal_checkpointed"] = checkpoint is not None and int(checkpoint[0]) == 0
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+    report["reclaimed_bytes"] = (
+        report["reclaimed_spool_bytes"] + report["reclaimed_upload_status_bytes"] + report["reclaimed_orphan_bytes"]
+    )
+    return report
+
+
+def _copy_file_atomic(source: Path, destination: Path, *, encoding: str = "") -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     temp_path = destination.with_suffix(destination.suffix + ".tmp")
     with source.open("rb") as src, temp_path.open("wb") as dst:
-        for chunk in iter(lambda: src.read(1024 * 1024), b""):
-            dst.write(chunk)
+        with _encoded_writer(dst, encoding) as writer:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                writer.write(chunk)
         dst.flush()
         os.fsync(dst.fileno())
     os.replace(temp_path, destination)
 
 
-def _copy_spool_file_atomic(source: Path, destination: Path) -> None:
+def _copy_spool_file_atomic(source: Path, destination: Path, *, encoding: str = "") -> None:
+    try:
+        _copy_file_atomic(source, destination, encoding=encoding)
+    except OSError as exc:
+        raise RelaySpoolFileError(f"relay spool file cannot be written: {exc.__class__.__name__}") from exc
+
+
+def _stage_source_range(
+    source_range: SourceByteRange,
+    staged_path: Path,
+    *,
+    encoding: str = "",
+) -> tuple[str, int, int]:
+    """Write ``source_range`` to ``staged_path`` and return (sha256, bytes, rows) from the same pass.
+
+    The hash, length and row count describe the uncompressed bytes even when
+    the staged copy is written with ``encoding``.
+    """
+    digest = hashlib.sha256()
+    rows = _CsvRowCounter()
+    byte_length = 0
+    start_byte = int(source_range.start_byte)
+    remaining = int(source_range.end_byte) - start_byte
+    if remaining <= 0:
+        raise DirectSyncPushError("source byte range is empty")
+    try:
+        staged_path.parent.mkdir(parents=True, exist_ok=True)
+        with Path(source_range.source_file_path).open("rb") as src, staged_path.open("wb") as dst:
+            src.seek(start_byte)
+            chunk = bytes(source_range.prefix)
+            with _encoded_writer(dst, encoding) as writer:
+                while True:
+                    if chunk:
+                        writer.write(chunk)
+                        digest.update(chunk)
+                        rows.feed(chunk)
+                        byte_length += len(chunk)
+                    if not remaining:
+                        break
+                    chunk = src.read(min(1024 * 1024, remaining))
+                    if not chunk:
+                        raise DirectSyncPushError("source file is shorter than the requested byte range")
+                    remaining -= len(chunk)
+            rows.feed(b"", final=True)
+            dst.flush()
+            os.fsync(dst.fileno())
+    except OSError as exc:
+        raise RelaySpoolFileError(f"relay spool file cannot be written: {exc.__class__.__name__}") from exc
+    return digest.hexdigest(), byte_length, rows.data_rows
+
+
+def _place_staged_spool_file(staged_path: Path, destination: Path) -> None:
     try:
-        _copy_file_atomic(source, destination)
+        os.replace(staged_path, destination)
     except OSError as exc:
         raise RelaySpoolFileError(f"relay spool file cannot be written: {exc.__class__.__name__}") from exc
 
@@ -1642,7 +2624,7 @@ def _find_conflicting_relay_batch(
 
 def _spooled_file_matches_relay_row(row: sqlite3.Row) -> bool:
     try:
-        spooled_hash, spooled_bytes = _read_file_digest(Path(str(row["spooled_file_path"])))
+        spooled_hash, spooled_bytes = read_spool_digest(Path(str(row["spooled_file_path"])))
     except OSError:
         return False
     return spooled_hash == str(row["content_sha256"]).lower() and spooled_bytes == int(row["byte_length"])
@@ -1654,13 +2636,19 @@ def _repair_relay_spool_for_existing_row(
     existing: sqlite3.Row,
     source_path: Path,
     spool_dir: str | os.PathLike[str],
+    staged_spool_path: Path | None = None,
+    spool_encoding: str = "",
 ) -> sqlite3.Row:
     relay_id = str(existing["relay_id"])
-    repaired_spool_path = Path(spool_dir) / f"{relay_id}{source_path.suffix or '.bin'}"
-    _copy_spool_file_atomic(source_path, repaired_spool_path)
-    spooled_hash, spooled_bytes = _read_file_digest(repaired_spool_path)
-    if spooled_hash != str(existing["content_sha256"]).lower() or spooled_bytes != int(existing["byte_length"]):
-        raise DirectSyncPushError("repaired spool file hash or byte length mismatch")
+    repaired_spool_path = Path(spool_dir) / f"{relay_id}{spool_file_suffix(source_path, spool_encoding)}"
+    if staged_spool_path is not None:
+        # The staged content was hashed while it was written and matched this row.
+        _place_staged_spool_file(staged_spool_path, repaired_spool_path)
+    else:
+        _copy_spool_file_atomic(source_path, repaired_spool_path, encoding=spool_encoding)
+        spooled_hash, spooled_bytes = read_spool_digest(repaired_spool_path)
+        if spooled_hash != str(existing["content_sha256"]).lower() or spooled_bytes != int(existing["byte_length"]):
+            raise DirectSyncPushError("repaired spool file hash or byte length mismatch")
     conn.execute(
         """
         UPDATE direct_sync_relay_batches
@@ -1691,20 +2679,56 @@ def enqueue_source_file_for_relay(
     credentials: ProducerCredentials,
     relative_path: str = "",
     dedupe_existing: bool = False,
+    source_range: SourceByteRange | None = None,
+    compress_spool: bool = False,
+    supersedes_relay_ids: Iterable[str] = (),
 ) -> RelayQueueRow:
+    """Spool one source file, or ``source_range`` of it, and queue it for relay.
+
+    A ``source_range`` is streamed once into a staged spool file that also
+    yields its hash, length and row count; it replaces ``relative_path``.
+    ``compress_spool`` stores the spool copy in the negotiated upload
+    encoding (gzip when the manifest offers none), so it posts without
+    re-encoding.
+
+    ``supersedes_relay_ids`` names pending, never-attempted rows whose bytes
+    the new batch covers; they move to ``coalesced`` in the same transaction
+    as the insert, or the enqueue fails if any of them was claimed meanwhile.
+    """
     init_relay_queue_schema(db_path)
     source_path = Path(source_file_path).resolve()
     manifest_path = Path(producer_manifest_path).resolve()
     if not source_path.is_file():
         raise DirectSyncPushError(f"source file does not exist: {source_path}")
     relay_id = f"relay-{uuid.uuid4().hex}"
-    plan = build_source_file_plan(
-        source_file_path=source_path,
-        producer_manifest_path=manifest_path,
-        credentials=credentials,
-        relative_path=relative_path,
-        client_batch_id=relay_id,
-    )
+    superseded_ids = sorted({str(value) for value in supersedes_relay_ids if value})
+    superseded_spool_paths: list[str] = []
+    spool_encoding = (_manifest_content_encoding(manifest_path) or "gzip") if compress_spool else ""
+    spool_suffix = spool_file_suffix(source_path, spool_encoding)
+    staged_spool_path: Path | None = None
+    if source_range is None:
+        plan = build_source_file_plan(
+            source_file_path=source_path,
+            producer_manifest_path=manifest_path,
+            credentials=credentials,
+            relative_path=relative_path,
+            client_batch_id=relay_id,
+        )
+    else:
+        staged_spool_path = Path(spool_dir) / f"{relay_id}{spool_suffix}.tmp"
+        try:
+            content_digest = _stage_source_range(source_range, staged_spool_path, encoding=spool_encoding)
+            plan = build_source_file_plan(
+                source_file_path=source_path,
+                producer_manifest_path=manifest_path,
+                credentials=credentials,
+                relative_path=source_range.relative_path_for_sha256(content_digest[0]),
+                client_batch_id=relay_id,
+                content_digest=content_digest,
+            )
+        except Exception:
+            _discard_staged_spool_file(staged_spool_path)
+            raise
     conn = _connect_relay_db(db_path)
     spool_path: Path | None = None
     try:
@@ -1727,16 +2751,23 @@ def enqueue_source_file_for_relay(
                         existing=existing,
                         source_path=source_path,
                         spool_dir=spool_dir,
+                        staged_spool_path=staged_spool_path,
+                        spool_encoding=spool_encoding,
                     )
                 conn.commit()
                 return _relay_row(existing, deduped_existing=True)
 
-        spool_path = Path(spool_dir) / f"{relay_id}{source_path.suffix or '.bin'}"
-        _copy_spool_file_atomic(source_path, spool_path)
-        spooled_hash, spooled_bytes = _read_file_digest(spool_path)
-        if spooled_hash != plan.content_sha256 or spooled_bytes != plan.byte_length:
-            raise DirectSyncPushError("spooled file hash or byte length mismatch")
+        spool_path = Path(spool_dir) / f"{relay_id}{spool_suffix}"
+        if staged_spool_path is not None:
+            _place_staged_spool_file(staged_spool_path, spool_path)
+        else:
+            _copy_spool_file_atomic(source_path, spool_path, encoding=spool_encoding)
+            spooled_hash, spooled_bytes = read_spool_digest(spool_path)
+            if spooled_hash != plan.content_sha256 or spooled_bytes != plan.byte_length:
+                raise DirectSyncPushError("spooled file hash or byte length mismatch")
         now = utc_now_text()
+        if superseded_ids:
+            superseded_spool_paths = _supersede_pending_relay_rows(conn, superseded_ids, relay_id=relay_id, now=now)
         conn.execute(
             """
             INSERT INTO direct_sync_relay_batches (
@@ -1744,8 +2775,8 @@ def enqueue_source_file_for_relay(
                 producer_manifest_path, relative_path, content_sha256,
                 byte_length, attempt_count, next_attempt_at, metadata_json,
                 producer_id, key_id, endpoint_url, runtime_fencing_policy,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?, ?, ?, ?)
+                source_order_key, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 relay_id,
@@ -1762,6 +2793,7 @@ def enqueue_source_file_for_relay(
                 credentials.key_id,
                 credentials.endpoint_url,
                 RUNTIME_FENCING_POLICY_RUNTIME_REQUIRED,
+                _relay_source_order_key(plan.metadata["relative_path"], str(source_path)),
                 now,
                 now,
             ),
@@ -1771,6 +2803,8 @@ def enqueue_source_file_for_relay(
             "SELECT * FROM direct_sync_relay_batches WHERE relay_id = ?",
             (relay_id,),
         ).fetchone()
+        for superseded_spool_path in superseded_spool_paths:
+            _discard_staged_spool_file(Path(superseded_spool_path))
         return _relay_row(row)
     except Exception:
         conn.rollback()
@@ -1782,6 +2816,56 @@ def enqueue_source_file_for_relay(
         raise
     finally:
         conn.close()
+        if staged_spool_path is not None:
+            _discard_staged_spool_file(staged_spool_path)
+
+
+def _supersede_pending_relay_rows(
+    conn: sqlite3.Connection,
+    relay_ids: list[str],
+    *,
+    relay_id: str,
+    now: str,
+) -> list[str]:
+    placeholders = ", ".join("?" for _ in relay_ids)
+    rows = conn.execute(
+        f"""
+        SELECT relay_id, spooled_file_path
+        FROM direct_sync_relay_batches
+        WHERE relay_id IN ({placeholders})
+          AND status = ?
+          AND attempt_count = 0
+        """,
+        (*relay_ids, RELAY_STATUS_PENDING),
+    ).fetchall()
+    if len(rows) != len(relay_ids):
+        raise DirectSyncPushError("coalesced relay rows are no longer pending")
+    conn.execute(
+        f"""
+        UPDATE direct_sync_relay_batches
+        SET status = ?,
+            last_error_code = ?,
+            last_error_message = ?,
+            next_attempt_at = NULL,
+            updated_at = ?
+        WHERE relay_id IN ({placeholders})
+        """,
+        (
+            RELAY_STATUS_COALESCED,
+            "coalesced",
+            f"bytes merged into {relay_id}",
+            now,
+            *relay_ids,
+        ),
+    )
+    return [str(row["spooled_file_path"] or "") for row in rows if row["spooled_file_path"]]
+
+
+def _discard_staged_spool_file(staged_spool_path: Path) -> None:
+    try:
+        staged_spool_path.unlink()
+    except OSError:
+        pass
 
 
 def reset_stale_relay_leases(
@@ -1819,7 +2903,14 @@ def claim_next_relay_batch(
     lease_seconds: int = DEFAULT_LEASE_SECONDS,
     now: str = "",
     target_relay_id: str = "",
+    source_ordered: bool = False,
 ) -> RelayQueueRow | None:
+    """Lease the next due relay row (or ``target_relay_id``) to ``worker_id``.
+
+    ``source_ordered`` is for concurrent drains: it skips rows whose source
+    (``source_order_key``) still has an earlier or in-flight delta, and rows that would need
+    the runtime request authority while another runtime-fenced row holds it.
+    """
     init_relay_queue_schema(db_path)
     now = now or utc_now_text()
     reset_stale_relay_leases(db_path=db_path, now=now)
@@ -1841,6 +2932,53 @@ def claim_next_relay_batch(
                 """,
                 (target_relay_id, RELAY_STATUS_PENDING, RELAY_STATUS_RETRY_WAIT, now),
             ).fetchone()
+        elif source_ordered:
+            row = conn.execute(
+                """
+                SELECT candidate.*
+                FROM direct_sync_relay_batches AS candidate
+                WHERE candidate.status IN (?, ?)
+                  AND (candidate.next_attempt_at IS NULL OR candidate.next_attempt_at <= ?)
+                  AND NOT EXISTS (
+                    SELECT 1
+                    FROM direct_sync_relay_batches AS sibling
+                    WHERE sibling.source_order_key = candidate.source_order_key
+                      AND sibling.relay_id != candidate.relay_id
+                      AND (
+                        sibling.status = ?
+                        OR (
+                          sibling.status IN (?, ?)
+                          AND (
+                            sibling.created_at < candidate.created_at
+                            OR (sibling.created_at = candidate.created_at AND sibling.relay_id < candidate.relay_id)
+                          )
+                        )
+                      )
+                  )
+                  AND (
+                    candidate.runtime_fencing_policy != ?
+                    OR NOT EXISTS (
+                      SELECT 1
+                      FROM direct_sync_relay_batches AS fenced
+                      WHERE fenced.status = ?
+                        AND fenced.runtime_fencing_policy = ?
+                    )
+                  )
+                ORDER BY candidate.created_at, candidate.relay_id
+                LIMIT 1
+                """,
+                (
+                    RELAY_STATUS_PENDING,
+                    RELAY_STATUS_RETRY_WAIT,
+                    now,
+                    RELAY_STATUS_LEASED,
+                    RELAY_STATUS_PENDING,
+                    RELAY_STATUS_RETRY_WAIT,
+                    RUNTIME_FENCING_POLICY_RUNTIME_REQUIRED,
+                    RELAY_STATUS_LEASED,
+                    RUNTIME_FENCING_POLICY_RUNTIME_REQUIRED,
+                ),
+            ).fetchone()
         else:
             row = conn.execute(
                 """
@@ -2199,17 +3337,19 @@ def drain_one_relay_batch(
     retry_base_seconds: int = DEFAULT_RETRY_SECONDS,
     timeout: int = DEFAULT_TIMEOUT_SECONDS,
     target_relay_id: str = "",
+    source_ordered: bool = False,
 ) -> UploadResult | None:
     now = utc_now_text()
     row = claim_next_relay_batch(
         db_path=db_path,
         worker_id=worker_id,
         target_relay_id=target_relay_id,
+        source_ordered=source_ordered,
     )
     if row is None:
         return None
     try:
-        spooled_hash, spooled_bytes = _read_file_digest(Path(row.spooled_file_path))
+        spooled_hash, spooled_bytes = read_spool_digest(Path(row.spooled_file_path))
     except OSError as exc:
         error_code = "spooled_file_missing" if isinstance(exc, FileNotFoundError) else "spooled_file_unreadable"
         result = UploadResult(
@@ -2492,7 +3632,33 @@ def drain_one_relay_batch(
     return result
 
 
-def relay_queue_status(db_path: str | os.PathLike[str]) -> Dict[str, Any]:
+def relay_batches_byte_length(db_path: str | os.PathLike[str], relay_ids: Iterable[str]) -> int:
+    """Return the summed queued byte length of ``relay_ids``."""
+    ids = sorted({str(relay_id) for relay_id in relay_ids if relay_id})
+    if not ids:
+        return 0
+    conn = _connect_relay_db_readonly(db_path)
+    if conn is None:
+        return 0
+    try:
+        placeholders = ", ".join("?" for _ in ids)
+        row = conn.execute(
+            f"SELECT COALESCE(SUM(byte_length), 0) AS total FROM direct_sync_relay_batches WHERE relay_id IN ({placeholders})",
+            ids,
+        ).fetchone()
+        return int(row["total"] or 0)
+    finally:
+        conn.close()
+
+
+def relay_queue_status(db_path: str | os.PathLike[str], *, audit_acked_files: bool = False) -> Dict[str, Any]:
+    """Return relay queue counts, the oldest active row and the ACKED retention report.
+
+    Counts come from the trigger-maintained status summary and the oldest
+    rows from index lookups, so the cost does not grow with ACKED history.
+    ``audit_acked_files`` additionally stats every ACKED spool and upload
+    status file for the retention report.
+    """
     conn = _connect_relay_db_readonly(db_path)
     if conn is None:
         return {
@@ -2507,30 +3673,19 @@ def relay_queue_status(db_path: str | os.PathLike[str]) -> Dict[str, Any]:
                 "oldest_active_created_at": "",
                 "acked_retention": _empty_acked_relay_retention_report(),
             }
-        counts = {
-            row["status"]: int(row["count"])
-            for row in conn.execute(
-                """
-                SELECT status, COUNT(*) AS count
-                FROM direct_sync_relay_batches
-                GROUP BY status
-                """
-            ).fetchall()
-        }
-        oldest = conn.execute(
-            """
-            SELECT created_at
-            FROM direct_sync_relay_batches
-            WHERE status IN (?, ?, ?)
-            ORDER BY created_at
-            LIMIT 1
-            """,
-            (RELAY_STATUS_PENDING, RELAY_STATUS_RETRY_WAIT, RELAY_STATUS_LEASED),
-        ).fetchone()
+        totals = relay_status_totals(conn)
         return {
-            "counts": counts,
-            "oldest_active_created_at": oldest["created_at"] if oldest else "",
-            "acked_retention": _acked_relay_retention_report(conn),
+            "counts": {status: total["count"] for status, total in totals.items()},
+            "oldest_active_created_at": oldest_relay_created_at(
+                conn,
+                (RELAY_STATUS_PENDING, RELAY_STATUS_RETRY_WAIT, RELAY_STATUS_LEASED),
+            ),
+            "acked_retention": _acked_relay_retention_report(
+                conn,
+                acked=totals.get(RELAY_STATUS_ACKED, {}),
+                coalesced=totals.get(RELAY_STATUS_COALESCED, {}),
+                audit_files=audit_acked_files,
+            ),
         }
     finally:
         conn.close()
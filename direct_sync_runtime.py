@@ -10,6 +10,8 @@ import re
 import shutil
 import sqlite3
 import sys
+import threading
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -25,13 +27,17 @@ from direct_sync_push import (
     DEFAULT_TIMEOUT_SECONDS,
     DirectSyncPushError,
     ProducerCredentials,
+    RelayQueue,
     RELAY_STATUS_LEASED,
     RELAY_STATUS_PENDING,
     RELAY_STATUS_RETRY_WAIT,
+    SourceByteRange,
     UploadResult,
+    compact_acked_relay_artifacts,
     drain_one_relay_batch,
     enqueue_source_file_for_relay,
     manifest_hash,
+    relay_batches_byte_length,
     relay_queue_status,
     reset_stale_relay_leases,
     utc_now_text,
@@ -41,6 +47,10 @@ from direct_sync_operator import read_operator_pause
 
 
 DEFAULT_WORKER_ID = "direct-sync-relay-label-match"
+DEFAULT_RELAY_IDLE_REUSE_SECONDS = 30
+DEFAULT_RELAY_POOL_MAXSIZE = 4
+DRAIN_CONTINUE_STATUSES = frozenset({"acked", "operator_review", "failed_permanent"})
+_JSONL_APPEND_LOCK = threading.Lock()
 PRODUCTION_PROFILE_ENV_NAMES = ("APP_ENV", "ENV", "LABEL_MATCH_PRODUCTION", "DIRECT_SYNC_PRODUCTION")
 SECRET_REF_NAME_RE = re.compile(r"^[A-Za-z0-9._-]+$")
 WINDOWS_RESERVED_DEVICE_NAMES = {
@@ -72,6 +82,9 @@ class DirectSyncRuntimeConfig:
     operator_pause_path: str | os.PathLike[str] = ""
     max_active_queue_count: int = 0
     max_active_queue_age_seconds: int = 0
+    compress_spool: bool = False
+    acked_retention_seconds: int = 0
+    max_acked_spool_bytes: int = 0
 
 
 def _write_json_atomic(path: str | os.PathLike[str], payload: Mapping[str, Any]) -> None:
@@ -96,9 +109,9 @@ def _write_json_atomic(path: str | os.PathLike[str], payload: Mapping[str, Any])
 def _append_jsonl(path: str | os.PathLike[str], payload: Mapping[str, Any]) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("a", encoding="utf-8", newline="\n") as handle:
-        handle.write(json.dumps(dict(payload), ensure_ascii=False, sort_keys=True))
-        handle.write("\n")
+    line = json.dumps(dict(payload), ensure_ascii=False, sort_keys=True) + "\n"
+    with _JSONL_APPEND_LOCK, target.open("a", encoding="utf-8", newline="\n") as handle:
+        handle.write(line)
         handle.flush()
         os.fsync(handle.fileno())
 
@@ -595,6 +608,7 @@ def _write_runtime_status(
     error_code: str = "",
     error_message: str = "",
     source_identity: Mapping[str, Any] | None = None,
+    persist: bool = True,
 ) -> dict[str, Any]:
     source_identity = dict(source_identity or _producer_manifest_identity(config))
     payload = {
@@ -615,7 +629,8 @@ def _write_runtime_status(
         "error_message": error_message,
         "updated_at": utc_now_text(),
     }
-    _write_json_atomic(config.runtime_status_path, payload)
+    if persist:
+        _write_json_atomic(config.runtime_status_path, payload)
     return payload
 
 
@@ -643,11 +658,77 @@ def _append_runtime_event(
     _append_jsonl(config.log_path, entry)
 
 
+class RelayHttpSession:
+    """Keep-alive HTTP session shared by relay uploads and runtime lease requests.
+
+    Pooled connections idle for longer than ``idle_reuse_seconds`` are dropped
+    before the next request; ``0`` asks the server to close every connection.
+    ``handshakes`` counts the connections opened so far.  Safe to share
+    between concurrent upload workers up to ``pool_maxsize`` connections.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_reuse_seconds: float = DEFAULT_RELAY_IDLE_REUSE_SECONDS,
+        pool_maxsize: int = DEFAULT_RELAY_POOL_MAXSIZE,
+    ) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.idle_reuse_seconds = max(0.0, float(idle_reuse_seconds))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._last_used = 0.0
+        self._closed_handshakes = 0
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_maxsize))))
+        if not self.idle_reuse_seconds:
+            self._session.headers["Connection"] = "close"
+
+    def _connections_opened(self) -> int:
+        total = 0
+        for adapter in self._session.adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                total += int(getattr(pool, "num_connections", 0) or 0)
+        return total
+
+    @property
+    def handshakes(self) -> int:
+        with self._lock:
+            return self._closed_handshakes + self._connections_opened()
+
+    def _drop_pools(self) -> None:
+        self._closed_handshakes += self._connections_opened()
+        self._session.close()
+
+    def post(self, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            idle_for = time.monotonic() - self._last_used
+            if self._last_used and self.idle_reuse_seconds and not self._in_flight and idle_for > self.idle_reuse_seconds:
+                self._drop_pools()
+            self._in_flight += 1
+        try:
+            return self._session.post(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_pools()
+
+
 def _paused_by_operator(config: DirectSyncRuntimeConfig) -> dict[str, Any]:
     return read_operator_pause(config.operator_pause_path)
 
 
-def _write_paused_status(config: DirectSyncRuntimeConfig, *, event: str) -> dict[str, Any]:
+def _write_paused_status(config: DirectSyncRuntimeConfig, *, event: str, persist: bool = True) -> dict[str, Any]:
     pause = _paused_by_operator(config)
     queue = relay_queue_status(config.db_path)
     status = _write_runtime_status(
@@ -658,6 +739,7 @@ def _write_paused_status(config: DirectSyncRuntimeConfig, *, event: str) -> dict
         operator_control=pause,
         error_code="operator_paused",
         error_message="direct-sync relay is paused by local operator control",
+        persist=persist,
     )
     _append_runtime_event(config, event, status)
     return status
@@ -739,8 +821,13 @@ def enqueue_completed_source_file(
     relative_path: str = "",
     credentials: ProducerCredentials | None = None,
     backpressure_recovery_session: Any = None,
+    source_range: SourceByteRange | None = None,
+    supersedes_relay_ids: tuple[str, ...] = (),
 ) -> dict[str, Any]:
-    """Spool one completed Label_Match CSV and persist local operator evidence."""
+    """Spool one completed Label_Match CSV (or a byte range of it) and persist local operator evidence.
+
+    ``supersedes_relay_ids`` are pending deltas merged into this batch.
+    """
     if _paused_by_operator(config).get("paused"):
         return _write_paused_status(config, event="enqueue_paused_by_operator")
 
@@ -785,6 +872,9 @@ def enqueue_completed_source_file(
             credentials=creds,
             relative_path=relative_path,
             dedupe_existing=True,
+            source_range=source_range,
+            compress_spool=config.compress_spool,
+            supersedes_relay_ids=supersedes_relay_ids,
         )
     except (DirectSyncPushError, sqlite3.DatabaseError, OSError, UnicodeError) as exc:
         queue = _safe_relay_queue_status(config.db_path)
@@ -814,35 +904,26 @@ def enqueue_completed_source_file(
         _append_runtime_event(config, event_name, status)
         return status
     queue = relay_queue_status(config.db_path)
+    enqueue_result = {
+        "relay_id": row.relay_id,
+        "relay_status": row.status,
+        "spooled_file_path": row.spooled_file_path,
+        "relative_path": row.relative_path,
+        "content_sha256": row.content_sha256,
+        "byte_length": row.byte_length,
+        "deduped_existing": row.deduped_existing,
+    }
+    if supersedes_relay_ids and not row.deduped_existing:
+        enqueue_result["coalesced_relay_ids"] = list(supersedes_relay_ids)
     status = _write_runtime_status(
         config,
         status="enqueued",
         queue=queue,
         disk=disk,
         queue_backpressure=backpressure,
-        last_result={
-            "relay_id": row.relay_id,
-            "relay_status": row.status,
-            "spooled_file_path": row.spooled_file_path,
-            "relative_path": row.relative_path,
-            "content_sha256": row.content_sha256,
-            "byte_length": row.byte_length,
-            "deduped_existing": row.deduped_existing,
-        },
-    )
-    _append_runtime_event(
-        config,
-        "enqueue_completed_source_file",
-        {
-            "relay_id": row.relay_id,
-            "relay_status": row.status,
-            "spooled_file_path": row.spooled_file_path,
-            "relative_path": row.relative_path,
-            "content_sha256": row.content_sha256,
-            "byte_length": row.byte_length,
-            "deduped_existing": row.deduped_existing,
-        },
+        last_result=enqueue_result,
     )
+    _append_runtime_event(config, "enqueue_completed_source_file", enqueue_result)
     return status
 
 
@@ -853,16 +934,23 @@ def run_relay_once(
     credentials: ProducerCredentials | None = None,
     now: str = "",
     target_relay_id: str = "",
+    source_ordered: bool = False,
+    persist_status: bool = True,
 ) -> dict[str, Any]:
-    """Run one bounded relay drain cycle and persist status/log evidence."""
+    """Run one bounded relay drain cycle and persist status/log evidence.
+
+    ``persist_status=False`` leaves ``runtime_status_path`` to the caller, as
+    concurrent drain workers do; the event is still logged.
+    """
     if _paused_by_operator(config).get("paused"):
-        return _write_paused_status(config, event="relay_paused_by_operator")
+        return _write_paused_status(config, event="relay_paused_by_operator", persist=persist_status)
 
     disk = _disk_pressure_report(config)
     if disk["status"] != "pass":
         queue = relay_queue_status(config.db_path)
         status = _write_runtime_status(
             config,
+            persist=persist_status,
             status="blocked_disk_pressure",
             queue=queue,
             disk=disk,
@@ -885,12 +973,14 @@ def run_relay_once(
             retry_base_seconds=config.retry_base_seconds,
             timeout=config.timeout_seconds,
             target_relay_id=target_relay_id,
+            **({"source_ordered": True} if source_ordered else {}),
         )
     except (DirectSyncPushError, sqlite3.DatabaseError) as exc:
         queue = _safe_relay_queue_status(config.db_path)
         error_code, error_message = _runtime_error_details(exc)
         status = _write_runtime_status(
             config,
+            persist=persist_status,
             status="runtime_error",
             queue=queue,
             disk=disk,
@@ -909,6 +999,7 @@ def run_relay_once(
     queue = _safe_relay_queue_status(config.db_path)
     status = _write_runtime_status(
         config,
+        persist=persist_status,
         status=result_summary["status"],
         queue=queue,
         disk=disk,
@@ -920,3 +1011,270 @@ def run_relay_once(
     )
     _append_runtime_event(config, "relay_runner_once", status)
     return status
+
+
+class _ConcurrentDrainState:
+    """Shared batch budget and stop condition for concurrent drain workers."""
+
+    def __init__(self, *, max_batches: int, deadline: float) -> None:
+        self.max_batches = max_batches
+        self.deadline = deadline
+        self.condition = threading.Condition()
+        self.claimed = 0
+        self.in_flight = 0
+        self.finished = 0
+        self.stop_reason = ""
+        self.statuses: list[dict[str, Any]] = []
+        self.last_status: dict[str, Any] = {}
+        self.error: BaseException | None = None
+
+    def reserve(self) -> bool:
+        with self.condition:
+            if self.stop_reason:
+                return False
+            if self.claimed >= self.max_batches:
+                self.stop_reason = "max_batches"
+                return False
+            if self.deadline and self.claimed and time.monotonic() >= self.deadline:
+                self.stop_reason = "max_seconds"
+                return False
+            self.claimed += 1
+            self.in_flight += 1
+            return True
+
+    def fail(self, exc: BaseException) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            self.error = self.error or exc
+            self.stop_reason = self.stop_reason or "runtime_error"
+            self.condition.notify_all()
+
+    def complete(self, status: dict[str, Any]) -> bool:
+        """Record one worker's batch; return whether the worker should claim again."""
+        with self.condition:
+            self.in_flight -= 1
+            self.last_status = status
+            batch_status = str(status.get("status") or "")
+            if batch_status == "idle":
+                # Nothing claimable right now; an in-flight sibling may unblock
+                # the next delta of its source file when it finishes.
+                self.claimed -= 1
+                if not self.in_flight:
+                    self.stop_reason = self.stop_reason or "queue_empty"
+                    self.condition.notify_all()
+                    return False
+                finished = self.finished
+                while self.finished == finished and self.in_flight and not self.stop_reason:
+                    self.condition.wait()
+                return not self.stop_reason
+            self.statuses.append(status)
+            self.finished += 1
+            if batch_status not in DRAIN_CONTINUE_STATUSES:
+                self.stop_reason = self.stop_reason or batch_status or "unknown"
+            self.condition.notify_all()
+            return not self.stop_reason
+
+
+def _run_concurrent_drain(
+    config: DirectSyncRuntimeConfig,
+    *,
+    max_batches: int,
+    max_seconds: float,
+    max_workers: int,
+    session: Any,
+    credentials: ProducerCredentials | None,
+    started: float,
+    relay_queues: list[RelayQueue],
+) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
+    state = _ConcurrentDrainState(
+        max_batches=max_batches,
+        deadline=started + max_seconds if max_seconds else 0.0,
+    )
+
+    def worker() -> None:
+        with RelayQueue(config.db_path) as queue:
+            relay_queues.append(queue)
+            while state.reserve():
+                try:
+                    status = run_relay_once(
+                        config,
+                        session=session,
+                        credentials=credentials,
+                        source_ordered=True,
+                        persist_status=False,
+                    )
+                except BaseException as exc:
+                    state.fail(exc)
+                    return
+                if not state.complete(status):
+                    return
+
+    workers = [
+        threading.Thread(target=worker, name=f"direct-sync-relay-upload-{index}", daemon=True)
+        for index in range(min(max_workers, max_batches))
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    if state.error is not None:
+        raise state.error
+    return state.statuses, state.stop_reason or "max_batches", state.last_status
+
+
+def _run_serial_drain(
+    config: DirectSyncRuntimeConfig,
+    *,
+    max_batches: int,
+    max_seconds: float,
+    session: Any,
+    credentials: ProducerCredentials | None,
+    started: float,
+    relay_queues: list[RelayQueue],
+) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
+    statuses: list[dict[str, Any]] = []
+    status: dict[str, Any] = {}
+    with RelayQueue(config.db_path) as queue:
+        relay_queues.append(queue)
+        for batch_index in range(max_batches):
+            if batch_index and max_seconds and time.monotonic() - started >= max_seconds:
+                return statuses, "max_seconds", status
+            status = run_relay_once(config, session=session, credentials=credentials)
+            batch_status = str(status.get("status") or "")
+            if batch_status == "idle":
+                return statuses, "queue_empty", status
+            statuses.append(status)
+            if batch_status not in DRAIN_CONTINUE_STATUSES:
+                return statuses, batch_status or "unknown", status
+    return statuses, "max_batches", status
+
+
+def run_relay_retention(config: DirectSyncRuntimeConfig) -> dict[str, Any]:
+    """Compact ACKED relay artifacts per the configured age and size budget.
+
+    Meant for idle phases; returns (and logs) the retention report with the
+    disk state after reclaiming, or ``{"status": "disabled"}`` when neither
+    budget is configured.
+    """
+    if config.acked_retention_seconds <= 0 and config.max_acked_spool_bytes <= 0:
+        return {"status": "disabled"}
+    try:
+        report = compact_acked_relay_artifacts(
+            config.db_path,
+            spool_dir=config.spool_dir,
+            upload_status_dir=config.upload_status_dir,
+            min_age_seconds=config.acked_retention_seconds,
+            max_acked_spool_bytes=config.max_acked_spool_bytes,
+        )
+    except (OSError, sqlite3.DatabaseError, DirectSyncPushError) as exc:
+        report = {
+            "status": "error",
+            "error_code": "relay_retention_failed",
+            "error_message": _operator_safe_error_message(exc),
+        }
+    else:
+        report = {"status": "completed", **report, "disk": _disk_pressure_report(config)}
+    _append_runtime_event(config, "relay_retention_completed", {"retention_report": report})
+    return report
+
+
+def _sum_relay_queue_stats(queues: list[RelayQueue]) -> dict[str, Any]:
+    totals: dict[str, Any] = {"connections_opened": 0, "checkouts": 0, "nested_connections": 0, "db_seconds": 0.0}
+    for queue in queues:
+        for key, value in queue.stats().items():
+            totals[key] += value
+    totals["db_seconds"] = round(totals["db_seconds"], 6)
+    return totals
+
+
+def run_relay_drain(
+    config: DirectSyncRuntimeConfig,
+    *,
+    max_batches: int,
+    max_seconds: float = 0,
+    session: Any = None,
+    credentials: ProducerCredentials | None = None,
+    idle_reuse_seconds: float = DEFAULT_RELAY_IDLE_REUSE_SECONDS,
+    max_workers: int = 1,
+) -> dict[str, Any]:
+    """Drain up to ``max_batches`` batches (or ``max_seconds``) over one HTTP session.
+
+    Each batch still goes through :func:`run_relay_once` and logs its own
+    event; serial batches also write their status, pool workers leave the
+    status file to the single write at the end.  The drain stops early when the queue is empty or a
+    batch ends in a state the next batch would hit as well (retry wait,
+    pause, pressure, runtime error).  The returned status carries a
+    ``drain_report`` that is also persisted and logged.
+
+    With ``max_workers > 1`` batches upload from a bounded worker pool.
+    Claims are source ordered, so deltas of one source file still upload one
+    at a time and in order, and runtime-fenced rows share the single runtime
+    request authority one at a time.
+    """
+    started = time.monotonic()
+    max_batches = max(1, int(max_batches))
+    max_workers = max(1, int(max_workers))
+    owned_session = session is None
+    if owned_session:
+        session = RelayHttpSession(
+            idle_reuse_seconds=idle_reuse_seconds,
+            pool_maxsize=max(DEFAULT_RELAY_POOL_MAXSIZE, max_workers),
+        )
+    handshakes_before = int(getattr(session, "handshakes", 0) or 0)
+    if credentials is None:
+        try:
+            credentials = load_credentials_from_json(config.credential_path)
+        except DirectSyncPushError:
+            credentials = None
+    relay_queues: list[RelayQueue] = []
+    try:
+        if max_workers > 1:
+            statuses, stop_reason, status = _run_concurrent_drain(
+                config,
+                max_batches=max_batches,
+                max_seconds=max_seconds,
+                max_workers=max_workers,
+                session=session,
+                credentials=credentials,
+                started=started,
+                relay_queues=relay_queues,
+            )
+        else:
+            statuses, stop_reason, status = _run_serial_drain(
+                config,
+                max_batches=max_batches,
+                max_seconds=max_seconds,
+                session=session,
+                credentials=credentials,
+                started=started,
+                relay_queues=relay_queues,
+            )
+    finally:
+        if owned_session:
+            session.close()
+    relay_ids = []
+    acked_count = 0
+    for batch_status in statuses:
+        last_result = batch_status.get("last_result") if isinstance(batch_status.get("last_result"), Mapping) else {}
+        if last_result.get("relay_id"):
+            relay_ids.append(str(last_result["relay_id"]))
+        acked_count += int(batch_status.get("status") == "acked")
+    elapsed = max(time.monotonic() - started, 1e-6)
+    byte_count = relay_batches_byte_length(config.db_path, relay_ids)
+    report = {
+        "batches": len(statuses),
+        "acked": acked_count,
+        "bytes": byte_count,
+        "elapsed_seconds": round(elapsed, 3),
+        "batches_per_second": round(len(statuses) / elapsed, 3),
+        "bytes_per_second": round(byte_count / elapsed, 1),
+        "handshakes": int(getattr(session, "handshakes", 0) or 0) - handshakes_before,
+        "idle_reuse_seconds": getattr(session, "idle_reuse_seconds", None),
+        "stop_reason": stop_reason,
+        "workers": max_workers,
+        "relay_db": _sum_relay_queue_stats(relay_queues),
+    }
+    status = {**status, "drain_report": report}
+    _write_json_atomic(config.runtime_status_path, status)
+    _append_runtime_event(config, "relay_drain_completed", {"drain_report": report})
+    return status
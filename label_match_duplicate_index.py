@@ -0,0 +1,195 @@
+"""Persistent cross-day duplicate index for completed Label_Match sets.
+
+``global_scanned_set`` only covers the day that is currently loaded, so a label
+completed yesterday would be accepted again after midnight.  This index keeps
+the duplicate keys of every passed set for a retention window in a compact,
+append-only JSON-lines journal next to the event logs:
+
+* ``["V", <format>]`` header,
+* ``["A", <YYYY-MM-DD>, <set_id>, [<key>, ...]]`` for a completed set,
+* ``["T", <YYYY-MM-DD>, <set_id>]`` tombstone for a deleted or cancelled set.
+
+Loading replays the journal once, in O(journal size); expired sets and
+tombstones are dropped by rewriting the journal atomically when they dominate.
+The daily CSV logs remain authoritative.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Iterable
+
+
+DUPLICATE_INDEX_FILENAME = "label_match_duplicate_index.jsonl"
+DUPLICATE_INDEX_FORMAT = "label-match-duplicate-index-v1"
+DEFAULT_RETENTION_DAYS = 90
+COMPACTION_MIN_RECORDS = 1000
+
+
+class DuplicateIndexError(RuntimeError):
+    """Raised when the duplicate index journal cannot be read or written."""
+
+
+def _encode(record: list) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class DuplicateBarcodeIndex:
+    """In-memory duplicate keys backed by an append-only journal."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        today: date | None = None,
+    ):
+        self.path = str(Path(path))
+        self.retention_days = max(1, int(retention_days))
+        self._lock = threading.RLock()
+        self._sets: dict[str, tuple[str, frozenset[str]]] = {}
+        self._owners: dict[str, set[str]] = {}
+        self._pending: list[str] = []
+        self._load(today or date.today())
+
+    def _cutoff(self, today: date | None = None) -> str:
+        return ((today or date.today()) - timedelta(days=self.retention_days)).isoformat()
+
+    def _load(self, today: date) -> None:
+        record_count = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line after a crash; the CSV logs still
+                        # hold the set, and today's history reload re-adds it.
+                        continue
+                    if not isinstance(record, list) or not record:
+                        continue
+                    record_count += 1
+                    if record[0] == "A" and len(record) == 4:
+                        self._index(str(record[2]), str(record[1]), record[3])
+                    elif record[0] == "T" and len(record) == 3:
+                        self._unindex(str(record[2]))
+        except FileNotFoundError:
+            return
+        except (OSError, UnicodeError) as exc:
+            raise DuplicateIndexError(f"duplicate index is unreadable: {exc}") from exc
+        cutoff = self._cutoff(today)
+        for set_id in [
+            set_id for set_id, (day, _keys) in self._sets.items() if day < cutoff
+        ]:
+            self._unindex(set_id)
+        if record_count >= COMPACTION_MIN_RECORDS and record_count > 2 * len(self._sets):
+            self.compact()
+
+    def _index(self, set_id: str, day: str, keys: Iterable[str]) -> None:
+        self._unindex(set_id)
+        frozen = frozenset(str(key) for key in keys if str(key or ""))
+        self._sets[set_id] = (day, frozen)
+        for key in frozen:
+            self._owners.setdefault(key, set()).add(set_id)
+
+    def _unindex(self, set_id: str) -> None:
+        previous = self._sets.pop(set_id, None)
+        if previous is None:
+            return
+        for key in previous[1]:
+            owners = self._owners.get(key)
+            if owners is None:
+                continue
+            owners.discard(set_id)
+            if not owners:
+                del self._owners[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sets)
+
+    def add_set(self, set_id: str, keys: Iterable[str], day: str) -> bool:
+        """Index a completed set; returns ``False`` when it is already indexed."""
+
+        identity = str(set_id or "").strip()
+        frozen = frozenset(str(key) for key in keys if str(key or ""))
+        if not identity or not frozen:
+            return False
+        with self._lock:
+            existing = self._sets.get(identity)
+            if existing is not None and existing[1] == frozen:
+                return False
+            self._index(identity, str(day), frozen)
+            self._pending.append(_encode(["A", str(day), identity, sorted(frozen)]))
+            return True
+
+    def remove_set(self, set_id: str, day: str) -> bool:
+        """Tombstone a deleted or cancelled set."""
+
+        identity = str(set_id or "").strip()
+        with self._lock:
+            if identity not in self._sets:
+                return False
+            self._unindex(identity)
+            self._pending.append(_encode(["T", str(day), identity]))
+            return True
+
+    def contains_any(self, keys: Iterable[str], *, today: date | None = None) -> bool:
+        cutoff = self._cutoff(today)
+        with self._lock:
+            for key in keys:
+                for set_id in self._owners.get(str(key), ()):
+                    if self._sets[set_id][0] >= cutoff:
+                        return True
+        return False
+
+    def owners(self, key: str) -> set[str]:
+        with self._lock:
+            return set(self._owners.get(str(key), ()))
+
+    def persist(self) -> None:
+        """Append the records accumulated since the last call."""
+
+        with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            try:
+                new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8", newline="\n") as handle:
+                    if new_file:
+                        handle.write(_encode(["V", DUPLICATE_INDEX_FORMAT]))
+                    handle.writelines(lines)
+            except OSError as exc:
+                self._pending = lines + self._pending
+                raise DuplicateIndexError(f"duplicate index write failed: {exc}") from exc
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the live sets."""
+
+        with self._lock:
+            temp_path = f"{self.path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            try:
+                with open(temp_path, "w", encoding="utf-8", newline="\n") as handle:
+                    handle.write(_encode(["V", DUPLICATE_INDEX_FORMAT]))
+                    for set_id, (day, keys) in sorted(
+                        self._sets.items(), key=lambda item: (item[1][0], item[0])
+                    ):
+                        handle.write(_encode(["A", day, set_id, sorted(keys)]))
+                    handle.writelines(self._pending)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, self.path)
+                self._pending = []
+            except OSError as exc:
+                try:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                except OSError:
+                    pass
+                raise DuplicateIndexError(f"duplicate index compaction failed: {exc}") from exc
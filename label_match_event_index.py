@@ -0,0 +1,458 @@
+"""Embedded SQLite key index for the Label_Match daily event CSV logs.
+
+The daily ``<process>작업이벤트로그_<id>_<YYYYMMDD>.csv`` files remain the
+authoritative record and the only direct-sync source.  This index is a
+rebuildable projection of those files: every complete CSV record is indexed by
+its byte range together with the durable identity keys that recovery code looks
+up (set, replacement-waiting and post-review identities).  Files are followed
+from their last indexed byte offset, so appending a row costs one tail read and
+a lookup never re-parses the accumulated history.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Generator, Iterator, Mapping
+
+
+EVENT_INDEX_SCHEMA_VERSION = "label-match-event-index-v1"
+EVENT_INDEX_FILENAME = "label_match_event_index.sqlite3"
+EVENT_LOG_COLUMNS = ("timestamp", "worker_name", "event", "details")
+EVENT_INDEX_KEY_COLUMNS = (
+    "set_id",
+    "dedupe_key",
+    "review_event_id",
+    "cancelled_set_id",
+)
+HEAD_CHECK_BYTES = 4096
+SQLITE_BUSY_TIMEOUT_MS = 10_000
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class EventIndexError(RuntimeError):
+    """Raised when the derived event index cannot be read or updated."""
+
+
+def _text(value: Any) -> str:
+    return str(value or "").strip()
+
+
+def event_index_keys(event: str, details: Mapping[str, Any] | None) -> dict[str, str]:
+    """Project the durable identity keys of one event row.
+
+    The fallbacks mirror the identities the crash-recovery readers have always
+    accepted, so an index lookup and a CSV scan agree on every row.
+    """
+
+    source = details if isinstance(details, Mapping) else {}
+    keys = {
+        "set_id": _text(source.get("set_id")),
+        "dedupe_key": _text(source.get("dedupe_key") or source.get("intent_id")),
+        "review_event_id": "",
+        "cancelled_set_id": _text(source.get("cancelled_set_id")),
+    }
+    if event == "POST_REVIEW_REQUIRED":
+        keys["review_event_id"] = _text(
+            source.get("review_event_id")
+            or source.get("dedupe_key")
+            or source.get("case_id")
+        )
+    else:
+        keys["review_event_id"] = _text(source.get("review_event_id"))
+    return keys
+
+
+def iter_csv_records(
+    handle: Any,
+    start_offset: int = 0,
+) -> Iterator[tuple[int, int, list[str]]]:
+    """Yield ``(byte_offset, byte_length, fields)`` for complete CSV records.
+
+    ``handle`` must be a binary file object.  A record ends at a line break
+    outside quotes; a trailing record without its terminator is still being
+    written and is left for the next call.
+    """
+
+    offset = max(0, int(start_offset or 0))
+    handle.seek(offset)
+    if offset == 0:
+        if handle.read(len(_UTF8_BOM)) == _UTF8_BOM:
+            offset = len(_UTF8_BOM)
+        handle.seek(offset)
+    pending = b""
+    record_start = offset
+    position = offset
+    for line in handle:
+        position += len(line)
+        pending += line
+        if not pending.endswith(b"\n") or pending.count(b'"') % 2:
+            continue
+        record = pending
+        pending = b""
+        start = record_start
+        record_start = position
+        text = record.decode("utf-8", errors="replace")
+        if not text.strip():
+            continue
+        try:
+            fields = next(csv.reader(io.StringIO(text, newline="")))
+        except (csv.Error, StopIteration):
+            fields = []
+        yield start, len(record), fields
+
+
+def read_csv_record(path: str | os.PathLike[str], byte_offset: int, byte_length: int) -> list[str]:
+    """Re-read one indexed record by its byte range."""
+
+    with open(path, "rb") as handle:
+        handle.seek(int(byte_offset))
+        record = handle.read(int(byte_length))
+    if len(record) != int(byte_length):
+        raise EventIndexError("indexed CSV record is no longer available")
+    try:
+        return next(csv.reader(io.StringIO(record.decode("utf-8"), newline="")))
+    except (csv.Error, StopIteration, UnicodeDecodeError) as exc:
+        raise EventIndexError("indexed CSV record could not be parsed") from exc
+
+
+def _head_digest(handle: Any, length: int) -> str:
+    handle.seek(0)
+    return hashlib.sha256(handle.read(length)).hexdigest()
+
+
+class EventLogTail:
+    """Follow one event CSV from its last parsed byte offset.
+
+    The head digest detects a replaced or truncated file; the caller is then
+    told to drop whatever it accumulated and the file is read from byte zero.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = str(path)
+        self.offset = 0
+        self.head_length = 0
+        self.head_sha256 = hashlib.sha256(b"").hexdigest()
+        self.header: list[str] | None = None
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.head_length = 0
+        self.head_sha256 = hashlib.sha256(b"").hexdigest()
+        self.header = None
+
+    def read_new_rows(self) -> tuple[bool, Generator[tuple[int, int, dict[str, str]], None, None]]:
+        """Return ``(reset, rows)`` for records appended since the last call.
+
+        ``rows`` yields ``(byte_offset, byte_length, row)``; the offset only
+        advances past records the caller has consumed, so a consumer that stops
+        early resumes from the first unconsumed record next time.
+        """
+
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            reset = self.offset > 0
+            self._reset()
+            return reset, (row for row in ())
+        size = os.fstat(handle.fileno()).st_size
+        reset = False
+        if size < self.offset or _head_digest(handle, self.head_length) != self.head_sha256:
+            reset = self.offset > 0
+            self._reset()
+        return reset, self._rows(handle)
+
+    def _rows(self, handle: Any) -> Generator[tuple[int, int, dict[str, str]], None, None]:
+        with handle:
+            for byte_offset, byte_length, fields in iter_csv_records(handle, self.offset):
+                if tuple(fields) == EVENT_LOG_COLUMNS:
+                    self.header = self.header or list(fields)
+                    self._advance(handle, byte_offset + byte_length)
+                    continue
+                row = dict(zip(self.header or EVENT_LOG_COLUMNS, fields))
+                yield byte_offset, byte_length, row
+                self._advance(handle, byte_offset + byte_length)
+
+    def _advance(self, handle: Any, offset: int) -> None:
+        position = handle.tell()
+        self.offset = offset
+        if self.head_length < HEAD_CHECK_BYTES:
+            self.head_length = min(offset, HEAD_CHECK_BYTES)
+            self.head_sha256 = _head_digest(handle, self.head_length)
+        handle.seek(position)
+
+
+def _initialize_event_index_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        BEGIN IMMEDIATE;
+        CREATE TABLE IF NOT EXISTS event_index_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS indexed_files (
+            source_name TEXT PRIMARY KEY,
+            indexed_offset INTEGER NOT NULL,
+            head_length INTEGER NOT NULL,
+            head_sha256 TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            header_json TEXT
+        );
+        CREATE TABLE IF NOT EXISTS events (
+            source_name TEXT NOT NULL,
+            byte_offset INTEGER NOT NULL,
+            byte_length INTEGER NOT NULL,
+            timestamp TEXT,
+            event TEXT,
+            set_id TEXT,
+            dedupe_key TEXT,
+            review_event_id TEXT,
+            cancelled_set_id TEXT,
+            PRIMARY KEY(source_name, byte_offset)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_events_set_id
+            ON events(set_id, event) WHERE set_id <> '';
+        CREATE INDEX IF NOT EXISTS idx_events_dedupe_key
+            ON events(dedupe_key, event) WHERE dedupe_key <> '';
+        CREATE INDEX IF NOT EXISTS idx_events_review_event_id
+            ON events(review_event_id, event) WHERE review_event_id <> '';
+        CREATE INDEX IF NOT EXISTS idx_events_cancelled_set_id
+            ON events(cancelled_set_id, event) WHERE cancelled_set_id <> '';
+        COMMIT;
+        """
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO event_index_meta(key, value) VALUES ('schema_version', ?)",
+        (EVENT_INDEX_SCHEMA_VERSION,),
+    )
+    conn.commit()
+
+
+class LabelMatchEventIndex:
+    """Byte-offset following key index over the daily event CSV files."""
+
+    def __init__(self, db_path: str | os.PathLike[str]):
+        self.db_path = str(Path(db_path))
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._synced_directories: set[tuple[str, str]] = set()
+        try:
+            self._conn = sqlite3.connect(
+                self.db_path,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+            )
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # The CSV files are authoritative; losing the last index commit on
+            # power failure only means the tail is re-indexed on next sync.
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            _initialize_event_index_schema(self._conn)
+        except sqlite3.Error as exc:
+            raise EventIndexError(f"event index could not be opened: {exc}") from exc
+
+    def close(self) -> None:
+        with self._lock:
+            conn = self.__dict__.pop("_conn", None)
+            if conn is not None:
+                conn.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise EventIndexError("event index is closed")
+        return conn
+
+    def sync_file(self, path: str | os.PathLike[str]) -> int:
+        """Index records appended to ``path`` since the last sync.
+
+        A shrunken file or a changed head means the file was replaced, so its
+        rows are dropped and the file is indexed again from byte zero.
+        """
+
+        source = Path(path)
+        source_name = source.name
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            with self._lock:
+                try:
+                    self._forget_file(source_name)
+                except sqlite3.Error as exc:
+                    raise EventIndexError(f"event index update failed: {exc}") from exc
+            return 0
+        except OSError as exc:
+            raise EventIndexError(f"event log is unreadable: {exc}") from exc
+        with self._lock:
+            conn = self._connection()
+            state = conn.execute(
+                "SELECT * FROM indexed_files WHERE source_name=?",
+                (source_name,),
+            ).fetchone()
+            if (
+                state is not None
+                and int(state["size_bytes"]) == stat.st_size
+                and int(state["mtime_ns"]) == stat.st_mtime_ns
+            ):
+                return 0
+            try:
+                with open(source, "rb") as handle:
+                    return self._sync_open_file(conn, source_name, handle, stat, state)
+            except OSError as exc:
+                raise EventIndexError(f"event log is unreadable: {exc}") from exc
+            except sqlite3.Error as exc:
+                raise EventIndexError(f"event index update failed: {exc}") from exc
+
+    def sync_directory(self, directory: str | os.PathLike[str], prefix: str) -> int:
+        """Bring every ``prefix*.csv`` log in ``directory`` up to date.
+
+        Unchanged files cost one ``stat``; only appended tails are read.
+        """
+
+        try:
+            names = [
+                name
+                for name in os.listdir(directory)
+                if name.startswith(prefix) and name.lower().endswith(".csv")
+            ]
+        except OSError as exc:
+            raise EventIndexError(f"event log directory is unreadable: {exc}") from exc
+        return sum(self.sync_file(os.path.join(directory, name)) for name in sorted(names))
+
+    def ensure_directory_synced(self, directory: str | os.PathLike[str], prefix: str) -> None:
+        """Catch up ``directory`` once; the owning writer keeps it in sync after that."""
+
+        scope = (os.path.abspath(str(directory)), prefix)
+        with self._lock:
+            if scope in self._synced_directories:
+                return
+            self.sync_directory(directory, prefix)
+            self._synced_directories.add(scope)
+
+    def mark_stale(self) -> None:
+        """Force the next ``ensure_directory_synced`` to re-check every file."""
+
+        with self._lock:
+            self._synced_directories.clear()
+
+    def _sync_open_file(
+        self,
+        conn: sqlite3.Connection,
+        source_name: str,
+        handle: Any,
+        stat: os.stat_result,
+        state: sqlite3.Row | None,
+    ) -> int:
+        start_offset = 0
+        header: list[str] | None = None
+        if state is not None:
+            head_length = int(state["head_length"])
+            if (
+                stat.st_size >= int(state["indexed_offset"])
+                and _head_digest(handle, head_length) == state["head_sha256"]
+            ):
+                start_offset = int(state["indexed_offset"])
+                try:
+                    header = json.loads(state["header_json"] or "null")
+                except (TypeError, ValueError):
+                    header = None
+            else:
+                self._forget_file(source_name)
+        rows = []
+        next_offset = start_offset
+        for byte_offset, byte_length, fields in iter_csv_records(handle, start_offset):
+            next_offset = byte_offset + byte_length
+            if tuple(fields) == EVENT_LOG_COLUMNS:
+                header = header or list(fields)
+                continue
+            columns = header or list(EVENT_LOG_COLUMNS)
+            row = dict(zip(columns, fields))
+            event = _text(row.get("event"))
+            try:
+                details = json.loads(row.get("details") or "{}")
+            except (TypeError, ValueError):
+                details = {}
+            keys = event_index_keys(event, details)
+            rows.append(
+                (
+                    source_name,
+                    byte_offset,
+                    byte_length,
+                    _text(row.get("timestamp")),
+                    event,
+                    *(keys[name] for name in EVENT_INDEX_KEY_COLUMNS),
+                )
+            )
+        head_length = min(next_offset, HEAD_CHECK_BYTES)
+        head_sha256 = _head_digest(handle, head_length)
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO events(
+                    source_name, byte_offset, byte_length, timestamp, event,
+                    set_id, dedupe_key, review_event_id, cancelled_set_id
+                ) VALUES (?,?,?,?,?,?,?,?,?)
+                """,
+                rows,
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO indexed_files(
+                    source_name, indexed_offset, head_length, head_sha256,
+                    size_bytes, mtime_ns, header_json
+                ) VALUES (?,?,?,?,?,?,?)
+                """,
+                (
+                    source_name,
+                    next_offset,
+                    head_length,
+                    head_sha256,
+                    stat.st_size if next_offset >= stat.st_size else -1,
+                    stat.st_mtime_ns,
+                    json.dumps(header, ensure_ascii=False) if header else None,
+                ),
+            )
+        return len(rows)
+
+    def _forget_file(self, source_name: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM events WHERE source_name=?", (source_name,))
+            conn.execute("DELETE FROM indexed_files WHERE source_name=?", (source_name,))
+
+    def find_events(
+        self,
+        key_column: str,
+        value: Any,
+        *,
+        event: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return indexed rows whose ``key_column`` equals ``value``, newest first."""
+
+        if key_column not in EVENT_INDEX_KEY_COLUMNS:
+            raise EventIndexError(f"unsupported event index key: {key_column}")
+        identity = _text(value)
+        if not identity:
+            return []
+        query = f"SELECT * FROM events WHERE {key_column}=?"
+        params: list[Any] = [identity]
+        if event is not None:
+            query += " AND event=?"
+            params.append(event)
+        query += " ORDER BY source_name DESC, byte_offset DESC"
+        with self._lock:
+            try:
+                return [dict(row) for row in self._connection().execute(query, params)]
+            except sqlite3.Error as exc:
+                raise EventIndexError(f"event index lookup failed: {exc}") from exc
+
+    def event_exists(self, key_column: str, value: Any, *, event: str) -> bool:
+        return bool(self.find_events(key_column, value, event=event))
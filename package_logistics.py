@@ -7,24 +7,30 @@ TRANSFER bundle, or supplied as a separate full exact rescan.
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from contextlib import contextmanager
+import copy
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 import hashlib
 import ipaddress
-from http.client import HTTPException, IncompleteRead
+from http.client import HTTPException, HTTPSConnection, IncompleteRead
 import json
 import math
 import os
 from pathlib import Path
+import random
 import re
+import select
 import sqlite3
+import ssl
 import threading
+import time
 from typing import Any, Callable, Iterable, Iterator, Mapping
 import unicodedata
 from urllib.error import HTTPError, URLError
-from urllib.parse import quote, urlencode, urlsplit
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
 from urllib.request import Request, urlopen
 
 from logistics_runtime_profile import (
@@ -43,6 +49,12 @@ PACKAGE_HTTP_USER_AGENT = "KMTech-Worker-ClaimClient/1.0 LabelMatch"
 PACKAGE_HTTP_CLIENT_HEADER = "Label_Match"
 MAX_RETRY_AFTER_SECONDS = 1800.0
 SENDING_LEASE_SECONDS = 300.0
+PACKAGE_CANCELLATION_RETRY_BASE_SECONDS = 30.0
+PACKAGE_OUTBOX_DRAIN_BATCH = 20
+PACKAGE_OUTBOX_IDLE_POLL_SECONDS = 30.0
+PACKAGE_OUTBOX_BUSY_POLL_SECONDS = 0.1
+PACKAGE_OUTBOX_FAILURE_BACKOFF_BASE_SECONDS = 1.0
+PACKAGE_OUTBOX_MAX_FAILURE_BACKOFF_SECONDS = 300.0
 
 
 class PackageLogisticsError(RuntimeError):
@@ -95,6 +107,36 @@ def _utc_before(seconds: float) -> str:
     ).isoformat().replace("+00:00", "Z")
 
 
+def _utc_age_seconds(value: Any, *, now: datetime | None = None) -> float | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return ((now or datetime.now(timezone.utc)) - parsed).total_seconds()
+
+
+def _retry_backoff_seconds(
+    attempt_count: int,
+    *,
+    base_seconds: float,
+    cap_seconds: float = MAX_RETRY_AFTER_SECONDS,
+) -> float:
+    """Exponential backoff with equal jitter for the ``attempt_count``-th retry.
+
+    Half of the exponential step is fixed and half is random, so terminals
+    that failed together against the same outage do not retry in lockstep.
+    """
+
+    exponent = min(max(1, int(attempt_count)) - 1, 16)
+    step = min(float(cap_seconds), float(base_seconds) * (2 ** exponent))
+    return step / 2.0 + random.uniform(0.0, step / 2.0)
+
+
 def _optional_bool(value: Any) -> bool | None:
     if isinstance(value, bool):
         return value
@@ -1014,6 +1056,44 @@ def _initialize_outbox_schema(conn: sqlite3.Connection) -> None:
     )
 
 
+def _outbox_queue_metrics(
+    conn: sqlite3.Connection, *, table: str, committed_column: str
+) -> dict[str, Any]:
+    now = utc_now()
+    row = conn.execute(
+        f"""SELECT
+               COALESCE(SUM(status='PENDING'),0) AS pending_count,
+               COALESCE(SUM(status='SENDING'),0) AS sending_count,
+               COALESCE(SUM(status='DEFERRED'),0) AS deferred_count,
+               COALESCE(SUM(status='PENDING'
+                            AND (retry_after_at IS NULL OR retry_after_at<=?)),0)
+                   AS due_count,
+               MIN(created_at) AS oldest_created_at,
+               MIN(CASE WHEN status='PENDING' AND retry_after_at>?
+                        THEN retry_after_at END) AS next_retry_at
+             FROM {table}
+            WHERE status IN ('PENDING','SENDING','DEFERRED')
+              AND {committed_column}=1""",
+        (now, now),
+    ).fetchone()
+    next_retry_at = str(row["next_retry_at"] or "")
+    next_retry_age = _utc_age_seconds(next_retry_at)
+    return {
+        "depth": int(row["pending_count"])
+        + int(row["sending_count"])
+        + int(row["deferred_count"]),
+        "pending_count": int(row["pending_count"]),
+        "sending_count": int(row["sending_count"]),
+        "deferred_count": int(row["deferred_count"]),
+        "due_count": int(row["due_count"]),
+        "oldest_age_seconds": _utc_age_seconds(row["oldest_created_at"]),
+        "next_retry_at": next_retry_at,
+        "next_retry_in_seconds": (
+            max(0.0, -next_retry_age) if next_retry_age is not None else None
+        ),
+    }
+
+
 class PackageOutbox:
     def __init__(self, db_path: str | Path):
         self.db_path = str(Path(db_path))
@@ -1499,6 +1579,16 @@ class PackageOutbox:
             )
             conn.commit()
 
+    def queue_metrics(self) -> dict[str, Any]:
+        """Return depth, due count, oldest age and next retry of CREATE_PACKAGE rows."""
+
+        with self._connect() as conn:
+            return _outbox_queue_metrics(
+                conn,
+                table="package_command_outbox",
+                committed_column="local_completion_committed",
+            )
+
     def mark_conflict(
         self,
         key: str,
@@ -2089,8 +2179,10 @@ class PackageCancellationOutbox:
                 raise PackageLogisticsError(
                     "package cancellation retry state changed concurrently"
                 )
-            attempt_count = max(1, int(row["attempt_count"] or 1))
-            local_backoff = min(1800.0, 30.0 * (2 ** min(attempt_count - 1, 6)))
+            local_backoff = _retry_backoff_seconds(
+                int(row["attempt_count"] or 1),
+                base_seconds=PACKAGE_CANCELLATION_RETRY_BASE_SECONDS,
+            )
             server_backoff = _bounded_retry_after_seconds(
                 getattr(error, "retry_after_seconds", None)
             ) or 0.0
@@ -2111,6 +2203,16 @@ class PackageCancellationOutbox:
                 )
             conn.commit()
 
+    def queue_metrics(self) -> dict[str, Any]:
+        """Return depth, due count, oldest age and next retry of cancellations."""
+
+        with self._connect() as conn:
+            return _outbox_queue_metrics(
+                conn,
+                table="package_cancellation_outbox",
+                committed_column="local_event_committed",
+            )
+
     def mark_conflict(self, key: str, error: Exception) -> None:
         code = str(getattr(error, "code", "LOCAL_VALIDATION_CONFLICT"))
         message = str(getattr(error, "message", str(error)))
@@ -2374,6 +2476,52 @@ def _read_http_body(response: Any) -> str:
         ) from exc
 
 
+def _package_http_error(status_code: int, headers: Any, raw: str) -> PackageApiError:
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = {}
+    error = value.get("error") if isinstance(value, Mapping) else {}
+    if not isinstance(error, Mapping):
+        error = {}
+    retry_after_candidates = []
+    if "retry_after_seconds" in error:
+        retry_after_candidates.append(error.get("retry_after_seconds"))
+    if isinstance(value, Mapping) and "retry_after_seconds" in value:
+        retry_after_candidates.append(value.get("retry_after_seconds"))
+    if headers:
+        retry_after_candidates.append(headers.get("Retry-After"))
+    retry_after = None
+    for candidate in retry_after_candidates:
+        retry_after = _parse_retry_after_seconds(candidate)
+        if retry_after is not None:
+            break
+    return PackageApiError(
+        status_code,
+        str(error.get("code") or f"HTTP_{status_code}"),
+        str(error.get("message") or "package API rejected the request"),
+        retryable=_first_optional_bool(
+            error.get("retryable") if "retryable" in error else None,
+            value.get("retryable") if isinstance(value, Mapping) else None,
+        ),
+        committed=_first_optional_bool(
+            error.get("committed") if "committed" in error else None,
+            value.get("committed") if isinstance(value, Mapping) else None,
+        ),
+        retry_after_seconds=retry_after,
+    )
+
+
+def _package_json_object(raw: str) -> Mapping[str, Any]:
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise PackageTransportError("package API response was not JSON") from exc
+    if not isinstance(value, Mapping):
+        raise PackageTransportError("package API response must be an object")
+    return value
+
+
 def _default_transport(method: str, url: str, headers: Mapping[str, str], body: bytes | None, timeout: float):
     request = Request(url, data=body, headers=dict(headers), method=method)
     try:
@@ -2381,48 +2529,383 @@ def _default_transport(method: str, url: str, headers: Mapping[str, str], body:
             raw = _read_http_body(response)
     except HTTPError as exc:
         raw = _read_http_body(exc)
-        try:
-            value = json.loads(raw)
-        except json.JSONDecodeError:
-            value = {}
-        error = value.get("error") if isinstance(value, Mapping) else {}
-        if not isinstance(error, Mapping):
-            error = {}
-        retry_after_candidates = []
-        if "retry_after_seconds" in error:
-            retry_after_candidates.append(error.get("retry_after_seconds"))
-        if isinstance(value, Mapping) and "retry_after_seconds" in value:
-            retry_after_candidates.append(value.get("retry_after_seconds"))
-        if exc.headers:
-            retry_after_candidates.append(exc.headers.get("Retry-After"))
-        retry_after = None
-        for candidate in retry_after_candidates:
-            retry_after = _parse_retry_after_seconds(candidate)
-            if retry_after is not None:
-                break
-        raise PackageApiError(
-            exc.code,
-            str(error.get("code") or f"HTTP_{exc.code}"),
-            str(error.get("message") or "package API rejected the request"),
-            retryable=_first_optional_bool(
-                error.get("retryable") if "retryable" in error else None,
-                value.get("retryable") if isinstance(value, Mapping) else None,
-            ),
-            committed=_first_optional_bool(
-                error.get("committed") if "committed" in error else None,
-                value.get("committed") if isinstance(value, Mapping) else None,
-            ),
-            retry_after_seconds=retry_after,
-        ) from exc
+        raise _package_http_error(exc.code, exc.headers, raw) from exc
     except (URLError, TimeoutError, OSError, HTTPException) as exc:
         raise PackageTransportError(f"package API transport failed: {exc.__class__.__name__}") from exc
+    return _package_json_object(raw)
+
+
+# Kept below the common 5 s server keep-alive timeout, so an idle connection
+# is normally dropped here before the server closes it under a request.
+PACKAGE_HTTP_IDLE_TIMEOUT_SECONDS = 4.0
+PACKAGE_HTTP_MAX_IDLE_PER_HOST = 4
+PACKAGE_HTTP_LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _idle_connection_dropped(connection: HTTPSConnection) -> bool:
+    """Return True when the server closed (or wrote to) an idle connection.
+
+    An idle keep-alive socket is only readable once the peer sent EOF or
+    unsolicited bytes; either way it must not carry another request.
+    """
+    sock = connection.sock
+    if sock is None:
+        return False
     try:
-        value = json.loads(raw)
-    except json.JSONDecodeError as exc:
-        raise PackageTransportError("package API response was not JSON") from exc
-    if not isinstance(value, Mapping):
-        raise PackageTransportError("package API response must be an object")
-    return value
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _replay_safe_request(method: str, headers: Mapping[str, str]) -> bool:
+    if method.upper() == "GET":
+        return True
+    return any(name.lower() == "idempotency-key" and str(value) for name, value in headers.items())
+
+
+class PooledHttpsTransport:
+    """Keep-alive HTTPS :data:`Transport` holding idle connections per host.
+
+    A drop-in replacement for the per-call ``urlopen`` transport: responses,
+    :class:`PackageApiError` and :class:`PackageTransportError` map exactly
+    as there.  Connections idle for more than ``idle_timeout_seconds``, or
+    already closed by the server, are closed instead of reused.  A request
+    whose reused connection fails before any response bytes arrive is sent
+    once more on a fresh connection when it is a GET or carries an
+    ``Idempotency-Key``; other requests surface the failure, because they
+    may have been processed.
+    Redirects are not followed and process proxy settings are ignored, as
+    for the other authenticated transports.  ``stats()`` reports connection
+    reuse and a request latency histogram.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_timeout_seconds: float = PACKAGE_HTTP_IDLE_TIMEOUT_SECONDS,
+        max_idle_per_host: int = PACKAGE_HTTP_MAX_IDLE_PER_HOST,
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        self.idle_timeout_seconds = max(0.0, float(idle_timeout_seconds))
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self._ssl_context = ssl_context or ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, int], list[tuple[HTTPSConnection, float]]] = {}
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.transport_errors = 0
+        self._latency_counts = [0] * (len(PACKAGE_HTTP_LATENCY_BUCKETS_MS) + 1)
+
+    def _checkout(self, key: tuple[str, int], timeout: float) -> tuple[HTTPSConnection, bool]:
+        now = time.monotonic()
+        stale: list[HTTPSConnection] = []
+        connection = None
+        with self._lock:
+            idle = self._idle.get(key) or []
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout_seconds and not _idle_connection_dropped(candidate):
+                    connection = candidate
+                    break
+                stale.append(candidate)
+            if connection is None:
+                self.connections_opened += 1
+            else:
+                self.connections_reused += 1
+        for candidate in stale:
+            candidate.close()
+        if connection is None:
+            return HTTPSConnection(key[0], key[1], timeout=timeout, context=self._ssl_context), False
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _checkin(self, key: tuple[str, int], connection: HTTPSConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host and self.idle_timeout_seconds:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def _record(self, started: float, *, failed: bool = False) -> None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        bucket = len(PACKAGE_HTTP_LATENCY_BUCKETS_MS)
+        for index, bound in enumerate(PACKAGE_HTTP_LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = index
+                break
+        with self._lock:
+            self.requests += 1
+            self.transport_errors += int(failed)
+            self._latency_counts[bucket] += 1
+
+    def _exchange(
+        self,
+        key: tuple[str, int],
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: bytes | None,
+        timeout: float,
+    ) -> tuple[int, Any, str]:
+        for attempt in range(2):
+            connection, reused = self._checkout(key, timeout)
+            response = None
+            try:
+                connection.request(method, target, body=body, headers=dict(headers))
+                response = connection.getresponse()
+                raw = _read_http_body(response)
+            except (TimeoutError, OSError, HTTPException, PackageTransportError) as exc:
+                connection.close()
+                stale_keep_alive = (
+                    reused
+                    and response is None
+                    and isinstance(exc, (ConnectionError, HTTPException))
+                    and not isinstance(exc, IncompleteRead)
+                )
+                if attempt == 0 and stale_keep_alive and _replay_safe_request(method, headers):
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+            return response.status, response.headers, raw
+        raise PackageTransportError("package API transport failed: retry exhausted")
+
+    def __call__(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes | None,
+        timeout: float,
+    ) -> Mapping[str, Any]:
+        parsed = urlsplit(url)
+        if parsed.scheme != "https" or not parsed.hostname:
+            raise PackageTransportError("pooled package transport requires an HTTPS URL")
+        key = (parsed.hostname, parsed.port or 443)
+        target = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        started = time.monotonic()
+        try:
+            status, response_headers, raw = self._exchange(key, method, target, headers, body, timeout)
+        except PackageTransportError:
+            self._record(started, failed=True)
+            raise
+        except (TimeoutError, OSError, HTTPException) as exc:
+            self._record(started, failed=True)
+            raise PackageTransportError(f"package API transport failed: {exc.__class__.__name__}") from exc
+        self._record(started)
+        if status >= 400:
+            raise _package_http_error(status, response_headers, raw)
+        if status >= 300:
+            raise PackageTransportError(f"package API transport failed: unexpected redirect HTTP {status}")
+        return _package_json_object(raw)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(PACKAGE_HTTP_LATENCY_BUCKETS_MS, self._latency_counts)
+            }
+            histogram["gt_%dms" % PACKAGE_HTTP_LATENCY_BUCKETS_MS[-1]] = self._latency_counts[-1]
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "transport_errors": self.transport_errors,
+                "idle_connections": sum(len(idle) for idle in self._idle.values()),
+                "latency_histogram": histogram,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _last_used in connections:
+                connection.close()
+
+
+# Read-only resolver responses are cached per client for a few seconds so the
+# scan, preflight and prepare paths do not repeat identical round trips.  The
+# capability surface only changes with a server deployment; resolver answers
+# describe live entity versions and are dropped on every command and on every
+# receipt that reports entity versions.
+PACKAGE_CAPABILITIES_CACHE_TTL_SECONDS = 300.0
+PACKAGE_RESOLVER_CACHE_TTL_SECONDS = 5.0
+PACKAGE_RESOLVER_CACHE_MAX_ENTRIES = 256
+
+
+def _resolver_cache_key(path: str, scope: str) -> tuple[str, str, tuple[tuple[str, str], ...]]:
+    parsed = urlsplit(path)
+    return (
+        parsed.path,
+        str(scope or "").strip(),
+        tuple(sorted(parse_qsl(parsed.query, keep_blank_values=True))),
+    )
+
+
+# Scan-time PACKAGE_SOURCE answers are kept per packaging set long enough to
+# cover a normal five-scan or PHS2 set; the server compare-and-swap on the
+# final command remains the authority for anything older.
+PACKAGE_SOURCE_RESOLUTION_TTL_SECONDS = 300.0
+PACKAGE_SOURCE_RESOLUTION_MAX_SETS = 64
+
+
+def package_source_identity_hash(
+    *,
+    authority_scope_id: str,
+    item_id: str,
+    input_tag_id: str = "",
+    input_tag_label_id: str = "",
+    input_tag_hash_prefix: str = "",
+    source_bundle_hint: str = "",
+    exact_rescan_barcodes: Iterable[str] = (),
+) -> str:
+    """Hash the structured lineage a physical source QR resolves through."""
+
+    exact = canonical_barcodes(exact_rescan_barcodes)
+    return canonical_sha256(
+        {
+            "authority_scope_id": str(authority_scope_id or "").strip(),
+            "item_id": str(item_id or "").strip(),
+            "input_tag_id": str(input_tag_id or "").strip(),
+            "input_tag_label_id": str(input_tag_label_id or "").strip(),
+            "input_tag_hash_prefix": str(
+                input_tag_hash_prefix or ""
+            ).strip().lower(),
+            "source_bundle_hint": str(source_bundle_hint or "").strip(),
+            "barcode_membership_hash": (
+                barcode_membership_hash(exact) if exact else ""
+            ),
+        }
+    )
+
+
+def _resolution_entity_versions(resolved: Mapping[str, Any]) -> dict[str, int]:
+    versions = resolved.get("entity_versions")
+    if isinstance(versions, Mapping) and versions:
+        return {str(key): int(value) for key, value in versions.items()}
+    bundle = resolved.get("bundle") if isinstance(resolved.get("bundle"), Mapping) else resolved
+    bundle_id = str(bundle.get("transfer_bundle_id") or bundle.get("bundle_id") or "").strip()
+    if not bundle_id:
+        return {}
+    return {f"bundle:{bundle_id}": int(bundle.get("entity_version") or 0)}
+
+
+class PackageSourceResolutionCache:
+    """Per-set PACKAGE_SOURCE resolver answers captured at scan time.
+
+    Entries are keyed by set ID, the hash of the structured identity read from
+    the physical source QR, and the entity versions the answer reported.  A
+    consumer must present the same identity and, when it froze them, the same
+    versions.  Any command or receipt touching one of those entities drops the
+    entry, so a stale answer is never offered after a local version bump.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = PACKAGE_SOURCE_RESOLUTION_TTL_SECONDS,
+        max_sets: int = PACKAGE_SOURCE_RESOLUTION_MAX_SETS,
+    ):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_sets = max(1, int(max_sets))
+        self._entries: OrderedDict[
+            str, tuple[str, dict[str, int], float, dict[str, Any]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.stored = 0
+        self.invalidations = 0
+
+    def remember(
+        self, set_id: str, identity_hash: str, resolved: Mapping[str, Any]
+    ) -> None:
+        set_key = str(set_id or "").strip()
+        if not set_key or not identity_hash or self.ttl_seconds <= 0:
+            return
+        entry = (
+            identity_hash,
+            _resolution_entity_versions(resolved),
+            time.monotonic() + self.ttl_seconds,
+            copy.deepcopy(dict(resolved)),
+        )
+        with self._lock:
+            self._entries[set_key] = entry
+            self._entries.move_to_end(set_key)
+            self.stored += 1
+            while len(self._entries) > self.max_sets:
+                self._entries.popitem(last=False)
+
+    def rebind(self, old_set_id: str, new_set_id: str) -> None:
+        old_key = str(old_set_id or "").strip()
+        new_key = str(new_set_id or "").strip()
+        if not old_key or not new_key or old_key == new_key:
+            return
+        with self._lock:
+            entry = self._entries.pop(old_key, None)
+            if entry is not None:
+                self._entries[new_key] = entry
+
+    def take(
+        self,
+        set_id: str,
+        identity_hash: str,
+        entity_versions: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Pop the set's answer when identity and frozen versions still match."""
+
+        with self._lock:
+            entry = self._entries.pop(str(set_id or "").strip(), None)
+            if (
+                entry is None
+                or entry[0] != identity_hash
+                or entry[2] <= time.monotonic()
+                or (
+                    entity_versions is not None
+                    and entry[1]
+                    != {str(key): int(value) for key, value in entity_versions.items()}
+                )
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[3]
+
+    def record_stale(self) -> None:
+        with self._lock:
+            self.stale += 1
+
+    def discard_entities(self, entity_keys: Iterable[str]) -> None:
+        keys = {str(key) for key in entity_keys}
+        if not keys:
+            return
+        with self._lock:
+            for set_key in [
+                set_key
+                for set_key, entry in self._entries.items()
+                if keys.intersection(entry[1])
+            ]:
+                del self._entries[set_key]
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "stored": self.stored,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
 
 
 class PackageLogisticsClient:
@@ -2430,6 +2913,160 @@ class PackageLogisticsClient:
         config.validate()
         self.config = config
         self._transport = transport or _default_transport
+        self._resolver_cache: OrderedDict[tuple, tuple[float, bool, dict[str, Any]]] = OrderedDict()
+        self._resolver_cache_lock = threading.Lock()
+        self._resolver_cache_generation = 0
+        self._resolver_cache_hits = 0
+        self._resolver_cache_misses = 0
+        self._resolver_cache_bypasses = 0
+        self._resolver_cache_invalidations = 0
+        self.source_resolutions = PackageSourceResolutionCache()
+
+    def resolver_cache_stats(self) -> dict[str, int]:
+        with self._resolver_cache_lock:
+            return {
+                "hits": self._resolver_cache_hits,
+                "misses": self._resolver_cache_misses,
+                "bypasses": self._resolver_cache_bypasses,
+                "invalidations": self._resolver_cache_invalidations,
+                "entries": len(self._resolver_cache),
+            }
+
+    def invalidate_resolver_cache(self, *, include_capabilities: bool = False) -> None:
+        """Drop cached resolver answers that may describe stale entity versions."""
+
+        with self._resolver_cache_lock:
+            self._resolver_cache_generation += 1
+            self._resolver_cache_invalidations += 1
+            if include_capabilities:
+                self._resolver_cache.clear()
+                return
+            for key in [
+                key
+                for key, (_expires, versioned, _data) in self._resolver_cache.items()
+                if versioned
+            ]:
+                del self._resolver_cache[key]
+
+    def _cached_get(
+        self,
+        path: str,
+        *,
+        scope: str,
+        ttl_seconds: float,
+        versioned: bool = True,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        if not use_cache or ttl_seconds <= 0:
+            with self._resolver_cache_lock:
+                self._resolver_cache_bypasses += 1
+            return self._data(self._request("GET", path))
+        key = _resolver_cache_key(path, scope)
+        now = time.monotonic()
+        with self._resolver_cache_lock:
+            cached = self._resolver_cache.get(key)
+            if cached is not None and cached[0] > now:
+                self._resolver_cache_hits += 1
+                self._resolver_cache.move_to_end(key)
+                return copy.deepcopy(cached[2])
+            self._resolver_cache_misses += 1
+            generation = self._resolver_cache_generation
+        data = self._data(self._request("GET", path))
+        with self._resolver_cache_lock:
+            # A command or receipt that landed while this GET was in flight
+            # may already have made the answer stale; do not store it then.
+            if generation == self._resolver_cache_generation:
+                self._resolver_cache[key] = (
+                    time.monotonic() + ttl_seconds,
+                    versioned,
+                    copy.deepcopy(data),
+                )
+                self._resolver_cache.move_to_end(key)
+                while len(self._resolver_cache) > PACKAGE_RESOLVER_CACHE_MAX_ENTRIES:
+                    self._resolver_cache.popitem(last=False)
+        return data
+
+    def _source_resolution_identity(self, draft: PackageCommandDraft) -> str:
+        return package_source_identity_hash(
+            authority_scope_id=str(
+                draft.source_authority_scope_id
+                or self.config.authority_scope_id
+                or ""
+            ),
+            item_id=draft.item_code,
+            input_tag_id=draft.source_input_tag_id,
+            input_tag_label_id=draft.source_input_tag_label_id,
+            input_tag_hash_prefix=draft.source_input_tag_hash_prefix,
+            source_bundle_hint=draft.source_bundle_hint,
+            exact_rescan_barcodes=draft.exact_rescan_barcodes,
+        )
+
+    def remember_source_resolution(
+        self, draft: PackageCommandDraft, resolved: Mapping[str, Any]
+    ) -> None:
+        """Keep a scan-time resolver answer for ``draft.set_id``'s command."""
+
+        self.source_resolutions.remember(
+            draft.set_id, self._source_resolution_identity(draft), resolved
+        )
+
+    def prefetch_source_resolution(
+        self,
+        *,
+        set_id: str,
+        item_id: str,
+        authority_scope_id: str = "",
+        input_tag_id: str = "",
+        input_tag_label_id: str = "",
+        input_tag_hash_prefix: str = "",
+        source_bundle_hint: str = "",
+    ) -> None:
+        """Speculatively resolve a first scan's PACKAGE_SOURCE for later reuse."""
+
+        scope = str(authority_scope_id or self.config.authority_scope_id or "").strip()
+        resolved = self.resolve_transfer_bundle(
+            external_label="",
+            input_tag_id=input_tag_id,
+            input_tag_label_id=input_tag_label_id,
+            input_tag_hash_prefix=input_tag_hash_prefix,
+            item_id=item_id,
+            authority_scope_id=scope,
+            source_bundle_hint=source_bundle_hint,
+        )
+        self.source_resolutions.remember(
+            set_id,
+            package_source_identity_hash(
+                authority_scope_id=scope,
+                item_id=item_id,
+                input_tag_id=input_tag_id,
+                input_tag_label_id=input_tag_label_id,
+                input_tag_hash_prefix=input_tag_hash_prefix,
+                source_bundle_hint=source_bundle_hint,
+            ),
+            resolved,
+        )
+
+    def _take_source_resolution(
+        self, draft: PackageCommandDraft
+    ) -> dict[str, Any] | None:
+        if draft.source_resolution_basis:
+            versions = (
+                draft.work_group_source.get("entity_versions")
+                if isinstance(draft.work_group_source, Mapping)
+                else None
+            )
+            if not isinstance(versions, Mapping) or not versions:
+                return None
+        elif draft.source_bundle_id:
+            return None
+        else:
+            versions = None
+        try:
+            return self.source_resolutions.take(
+                draft.set_id, self._source_resolution_identity(draft), versions
+            )
+        except (TypeError, ValueError):
+            return None
 
     def _assert_authority(
         self,
@@ -2478,7 +3115,12 @@ class PackageLogisticsClient:
         servers cannot invalidate a printed transfer seal safely.
         """
 
-        return self._data(self._request("GET", "/logistics/api/v1/capabilities"))
+        return self._cached_get(
+            "/logistics/api/v1/capabilities",
+            scope="",
+            ttl_seconds=PACKAGE_CAPABILITIES_CACHE_TTL_SECONDS,
+            versioned=False,
+        )
 
     def issue_operation_lease(
         self,
@@ -2616,6 +3258,7 @@ class PackageLogisticsClient:
         authority_scope_id: str,
         exact_rescan_barcodes: Iterable[str] = (),
         source_bundle_hint: str = "",
+        use_cache: bool = True,
     ) -> dict[str, Any]:
         exact = canonical_barcodes(exact_rescan_barcodes)
         input_tag = str(input_tag_id or "").strip()
@@ -2650,7 +3293,12 @@ class PackageLogisticsClient:
         # label or compatibility WID can match multiple partial/remainder
         # lineages, while BND/ITG are structured server identities.
         query = urlencode(params)
-        return self._data(self._request("GET", f"/logistics/api/v1/bundles/resolve?{query}"))
+        return self._cached_get(
+            f"/logistics/api/v1/bundles/resolve?{query}",
+            scope=params["authority_scope_id"],
+            ttl_seconds=PACKAGE_RESOLVER_CACHE_TTL_SECONDS,
+            use_cache=use_cache,
+        )
 
     def resolve_package_source_projection(
         self, draft: PackageCommandDraft
@@ -2658,9 +3306,10 @@ class PackageLogisticsClient:
         """Resolve and validate the live TRANSFER behind a scanned PHS2.
 
         This read-only preflight is used by the packaging UI before a sealed
-        member exchange.  CREATE_PACKAGE still performs its own fresh resolve
-        and versioned read so this convenience method cannot weaken the final
-        command's compare-and-swap boundary.
+        member exchange.  CREATE_PACKAGE still performs its own versioned read
+        (or reuses only a scan-time answer whose versions still match) so this
+        convenience method cannot weaken the final command's compare-and-swap
+        boundary.
         """
 
         scope = str(
@@ -2825,6 +3474,7 @@ class PackageLogisticsClient:
         input_tag_id: str,
         *,
         authority_scope_id: str,
+        use_cache: bool = True,
     ) -> dict[str, Any]:
         scope = str(
             authority_scope_id
@@ -2833,13 +3483,13 @@ class PackageLogisticsClient:
         ).strip()
         self._assert_authority(scope)
         query = urlencode({"authority_scope_id": scope})
-        return self._data(
-            self._request(
-                "GET",
-                "/logistics/api/v1/input-tags/"
-                f"{quote(str(input_tag_id or '').strip(), safe='')}"
-                f"/phs-label?{query}",
-            )
+        return self._cached_get(
+            "/logistics/api/v1/input-tags/"
+            f"{quote(str(input_tag_id or '').strip(), safe='')}"
+            f"/phs-label?{query}",
+            scope=scope,
+            ttl_seconds=PACKAGE_RESOLVER_CACHE_TTL_SECONDS,
+            use_cache=use_cache,
         )
 
     def resolve_phs_reconciliation_actions(
@@ -3168,6 +3818,29 @@ class PackageLogisticsClient:
 
     def build_create_package_command(
         self, draft: PackageCommandDraft, *, idempotency_key: str
+    ) -> tuple[str, dict[str, Any]]:
+        resolved = self._take_source_resolution(draft)
+        if resolved is not None:
+            try:
+                return self._build_create_package_command(
+                    draft, idempotency_key=idempotency_key, resolved_hint=resolved
+                )
+            except (PackageApiError, PackageTransportError):
+                raise
+            except PackageLogisticsError:
+                # The scan-time answer is only a hint; whatever no longer
+                # validates against it is decided by a fresh resolve below.
+                self.source_resolutions.record_stale()
+        return self._build_create_package_command(
+            draft, idempotency_key=idempotency_key
+        )
+
+    def _build_create_package_command(
+        self,
+        draft: PackageCommandDraft,
+        *,
+        idempotency_key: str,
+        resolved_hint: Mapping[str, Any] | None = None,
     ) -> tuple[str, dict[str, Any]]:
         source_id = draft.source_bundle_id
         scope = str(draft.source_authority_scope_id or self.config.authority_scope_id or "").strip()
@@ -3180,16 +3853,19 @@ class PackageLogisticsClient:
         ):
             raise PackageLogisticsError("sealed transfer QR scope is outside the configured allowlist")
         if draft.source_resolution_basis:
-            resolved = self.resolve_transfer_bundle(
-                external_label=draft.source_external_label,
-                input_tag_id=draft.source_input_tag_id,
-                input_tag_label_id=draft.source_input_tag_label_id,
-                input_tag_hash_prefix=draft.source_input_tag_hash_prefix,
-                item_id=draft.item_code,
-                authority_scope_id=scope,
-                exact_rescan_barcodes=draft.exact_rescan_barcodes,
-                source_bundle_hint="",
-            )
+            resolved = resolved_hint
+            if resolved is None:
+                resolved = self.resolve_transfer_bundle(
+                    external_label=draft.source_external_label,
+                    input_tag_id=draft.source_input_tag_id,
+                    input_tag_label_id=draft.source_input_tag_label_id,
+                    input_tag_hash_prefix=draft.source_input_tag_hash_prefix,
+                    item_id=draft.item_code,
+                    authority_scope_id=scope,
+                    exact_rescan_barcodes=draft.exact_rescan_barcodes,
+                    source_bundle_hint="",
+                    use_cache=False,
+                )
             evidence = self._validate_work_group_source(
                 resolved,
                 draft,
@@ -3262,16 +3938,19 @@ class PackageLogisticsClient:
             return group_id, command
         resolved_projection: Mapping[str, Any] | None = None
         if not source_id:
-            resolved = self.resolve_transfer_bundle(
-                external_label=draft.source_external_label,
-                input_tag_id=draft.source_input_tag_id,
-                input_tag_label_id=draft.source_input_tag_label_id,
-                input_tag_hash_prefix=draft.source_input_tag_hash_prefix,
-                item_id=draft.item_code,
-                authority_scope_id=scope,
-                exact_rescan_barcodes=draft.exact_rescan_barcodes,
-                source_bundle_hint=draft.source_bundle_hint,
-            )
+            resolved = resolved_hint
+            if resolved is None:
+                resolved = self.resolve_transfer_bundle(
+                    external_label=draft.source_external_label,
+                    input_tag_id=draft.source_input_tag_id,
+                    input_tag_label_id=draft.source_input_tag_label_id,
+                    input_tag_hash_prefix=draft.source_input_tag_hash_prefix,
+                    item_id=draft.item_code,
+                    authority_scope_id=scope,
+                    exact_rescan_barcodes=draft.exact_rescan_barcodes,
+                    source_bundle_hint=draft.source_bundle_hint,
+                    use_cache=False,
+                )
             source = self._resolver_bundle(resolved)
             self._validate_projection(
                 source,
@@ -3304,6 +3983,12 @@ class PackageLogisticsClient:
             ).strip()
             if resolved_id != projection_id:
                 raise PackageLogisticsError("PACKAGE_SOURCE resolver lineage changed before packaging")
+            if resolved_hint is not None and int(
+                resolved_projection.get("entity_version") or 0
+            ) != int(projection.get("entity_version") or 0):
+                raise PackageLogisticsError(
+                    "scan-time PACKAGE_SOURCE resolution predates the transfer version"
+                )
         version = int(projection.get("entity_version") or 0)
         if version < 1:
             raise PackageLogisticsError("sealed transfer bundle entity_version is invalid")
@@ -3480,7 +4165,18 @@ class PackageLogisticsClient:
             + "/"
             + quote(str(idempotency_key), safe="")
         )
-        return self._data(self._request("GET", path))
+        receipt = self._data(self._request("GET", path))
+        data = receipt.get("data") if isinstance(receipt.get("data"), Mapping) else {}
+        if any(
+            source.get(field_name)
+            for source in (receipt, data)
+            for field_name in ("entity_versions", "sealed_bundle_version")
+        ):
+            self.invalidate_resolver_cache()
+        for source in (receipt, data):
+            if isinstance(source.get("entity_versions"), Mapping):
+                self.source_resolutions.discard_entities(source["entity_versions"])
+        return receipt
 
     def get_receipt_if_exists(
         self, idempotency_key: str, *, authority_scope_id: str
@@ -3506,13 +4202,33 @@ class PackageLogisticsClient:
         }
         if key:
             headers["Idempotency-Key"] = key
-        return self._transport(
-            method,
-            self.config.base_url.rstrip("/") + path,
-            headers,
-            body,
-            self.config.timeout_seconds,
-        )
+        if method == "GET":
+            return self._transport(
+                method,
+                self.config.base_url.rstrip("/") + path,
+                headers,
+                body,
+                self.config.timeout_seconds,
+            )
+        # Every command may bump entity versions, including ones whose
+        # outcome is unknown after a transport failure.
+        self.invalidate_resolver_cache()
+        try:
+            expected = json.loads(body or b"{}").get("expected_versions")
+        except (ValueError, AttributeError):
+            expected = None
+        if isinstance(expected, Mapping):
+            self.source_resolutions.discard_entities(expected)
+        try:
+            return self._transport(
+                method,
+                self.config.base_url.rstrip("/") + path,
+                headers,
+                body,
+                self.config.timeout_seconds,
+            )
+        finally:
+            self.invalidate_resolver_cache()
 
     @staticmethod
     def _data(response: Mapping[str, Any]) -> dict[str, Any]:
@@ -5658,6 +6374,98 @@ class PackageCancellationOutboxProcessor:
             )
 
 
+class PackageOutboxScheduler:
+    """Choose when the next package outbox drain should run.
+
+    The app drains right after an enqueue and asks for the next delay after
+    every drain.  Due rows keep draining back to back, a queue that is only
+    waiting on ``retry_after_at`` sleeps exactly until the earliest one, and a
+    drain that fails outright, only collects transport retries, or cannot
+    move due rows backs off exponentially with jitter.  With nothing queued it falls back to the idle
+    poll that also recovers stale SENDING leases.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_seconds: float = PACKAGE_OUTBOX_IDLE_POLL_SECONDS,
+        busy_seconds: float = PACKAGE_OUTBOX_BUSY_POLL_SECONDS,
+        max_failure_backoff_seconds: float = PACKAGE_OUTBOX_MAX_FAILURE_BACKOFF_SECONDS,
+    ):
+        self.idle_seconds = float(idle_seconds)
+        self.busy_seconds = float(busy_seconds)
+        self.max_failure_backoff_seconds = float(max_failure_backoff_seconds)
+        self.consecutive_failures = 0
+        self.last_metrics: dict[str, Any] = {}
+
+    def next_delay_seconds(
+        self,
+        metrics: Mapping[str, Mapping[str, Any]],
+        *,
+        drained: Mapping[str, int] | None = None,
+        failed: bool = False,
+    ) -> float:
+        queues = {
+            str(name): dict(value)
+            for name, value in metrics.items()
+            if isinstance(value, Mapping)
+        }
+        due_count = sum(int(value.get("due_count") or 0) for value in queues.values())
+        counts = dict(drained or {})
+        # CREATE_PACKAGE rows stay due right after a transport retry so the
+        # oldest-attempt ordering stays fair; the pause between rounds comes
+        # from here when a round only produced retries.
+        transport_failed = bool(
+            counts.get("retry")
+            and not counts.get("acked")
+            and not counts.get("conflict")
+        )
+        # ``deferred`` is a standing count of rows waiting on their CREATE,
+        # not something this round moved.
+        stalled = bool(
+            due_count
+            and drained is not None
+            and not sum(int(counts.get(name) or 0) for name in ("acked", "retry", "conflict"))
+        )
+        waiting = min(
+            [
+                self.idle_seconds,
+                *(
+                    float(value["next_retry_in_seconds"])
+                    for value in queues.values()
+                    if value.get("next_retry_in_seconds") is not None
+                ),
+            ]
+        )
+        if failed or transport_failed or stalled:
+            self.consecutive_failures += 1
+            delay = _retry_backoff_seconds(
+                self.consecutive_failures,
+                base_seconds=PACKAGE_OUTBOX_FAILURE_BACKOFF_BASE_SECONDS,
+                cap_seconds=self.max_failure_backoff_seconds,
+            )
+            if not due_count:
+                delay = max(delay, waiting)
+        else:
+            self.consecutive_failures = 0
+            delay = self.busy_seconds if due_count else waiting
+        delay = max(self.busy_seconds, delay)
+        ages = [
+            float(value["oldest_age_seconds"])
+            for value in queues.values()
+            if value.get("oldest_age_seconds") is not None
+        ]
+        self.last_metrics = {
+            "depth": sum(int(value.get("depth") or 0) for value in queues.values()),
+            "due_count": due_count,
+            "oldest_age_seconds": max(ages) if ages else None,
+            "next_drain_in_seconds": delay,
+            "consecutive_failures": self.consecutive_failures,
+            "queues": queues,
+        }
+        return delay
+
+
 def package_client_from_env(
     *,
     transport: Transport | None = None,
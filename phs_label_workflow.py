@@ -1876,9 +1876,12 @@ class PHSLabelExchangeCoordinator:
         fields, scope, quantity, membership_hash = (
             self._current_identity(current_set)
         )
+        # The refreshed overlay feeds a label-exchange command, so it must be
+        # read from the server rather than from the resolver cache.
         projection = self.client.resolve_active_phs_label(
             fields["ITG"],
             authority_scope_id=scope,
+            use_cache=False,
         )
         active = self._active_from_projection(projection, fields)
         active_qr = str(active.get("qr_payload") or "").strip()
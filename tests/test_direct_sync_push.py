@@ -1,5 +1,7 @@
+import gzip
 import hashlib
 import json
+import os
 import sqlite3
 import typing
 from datetime import datetime, timedelta, timezone
@@ -20,16 +22,21 @@ from direct_sync_push import (
     RELAY_STATUS_OPERATOR_REVIEW,
     RELAY_STATUS_PENDING,
     RELAY_STATUS_RETRY_WAIT,
+    RelayQueue,
+    SourceByteRange,
     acked_relay_retention_candidates,
     build_raw_artifact_restore_url,
     build_source_file_plan,
     canonical_json,
+    compact_acked_relay_artifacts,
     canonical_request_string,
     claim_next_relay_batch,
     count_csv_data_rows,
     drain_one_relay_batch,
     enqueue_source_file_for_relay,
+    init_relay_queue_schema,
     manifest_hash,
+    read_spool_digest,
     relay_queue_status,
     reset_stale_relay_leases,
     restore_metadata_from_upload_metadata,
@@ -494,6 +501,82 @@ def test_upload_writes_status_without_storing_secret(tmp_path):
     assert "X-Producer-Signature" not in status_text
 
 
+
+def _offer_upload_encodings(manifest_path, encodings):
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["streams"][0]["upload_content_encodings"] = encodings
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+
+def _accepted_response(metadata):
+    return FakeResponse(
+        200,
+        {
+            "request_id": "request-label-1",
+            "client_batch_id": metadata["client_batch_id"],
+            "server_source_file_id": (
+                f"{metadata['source_host_id']}/{metadata['producer_role']}/"
+                f"{metadata['stream_name']}/{metadata['relative_path']}"
+            ),
+            "committed": True,
+            "status": "accepted",
+            "retryable": False,
+            "next_retry_after": None,
+            "totals": {"inserted": 1, "replayed": 0, "quarantined": 0, "errors": 0},
+        },
+    )
+
+
+def test_upload_uses_manifest_negotiated_gzip_but_signs_uncompressed_digest(tmp_path):
+    _manifest, manifest_path = make_manifest(tmp_path)
+    _offer_upload_encodings(manifest_path, ["br", "gzip"])
+    csv_path = write_csv(tmp_path)
+    credentials = make_credentials()
+    plan = build_source_file_plan(
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=credentials,
+    )
+    session = FakeSession(_accepted_response(plan.metadata))
+
+    result = upload_source_file(plan, credentials, session=session)
+
+    assert result.success is True
+    assert plan.metadata["content_encoding"] == "gzip"
+    assert plan.metadata["content_sha256"] == hashlib.sha256(csv_path.read_bytes()).hexdigest()
+    assert plan.metadata["byte_length"] == csv_path.stat().st_size
+    assert session.calls[0]["content_type"] == "application/gzip"
+    assert session.calls[0]["file_name"] == csv_path.name
+    assert gzip.decompress(session.calls[0]["file_bytes"]) == csv_path.read_bytes()
+
+
+def test_compressed_spool_verifies_uncompressed_digest_and_posts_stored_bytes(tmp_path):
+    _manifest, manifest_path = make_manifest(tmp_path)
+    _offer_upload_encodings(manifest_path, ["gzip"])
+    csv_path = write_csv(tmp_path)
+    credentials = make_credentials()
+    db_path = tmp_path / "relay.sqlite3"
+    row = enqueue_source_file_for_relay(
+        db_path=db_path,
+        spool_dir=tmp_path / "spool",
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=credentials,
+        compress_spool=True,
+    )
+    spool_path = Path(row.spooled_file_path)
+    session = FakeSession(_accepted_response(row.metadata))
+
+    assert spool_path.name.endswith(".csv.gz")
+    assert read_spool_digest(spool_path) == (row.content_sha256, row.byte_length)
+    assert row.content_sha256 == hashlib.sha256(csv_path.read_bytes()).hexdigest()
+    result = drain_one_relay_batch(db_path=db_path, credentials=credentials, session=session)
+
+    assert result is not None and result.success is True
+    assert session.calls[0]["file_bytes"] == spool_path.read_bytes()
+    assert session.calls[0]["file_name"] == spool_path.name[: -len(".gz")]
+
+
 def test_upload_blocks_redirect_without_following_location(tmp_path):
     _manifest, manifest_path = make_manifest(tmp_path)
     csv_path = write_csv(tmp_path)
@@ -713,6 +796,60 @@ def test_relay_enqueue_keeps_legacy_duplicate_behavior_without_dedupe(tmp_path):
     assert relay_queue_status(db_path)["counts"][RELAY_STATUS_PENDING] == 2
 
 
+def test_csv_row_counter_matches_file_count_across_chunk_boundaries(tmp_path):
+    data = "\ufefftimestamp,event\r\n2026-06-21,가\r\n   \r\n2026-06-22,나\r2026-06-23,다".encode("utf-8")
+    path = tmp_path / "rows.csv"
+    path.write_bytes(data)
+
+    for chunk_size in (1, 2, 3, 5, len(data)):
+        counter = direct_sync_push_module._CsvRowCounter()
+        for offset in range(0, len(data), chunk_size):
+            counter.feed(data[offset:offset + chunk_size])
+        counter.feed(b"", final=True)
+        assert counter.data_rows == count_csv_data_rows(path) == 3
+
+
+def test_relay_enqueue_streams_source_range_into_spool_in_one_pass(tmp_path, monkeypatch):
+    _manifest, manifest_path = make_manifest(tmp_path)
+    csv_path = write_csv(tmp_path)
+    header = csv_path.read_bytes().split(b"\n", 1)[0] + b"\n"
+    with csv_path.open("ab") as handle:
+        handle.write("2026-06-21T00:01:00,worker,LABEL_MATCHED,\"{}\"\n".encode("utf-8"))
+    start_byte = len(csv_path.read_bytes().rsplit(b"\n", 2)[0]) + 1
+    end_byte = csv_path.stat().st_size
+    credentials = make_credentials()
+    spool_dir = tmp_path / "spool"
+    monkeypatch.setattr(
+        direct_sync_push_module,
+        "_read_file_digest",
+        lambda path: pytest.fail("range enqueue must not re-read the spooled file"),
+    )
+
+    row = enqueue_source_file_for_relay(
+        db_path=tmp_path / "relay.sqlite3",
+        spool_dir=spool_dir,
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=credentials,
+        dedupe_existing=True,
+        source_range=SourceByteRange(
+            source_file_path=str(csv_path),
+            start_byte=start_byte,
+            end_byte=end_byte,
+            relative_path_for_sha256=lambda digest: f"legacy_csv_deltas/test/bytes-{digest[:16]}.csv",
+            prefix=header,
+        ),
+    )
+
+    expected = header + csv_path.read_bytes()[start_byte:end_byte]
+    assert Path(row.spooled_file_path).read_bytes() == expected
+    assert row.content_sha256 == hashlib.sha256(expected).hexdigest()
+    assert row.byte_length == len(expected)
+    assert row.relative_path == f"legacy_csv_deltas/test/bytes-{row.content_sha256[:16]}.csv"
+    assert row.metadata["row_count"] == 1
+    assert [path.name for path in spool_dir.iterdir()] == [Path(row.spooled_file_path).name]
+
+
 def test_relay_claim_and_stale_lease_reset(tmp_path):
     _manifest, manifest_path = make_manifest(tmp_path)
     csv_path = write_csv(tmp_path)
@@ -742,6 +879,136 @@ def test_relay_claim_and_stale_lease_reset(tmp_path):
     assert status["counts"][RELAY_STATUS_PENDING] == 1
 
 
+
+def test_relay_queue_migrates_once_and_lends_one_connection_to_queue_helpers(tmp_path, monkeypatch):
+    db_path = tmp_path / "relay.sqlite3"
+    opened = []
+    open_relay_db = direct_sync_push_module._open_relay_db
+    monkeypatch.setattr(
+        direct_sync_push_module,
+        "_open_relay_db",
+        lambda path: opened.append(path) or open_relay_db(path),
+    )
+
+    init_relay_queue_schema(db_path)
+    init_relay_queue_schema(db_path)
+    assert len(opened) == 1
+
+    with RelayQueue(db_path) as queue, RelayQueue(db_path) as nested:
+        for _ in range(3):
+            assert queue.reset_stale_leases() == 0
+            assert nested.claim(worker_id="worker-a") is None
+        assert queue.status()["counts"] == {}
+        stats = nested.stats()
+
+    assert len(opened) == 2
+    assert stats["connections_opened"] == 1
+    assert stats["checkouts"] >= 7
+    assert stats["nested_connections"] == 0
+    assert relay_queue_status(db_path)["counts"] == {}
+    assert len(opened) == 2
+
+
+def test_source_ordered_claim_keeps_per_source_order_and_one_runtime_fenced_row_in_flight(tmp_path):
+    _manifest, manifest_path = make_manifest(tmp_path)
+    credentials = make_credentials()
+    db_path = tmp_path / "relay.sqlite3"
+    rows = {}
+    for name, body in (("a1", "A-1"), ("a2", "A-2"), ("b1", "B-1"), ("c1", "C-1")):
+        source = tmp_path / f"{name}.csv"
+        source.write_text(f"timestamp,worker_name,event,details\n{body},worker,LABEL_MATCHED,\n", encoding="utf-8")
+        rows[name] = enqueue_source_file_for_relay(
+            db_path=db_path,
+            spool_dir=tmp_path / "spool",
+            source_file_path=source,
+            producer_manifest_path=manifest_path,
+            credentials=credentials,
+        ).relay_id
+    with sqlite3.connect(db_path) as conn:
+        for index, name in enumerate(("a1", "a2", "b1", "c1")):
+            policy = "legacy_exact_replay" if name.startswith("a") else "runtime_required"
+            conn.execute(
+                "UPDATE direct_sync_relay_batches SET created_at=?, runtime_fencing_policy=? WHERE relay_id=?",
+                (f"2026-06-21T00:00:0{index}Z", policy, rows[name]),
+            )
+        # a1 and a2 are consecutive deltas of one source file.
+        conn.execute(
+            "UPDATE direct_sync_relay_batches SET source_file_path=?, source_order_key=? WHERE relay_id=?",
+            (str(tmp_path / "a1.csv"), str(tmp_path / "a1.csv"), rows["a2"]),
+        )
+
+    def claim(worker_id):
+        row = claim_next_relay_batch(
+            db_path=db_path,
+            worker_id=worker_id,
+            now="2999-06-21T00:00:00Z",
+            source_ordered=True,
+        )
+        return row.relay_id if row is not None else None
+
+    assert claim("worker-1") == rows["a1"]
+    assert claim("worker-2") == rows["b1"]
+    assert claim("worker-3") is None
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE direct_sync_relay_batches SET status=? WHERE relay_id IN (?, ?)",
+            (RELAY_STATUS_ACKED, rows["a1"], rows["b1"]),
+        )
+    assert claim("worker-1") == rows["a2"]
+    assert claim("worker-2") == rows["c1"]
+
+
+def test_source_ordered_claim_orders_legacy_staged_deltas_by_relative_path_prefix(tmp_path):
+    _manifest, manifest_path = make_manifest(tmp_path)
+    credentials = make_credentials()
+    db_path = tmp_path / "relay.sqlite3"
+    staging_dir = tmp_path / "spool" / "_scan_delta_inputs" / "0123456789abcdef"
+    staging_dir.mkdir(parents=True)
+    relay_ids = []
+    for index, (start_byte, end_byte) in enumerate(((0, 10), (10, 20))):
+        staged = staging_dir / f"bytes-{start_byte}-{end_byte}-sha256-{index:016d}.csv"
+        staged.write_text(f"timestamp,worker_name,event,details\nD-{index},worker,LABEL_MATCHED,\n", encoding="utf-8")
+        relay_ids.append(
+            enqueue_source_file_for_relay(
+                db_path=db_path,
+                spool_dir=tmp_path / "spool",
+                source_file_path=staged,
+                producer_manifest_path=manifest_path,
+                credentials=credentials,
+            ).relay_id
+        )
+    with sqlite3.connect(db_path) as conn:
+        for index, relay_id in enumerate(relay_ids):
+            conn.execute(
+                "UPDATE direct_sync_relay_batches SET relative_path=?, created_at=? WHERE relay_id=?",
+                (
+                    f"legacy_csv_deltas/source-0123456789abcdef/bytes-{index * 10}-{index * 10 + 10}-sha256-{index:016d}.csv",
+                    f"2026-06-21T00:00:0{index}Z",
+                    relay_id,
+                ),
+            )
+        # Rebuild the queue as a pre-migration database would look.
+        conn.execute("DROP INDEX idx_direct_sync_relay_order_key_status")
+        conn.execute("ALTER TABLE direct_sync_relay_batches DROP COLUMN source_order_key")
+    direct_sync_push_module._RELAY_SCHEMA_READY.clear()
+    init_relay_queue_schema(db_path)
+
+    def claim(worker_id):
+        row = claim_next_relay_batch(
+            db_path=db_path,
+            worker_id=worker_id,
+            now="2999-06-21T00:00:00Z",
+            source_ordered=True,
+        )
+        return row.relay_id if row is not None else None
+
+    assert claim("worker-1") == relay_ids[0]
+    assert claim("worker-2") is None
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE direct_sync_relay_batches SET status=? WHERE relay_id=?", (RELAY_STATUS_ACKED, relay_ids[0]))
+    assert claim("worker-2") == relay_ids[1]
+
+
 def test_stale_relay_worker_cannot_overwrite_reclaimed_lease(tmp_path):
     _manifest, manifest_path = make_manifest(tmp_path)
     csv_path = write_csv(tmp_path)
@@ -1363,12 +1630,14 @@ def test_acked_relay_retention_report_is_read_only_and_candidates_require_full_e
     )
 
     assert result.success is True
-    retention = relay_queue_status(db_path)["acked_retention"]
+    retention = relay_queue_status(db_path, audit_acked_files=True)["acked_retention"]
     assert retention["status"] == "RETAIN_REQUIRED"
     assert retention["cleanup_safe"] is False
     assert retention["acked_row_delete_allowed"] is False
-    assert retention["acked_spool_delete_allowed"] is False
-    assert retention["acked_upload_status_delete_allowed"] is False
+    assert retention["acked_spool_delete_allowed"] is True
+    assert retention["acked_upload_status_delete_allowed"] is True
+    assert retention["acked_rollup_count"] == 0
+    assert not any("tombstone" in blocker for blocker in retention["blockers"])
     assert retention["acked_count"] == 1
     assert retention["acked_spool_total_bytes"] == Path(row.spooled_file_path).stat().st_size
     assert retention["missing_acked_spool_count"] == 0
@@ -1426,6 +1695,177 @@ def test_acked_relay_retention_report_is_read_only_and_candidates_require_full_e
     assert acked_relay_retention_candidates(db_path) == ()
 
 
+def test_compaction_keeps_acked_anchor_and_reclaims_spool_status_and_orphan_files(tmp_path, monkeypatch):
+    manifest, manifest_path = make_manifest(tmp_path)
+    csv_path = write_csv(tmp_path)
+    credentials = make_credentials()
+    db_path = tmp_path / "relay.sqlite3"
+    row = enqueue_source_file_for_relay(
+        db_path=db_path,
+        spool_dir=tmp_path / "spool",
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=credentials,
+    )
+    receipt = {
+        "request_id": "request-compaction",
+        "upload_id": "request-compaction",
+        "client_batch_id": row.relay_id,
+        "server_source_file_id": f"{manifest['pc_identity']['source_host_id']}/label_match/label_match_events/{row.relative_path}",
+        "committed": True,
+        "status": "accepted",
+        "retryable": False,
+        "next_retry_after": None,
+        "totals": {"inserted": 1, "replayed": 0, "quarantined": 0, "errors": 0},
+    }
+    result = drain_one_relay_batch(
+        db_path=db_path,
+        credentials=credentials,
+        session=FakeSession(FakeResponse(200, receipt)),
+        status_dir=tmp_path / "status",
+    )
+    status_path = Path(result.status_path)
+    compact = {
+        "spool_dir": tmp_path / "spool",
+        "upload_status_dir": tmp_path / "status",
+        "now": "2099-01-01T00:00:00Z",
+    }
+    assert compact_acked_relay_artifacts(db_path, min_age_seconds=0, **compact)["compacted_count"] == 0
+    digests = []
+    read_digest = direct_sync_push_module.read_spool_digest
+    monkeypatch.setattr(
+        direct_sync_push_module,
+        "read_spool_digest",
+        lambda path: digests.append(path) or read_digest(path),
+    )
+    fresh = compact_acked_relay_artifacts(
+        db_path,
+        spool_dir=tmp_path / "spool",
+        upload_status_dir=tmp_path / "status",
+        min_age_seconds=3600,
+        max_acked_spool_bytes=row.byte_length,
+    )
+    assert fresh["compacted_count"] == 0
+    assert digests == []
+    with sqlite3.connect(db_path) as conn:
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT relay_id FROM direct_sync_relay_batches
+            WHERE status = ? AND updated_at <= ?
+            ORDER BY updated_at, created_at, relay_id
+            """,
+            (RELAY_STATUS_ACKED, "2099-01-01T00:00:00Z"),
+        ).fetchall()
+    assert any("idx_direct_sync_relay_status_updated" in str(step[-1]) for step in plan)
+    orphan = tmp_path / "spool" / "relay-orphan.csv"
+    orphan.write_bytes(b"stale")
+    os.utime(orphan, (0, 0))
+
+    report = compact_acked_relay_artifacts(db_path, min_age_seconds=3600, **compact)
+
+    assert report["compacted_count"] == 1
+    assert report["orphan_spool_count"] == 1
+    assert report["reclaimed_bytes"] > row.byte_length
+    assert not Path(row.spooled_file_path).exists() and not status_path.exists()
+    with sqlite3.connect(db_path) as conn:
+        anchor = conn.execute(
+            "SELECT status, spooled_file_path, receipt_json FROM direct_sync_relay_batches WHERE relay_id = ?",
+            (row.relay_id,),
+        ).fetchone()
+        rollup = conn.execute("SELECT relay_id, content_sha256 FROM direct_sync_relay_acked_rollup").fetchall()
+    assert anchor[:2] == (RELAY_STATUS_ACKED, "")
+    assert json.loads(anchor[2])["request_id"] == "request-compaction"
+    assert rollup == [(row.relay_id, row.content_sha256)]
+    retention = relay_queue_status(db_path, audit_acked_files=True)["acked_retention"]
+    assert retention["compacted_acked_count"] == 1
+    assert retention["acked_rollup_count"] == 1
+    assert retention["missing_acked_spool_count"] == 0
+    deduped = enqueue_source_file_for_relay(
+        db_path=db_path,
+        spool_dir=tmp_path / "spool",
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=credentials,
+        dedupe_existing=True,
+    )
+    assert deduped.deduped_existing is True and deduped.status == RELAY_STATUS_ACKED
+
+
+def test_compaction_sweeps_legacy_scan_delta_inputs_no_unsent_row_reads(tmp_path):
+    _, manifest_path = make_manifest(tmp_path)
+    staging_root = tmp_path / "spool" / "_scan_delta_inputs"
+    (staging_root / "source-queued").mkdir(parents=True)
+    queued = write_csv(staging_root / "source-queued")
+    stale = staging_root / "source-stale" / "bytes-0-10-sha256-0000000000000000.csv"
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"stale delta")
+    db_path = tmp_path / "relay.sqlite3"
+    enqueue_source_file_for_relay(
+        db_path=db_path,
+        spool_dir=tmp_path / "spool",
+        source_file_path=queued,
+        producer_manifest_path=manifest_path,
+        credentials=make_credentials(),
+    )
+    os.utime(queued, (0, 0))
+    os.utime(stale, (0, 0))
+
+    report = compact_acked_relay_artifacts(
+        db_path,
+        spool_dir=tmp_path / "spool",
+        upload_status_dir=tmp_path / "status",
+        min_age_seconds=3600,
+        now="2099-01-01T00:00:00Z",
+    )
+
+    assert report["orphan_spool_count"] == 1
+    assert report["reclaimed_orphan_bytes"] == len(b"stale delta")
+    assert not stale.parent.exists()
+    assert queued.exists()
+
+
+def test_relay_status_summary_follows_every_transition_and_backfills_on_migration(tmp_path):
+    _, manifest_path = make_manifest(tmp_path)
+    csv_path = write_csv(tmp_path)
+    db_path = tmp_path / "relay.sqlite3"
+    row = enqueue_source_file_for_relay(
+        db_path=db_path,
+        spool_dir=tmp_path / "spool",
+        source_file_path=csv_path,
+        producer_manifest_path=manifest_path,
+        credentials=make_credentials(),
+    )
+    assert relay_queue_status(db_path)["counts"] == {RELAY_STATUS_PENDING: 1}
+
+    claim_next_relay_batch(db_path=db_path, worker_id="worker-a")
+    status = relay_queue_status(db_path)
+    assert status["counts"] == {RELAY_STATUS_LEASED: 1}
+    assert status["oldest_active_created_at"]
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE direct_sync_relay_batches SET status = ? WHERE relay_id = ?", (RELAY_STATUS_ACKED, row.relay_id))
+        conn.commit()
+    status = relay_queue_status(db_path)
+    assert status["counts"] == {RELAY_STATUS_ACKED: 1}
+    assert status["oldest_active_created_at"] == ""
+    assert status["acked_retention"]["acked_byte_length"] == row.byte_length
+    assert status["acked_retention"]["files_audited"] is False
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TRIGGER trg_direct_sync_relay_summary_insert")
+        conn.execute("DELETE FROM direct_sync_relay_status_summary")
+        conn.commit()
+    direct_sync_push_module._RELAY_SCHEMA_READY.clear()
+    init_relay_queue_schema(db_path)
+    assert relay_queue_status(db_path)["counts"] == {RELAY_STATUS_ACKED: 1}
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM direct_sync_relay_batches")
+        conn.commit()
+    assert relay_queue_status(db_path)["counts"] == {}
+
+
 def test_relay_status_and_retention_candidates_do_not_create_missing_db(tmp_path):
     db_path = tmp_path / "missing-relay.sqlite3"
 
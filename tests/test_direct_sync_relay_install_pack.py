@@ -142,6 +142,15 @@ def test_install_pack_dry_run_writes_redacted_scheduled_task_plan(tmp_path):
     }
     assert "--max-active-queue-count" in report["runner_command"]
     assert "--max-active-queue-age-seconds" in report["runner_command"]
+    assert report["relay_drain"] == {
+        "max_batches": 50,
+        "max_drain_seconds": 40,
+        "max_concurrent_uploads": 2,
+    }
+    command = report["runner_command"]
+    assert command[command.index("--max-batches") + 1] == "50"
+    assert command[command.index("--max-drain-seconds") + 1] == "40"
+    assert command[command.index("--max-concurrent-uploads") + 1] == "2"
     assert "--min-source-file-age-seconds" in report["runner_command"]
     assert "60" in report["runner_command"]
     assert "schtasks.exe" == report["scheduled_task_create_command"][0]
@@ -1,7 +1,10 @@
 import importlib.util
+import io
 import json
 import os
+import queue
 import sqlite3
+import threading
 import time
 from pathlib import Path
 
@@ -13,6 +16,7 @@ from direct_sync_push import (
     RELAY_STATUS_PENDING,
     relay_queue_status,
 )
+from direct_sync_operator import read_relay_queue_status_read_only
 import tools.direct_sync_relay_runner as runner
 from tools.direct_sync_relay_runner import _scan_source_files, main
 
@@ -415,7 +419,9 @@ def test_runner_scan_source_records_watermark_after_durable_ack(tmp_path, capsys
     state = source_scan_state(tmp_path / "relay.sqlite3", csv_path)
     assert state is not None
     assert state["sent_byte_count"] == csv_path.stat().st_size
-    assert state["sent_prefix_sha256"] == runner._file_prefix_sha256(csv_path, csv_path.stat().st_size)
+    block_digests = runner._prefix_block_digests(csv_path, csv_path.stat().st_size)
+    assert json.loads(state["sent_block_digests"]) == block_digests
+    assert state["sent_prefix_sha256"] == runner._prefix_checkpoint_sha256(block_digests)
     status = json.loads((tmp_path / "runtime" / "status.json").read_text(encoding="utf-8"))
     assert status["status"] == "acked"
     assert status["scan_status"] == "enqueued"
@@ -517,7 +523,9 @@ def test_runner_scan_source_records_watermark_after_committed_operator_review(tm
     state = source_scan_state(tmp_path / "relay.sqlite3", csv_path)
     assert state is not None
     assert state["sent_byte_count"] == csv_path.stat().st_size
-    assert state["sent_prefix_sha256"] == runner._file_prefix_sha256(csv_path, csv_path.stat().st_size)
+    block_digests = runner._prefix_block_digests(csv_path, csv_path.stat().st_size)
+    assert json.loads(state["sent_block_digests"]) == block_digests
+    assert state["sent_prefix_sha256"] == runner._prefix_checkpoint_sha256(block_digests)
 
     assert main(args) == 0
     output = capsys.readouterr().out
@@ -593,6 +601,148 @@ def test_runner_scan_source_dir_runs_relay_drain_after_scan(tmp_path, capsys, mo
     assert len(calls) == 1
 
 
+
+def test_runner_max_batches_drains_backlog_after_targeted_acks_on_shared_session(tmp_path, capsys, monkeypatch):
+    calls = disable_scan_drain(monkeypatch, status="acked")
+    drains = []
+
+    def fake_run_relay_drain(config, **kwargs):
+        drains.append(kwargs)
+        return {"status": "idle", "drain_report": {"batches": 3, "bytes": 900, "handshakes": 0, "stop_reason": "queue_empty"}}
+
+    monkeypatch.setattr(runner, "run_relay_drain", fake_run_relay_drain)
+    sync_dir = tmp_path / "sync"
+    write_label_csv(sync_dir)
+    args = runner_args(tmp_path, scan_dir=sync_dir) + ["--max-batches", "4"]
+
+    assert main(args) == 0
+    output = capsys.readouterr().out
+
+    assert "direct_sync_relay_status=acked" in output
+    assert "direct_sync_drain_batches=3" in output
+    assert "direct_sync_drain_stop_reason=queue_empty" in output
+    assert len(calls) == 1
+    assert drains[0]["max_batches"] == 3
+    assert drains[0]["session"] is calls[0][1]["session"]
+
+
+
+def test_runner_coalesces_unsent_contiguous_deltas_up_to_the_size_cap(tmp_path, capsys, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    csv_path = write_label_csv(sync_dir)
+    db_path = tmp_path / "relay.sqlite3"
+    args = runner_args(tmp_path, scan_dir=sync_dir) + ["--coalesce-max-bytes", "4096"]
+    main(args)
+    for number in range(2):
+        with csv_path.open("a", encoding="utf-8") as file:
+            file.write(f"2026-06-22T00:0{number + 1}:00,worker,LABEL_MATCHED,\"{{}}\"\n")
+        main(args)
+    output = capsys.readouterr().out
+
+    rows = relay_rows(db_path)
+    assert [row["status"] for row in rows] == ["coalesced", "coalesced", RELAY_STATUS_PENDING]
+    merged = rows[-1]
+    assert merged["relative_path"].split("/")[-1].startswith(f"bytes-0-{csv_path.stat().st_size}-")
+    assert Path(merged["spooled_file_path"]).read_bytes() == csv_path.read_bytes()
+    assert not Path(rows[0]["spooled_file_path"]).exists()
+    assert "direct_sync_scan_coalesced_count=1" in output
+    assert runner._read_source_scan_state(db_path, csv_path) == csv_path.stat().st_size
+
+    with csv_path.open("a", encoding="utf-8") as file:
+        file.write("2026-06-22T00:09:00,worker,LABEL_MATCHED,\"{}\"\n")
+    main(runner_args(tmp_path, scan_dir=sync_dir) + ["--coalesce-max-bytes", "64"])
+
+    rows = relay_rows(db_path)
+    assert [row["status"] for row in rows] == ["coalesced", "coalesced", RELAY_STATUS_PENDING, RELAY_STATUS_PENDING]
+
+
+def test_coalesced_rows_are_reported_as_terminal_audit_rows(tmp_path, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    csv_path = write_label_csv(sync_dir)
+    db_path = tmp_path / "relay.sqlite3"
+    args = runner_args(tmp_path, scan_dir=sync_dir) + ["--coalesce-max-bytes", "4096"]
+    main(args)
+    with csv_path.open("a", encoding="utf-8") as file:
+        file.write("2026-06-22T00:01:00,worker,LABEL_MATCHED,\"{}\"\n")
+    main(args)
+
+    operator_queue = read_relay_queue_status_read_only(db_path)
+    assert operator_queue["terminal_counts"] == {"acked": 0, "failed_permanent": 0, "coalesced": 1}
+    retention = relay_queue_status(db_path)["acked_retention"]
+    assert retention["coalesced_count"] == 1
+    assert retention["coalesced_row_delete_allowed"] is False
+    assert "permanent audit row" in retention["coalesced_retention"]
+
+
+def test_runner_watch_mode_scans_only_catalog_changed_or_notified_files(tmp_path, capsys, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    today = write_label_csv(sync_dir, name="포장실작업이벤트로그_runner_20260623.csv")
+    write_label_csv(sync_dir)
+    built = []
+    build_delta = runner._build_delta_source_range
+    monkeypatch.setattr(
+        runner,
+        "_build_delta_source_range",
+        lambda config, source_file, *rest: built.append(source_file.name) or build_delta(config, source_file, *rest),
+    )
+    args = runner_args(tmp_path, scan_dir=sync_dir) + ["--watch-source-dir"]
+
+    main(args)
+    assert len(built) == 2
+    built.clear()
+    main(args)
+    assert built == []
+    assert "direct_sync_scan_unchanged_count=2" in capsys.readouterr().out
+
+    with today.open("a", encoding="utf-8") as file:
+        file.write("2026-06-23T00:01:00,worker,LABEL_MATCHED,\"{}\"\n")
+    main(args)
+    assert built == [today.name]
+    assert len(relay_rows(tmp_path / "relay.sqlite3")) == 3
+
+    class NotifyingWatcher:
+        def take_changes(self):
+            return {today.name, "unrelated.txt"}
+
+    built.clear()
+    parsed = runner._parse_args(args)
+    status = runner.run_cycle(runner._build_config(parsed), parsed, watcher=NotifyingWatcher())
+    assert built == []
+    assert status["scan_watch_mode"] == "notify"
+    assert status["scan_unchanged_count"] == 1
+
+
+def test_runner_watch_mode_keeps_deferred_notified_file_pending(tmp_path, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    csv_path = write_label_csv(sync_dir)
+    now = time.time()
+    os.utime(csv_path, (now, now))
+    args = runner_args(tmp_path, scan_dir=sync_dir) + ["--watch-source-dir", "--min-source-file-age-seconds", "60"]
+    parsed = runner._parse_args(args)
+    config = runner._build_config(parsed)
+    monkeypatch.setattr(runner.SourceDirectoryWatcher, "active", property(lambda self: True))
+    watcher = runner.SourceDirectoryWatcher(sync_dir)
+    watcher._needs_poll = False
+    watcher.requeue({csv_path.name})
+
+    status = runner.run_cycle(config, parsed, watcher=watcher)
+    assert status["scan_watch_mode"] == "notify"
+    assert status["scan_deferred_count"] == 1
+    assert status["scan_enqueued_count"] == 0
+
+    old_time = now - 120
+    os.utime(csv_path, (old_time, old_time))
+    status = runner.run_cycle(config, parsed, watcher=watcher)
+    assert status["scan_watch_mode"] == "notify"
+    assert status["scan_enqueued_count"] == 1
+    assert len(relay_rows(tmp_path / "relay.sqlite3")) == 1
+    assert watcher.take_changes() == set()
+
+
 def test_runner_scan_source_content_change_enqueues_new_delta(tmp_path, capsys, monkeypatch):
     disable_scan_drain(monkeypatch)
     sync_dir = tmp_path / "sync"
@@ -1125,3 +1275,160 @@ def test_runner_honors_operator_pause_before_scan_enqueue(tmp_path, capsys):
     assert "direct_sync_relay_status=paused_by_operator" in output
     assert "direct_sync_scan_enqueued_count=0" in output
     assert relay_queue_status(tmp_path / "relay.sqlite3")["counts"] == {}
+
+
+def test_runner_serve_answers_each_request_with_captured_cycle_output(tmp_path, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    write_label_csv(sync_dir)
+    args = runner_args(tmp_path, scan_dir=sync_dir)
+    requests = io.StringIO(
+        json.dumps({"argv": args})
+        + "\n\n"
+        + json.dumps({"argv": args + ["--enqueue-source-file", "x.csv"]})
+        + "\n"
+    )
+    responses = io.StringIO()
+
+    assert runner.serve(requests, responses) == 0
+
+    first, second = [json.loads(line) for line in responses.getvalue().splitlines()]
+    assert first["returncode"] == 1
+    assert "direct_sync_scan_enqueued_count=1" in first["stdout"]
+    assert second["returncode"] == 2
+    assert "mutually exclusive" in second["stderr"]
+    assert relay_queue_status(tmp_path / "relay.sqlite3")["counts"][RELAY_STATUS_PENDING] == 1
+
+
+def test_runner_serve_keeps_draining_backlog_between_requests(tmp_path, monkeypatch):
+    sync_dir = tmp_path / "sync"
+    sync_dir.mkdir()
+    relay_calls = []
+    drained = threading.Event()
+
+    def fake_run_relay_once(config, **kwargs):
+        # The request's own cycle and the first idle drain leave a retry backlog.
+        relay_calls.append(config.db_path)
+        if len(relay_calls) == 3:
+            drained.set()
+            return {"status": "acked", "queue": {"counts": {"acked": 1}}}
+        return {"status": "retry_wait", "queue": {"counts": {"retry_wait": 1}}}
+
+    monkeypatch.setattr(runner, "run_relay_once", fake_run_relay_once)
+
+    def requests():
+        yield json.dumps({"argv": runner_args(tmp_path, scan_dir=sync_dir)}) + "\n"
+        drained.wait(5)
+        time.sleep(0.05)
+
+    responses = io.StringIO()
+
+    assert runner.serve(requests(), responses, idle_drain_seconds=0.01) == 0
+    assert len(relay_calls) == 3
+    assert json.loads(responses.getvalue())["returncode"] == 0
+
+
+def test_runner_serve_drains_backlog_continuously_and_answers_requests_between_batches(tmp_path, monkeypatch):
+    events = []
+    requests = queue.Queue()
+    backlog = {"status": "acked", "queue": {"counts": {"pending": 3}}}
+    config = object()
+
+    def fake_serve_request(line, session, watchers):
+        events.append(("request", line))
+        return {"returncode": 0}, config, backlog
+
+    def fake_run_relay_once(drain_config, **kwargs):
+        events.append(("drain", drain_config is config))
+        drains = sum(1 for kind, _ in events if kind == "drain")
+        if drains == 1:
+            requests.put("second\n")
+        if drains == 3:
+            requests.put(None)
+            return {"status": "acked", "queue": {"counts": {"acked": 3}}}
+        return backlog
+
+    monkeypatch.setattr(runner, "_serve_request", fake_serve_request)
+    monkeypatch.setattr(runner, "run_relay_once", fake_run_relay_once)
+    requests.put("first\n")
+    responses = io.StringIO()
+
+    assert runner._serve_loop(requests, responses, session=None, idle_drain_seconds=60) == 0
+    assert events == [
+        ("request", "first\n"),
+        ("drain", True),
+        ("request", "second\n"),
+        ("drain", True),
+        ("drain", True),
+    ]
+    assert len(responses.getvalue().splitlines()) == 2
+
+
+def test_runner_scan_enqueues_appended_range_without_staging_a_delta_file(tmp_path, capsys, monkeypatch):
+    disable_scan_drain(monkeypatch)
+    sync_dir = tmp_path / "sync"
+    source = write_label_csv(sync_dir)
+    args = runner_args(tmp_path, scan_dir=sync_dir)
+    main(args)
+    header = source.read_bytes().splitlines(keepends=True)[0]
+    appended = "2026-06-22T00:01:00,worker,LABEL_MATCHED,\"{}\"\n".encode("utf-8")
+    with source.open("ab") as handle:
+        handle.write(appended + b"2026-06-22T00:02:00,partial")
+
+    main(args)
+    capsys.readouterr()
+
+    first, second = relay_rows(tmp_path / "relay.sqlite3")
+    assert Path(second["spooled_file_path"]).read_bytes() == header + appended
+    assert second["source_file_path"] == first["source_file_path"] == str(source.resolve())
+    assert not (tmp_path / "spool" / "_scan_delta_inputs").exists()
+
+
+def _checkpointed_source(tmp_path, monkeypatch, body):
+    monkeypatch.setattr(runner, "PREFIX_CHECKPOINT_BLOCK_BYTES", 16)
+    source = tmp_path / "포장실작업이벤트로그_runner_20260622.csv"
+    source.write_bytes(body)
+    db_path = tmp_path / "relay.sqlite3"
+    runner._record_source_sent_byte_count(db_path, source, len(body))
+    return source, db_path
+
+
+def test_scan_checkpoint_verifies_in_place_append_by_hashing_only_the_tail(tmp_path, monkeypatch):
+    body = b"header\n" + b"".join(b"row-%03d\n" % number for number in range(20))
+    source, db_path = _checkpointed_source(tmp_path, monkeypatch, body)
+    with source.open("ab") as handle:
+        handle.write(b"row-new\n")
+    hashed = []
+    block_digests = runner._prefix_block_digests
+
+    def counting_block_digests(path, byte_count, reuse=(), reuse_byte_count=0):
+        hashed.append(byte_count - min(reuse_byte_count, byte_count) // 16 * 16)
+        return block_digests(path, byte_count, reuse, reuse_byte_count)
+
+    monkeypatch.setattr(runner, "_prefix_block_digests", counting_block_digests)
+    monkeypatch.setattr(runner, "_file_prefix_sha256", lambda *args: pytest.fail("full prefix hash"))
+
+    assert runner._read_source_scan_state(db_path, source) == len(body)
+    assert hashed and max(hashed) <= 16
+
+    runner._record_source_sent_byte_count(db_path, source, len(body) + len(b"row-new\n"))
+    assert max(hashed) <= 16
+
+
+def test_scan_checkpoint_rechecks_replaced_or_truncated_sources_in_full(tmp_path, monkeypatch):
+    body = b"header\n" + b"".join(b"row-%03d\n" % number for number in range(20))
+    source, db_path = _checkpointed_source(tmp_path, monkeypatch, body)
+    # Keep the original inode allocated so a replacement cannot reuse its number.
+    os.link(source, tmp_path / "original.csv")
+
+    replacement = tmp_path / "replacement.csv"
+    replacement.write_bytes(body + b"row-new\n")
+    os.replace(replacement, source)
+    assert runner._read_source_scan_state(db_path, source) == len(body)
+
+    replacement.write_bytes(body.replace(b"row-003", b"row-XXX") + b"row-new\n")
+    os.replace(replacement, source)
+    assert runner._read_source_scan_state(db_path, source) == 0
+
+    source.write_bytes(body[:-8])
+    assert runner._read_source_scan_state(db_path, source) == 0
@@ -27,7 +27,13 @@ from direct_sync_push import (
     relay_queue_status,
     upload_source_file,
 )
-from direct_sync_runtime import DirectSyncRuntimeConfig, enqueue_completed_source_file, load_credentials_from_json, run_relay_once
+from direct_sync_runtime import (
+    DirectSyncRuntimeConfig,
+    enqueue_completed_source_file,
+    load_credentials_from_json,
+    run_relay_drain,
+    run_relay_once,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -866,6 +872,67 @@ def test_runtime_once_acks_batch_and_records_local_status(tmp_path):
     assert_runtime_artifacts_are_redacted(config)
 
 
+
+def test_runtime_drain_uploads_batches_over_one_session_and_reports_rates(tmp_path):
+    config = make_config(tmp_path)
+    for number in range(3):
+        source = write_csv(tmp_path, name=f"label_runtime_{number}.csv", barcode=f"BC-{number}")
+        enqueue_completed_source_file(config, source_file_path=source)
+    session = EchoAcceptedSession()
+
+    bounded = run_relay_drain(config, max_batches=2, session=session)
+    drained = run_relay_drain(config, max_batches=5, session=session)
+
+    assert bounded["drain_report"]["batches"] == 2
+    assert bounded["drain_report"]["stop_reason"] == "max_batches"
+    assert drained["drain_report"]["batches"] == 1
+    assert drained["drain_report"]["stop_reason"] == "queue_empty"
+    assert drained["drain_report"]["bytes"] > 0
+    assert relay_queue_status(config.db_path)["counts"][RELAY_STATUS_ACKED] == 3
+    assert len(session.calls) == 3
+    persisted = json.loads(config.runtime_status_path.read_text(encoding="utf-8"))
+    assert persisted["drain_report"] == drained["drain_report"]
+    events = [json.loads(line)["event"] for line in config.log_path.read_text(encoding="utf-8").splitlines()]
+    assert events.count("relay_drain_completed") == 2
+
+
+
+def test_runtime_concurrent_drain_uploads_unfenced_sources_in_parallel(tmp_path, monkeypatch):
+    config = make_config(tmp_path)
+    for number in range(3):
+        source = write_csv(tmp_path, name=f"label_runtime_{number}.csv", barcode=f"BC-{number}")
+        enqueue_completed_source_file(config, source_file_path=source)
+    with sqlite3.connect(config.db_path) as conn:
+        conn.execute("UPDATE direct_sync_relay_batches SET runtime_fencing_policy='legacy_exact_replay'")
+    barrier = threading.Barrier(3, timeout=5)
+
+    class ParallelSession(EchoAcceptedSession):
+        def post(self, url, **kwargs):
+            barrier.wait()
+            return super().post(url, **kwargs)
+
+    status_writes = []
+    write_json_atomic = direct_sync_runtime._write_json_atomic
+    monkeypatch.setattr(
+        direct_sync_runtime,
+        "_write_json_atomic",
+        lambda path, payload: status_writes.append(threading.current_thread().name) or write_json_atomic(path, payload),
+    )
+
+    status = run_relay_drain(config, max_batches=10, max_workers=3, session=ParallelSession())
+
+    assert status["drain_report"]["batches"] == 3
+    assert status["drain_report"]["workers"] == 3
+    assert status["drain_report"]["stop_reason"] == "queue_empty"
+    assert relay_queue_status(config.db_path)["counts"][RELAY_STATUS_ACKED] == 3
+    # Workers leave the status file alone; the drain writes it once.
+    assert status_writes == [threading.current_thread().name]
+    persisted = json.loads(config.runtime_status_path.read_text(encoding="utf-8"))
+    assert persisted["drain_report"] == status["drain_report"]
+    events = [json.loads(line)["event"] for line in config.log_path.read_text(encoding="utf-8").splitlines()]
+    assert events.count("relay_runner_once") >= 3
+
+
 def test_runtime_spool_digest_mismatch_blocks_before_post(tmp_path):
     config = make_config(tmp_path)
     source_file = write_csv(tmp_path)
@@ -3,7 +3,9 @@ import base64
 import csv
 import importlib.util
 import json
+import os
 import queue
+import sys
 import threading
 import time
 from collections import defaultdict
@@ -628,6 +630,14 @@ def test_session_direct_sync_runner_uses_zero_source_file_age(tmp_path, monkeypa
         module.LABEL_MATCH_SESSION_SYNC_REQUEST_TIMEOUT_SECONDS
     )
     assert module.LABEL_MATCH_SESSION_SYNC_REQUEST_TIMEOUT_SECONDS * 2 < module.LABEL_MATCH_SESSION_SYNC_PROCESS_TIMEOUT_SECONDS
+    assert command[command.index("--max-batches") + 1] == str(module.LABEL_MATCH_SESSION_SYNC_MAX_BATCHES)
+    assert int(command[command.index("--max-concurrent-uploads") + 1]) > 1
+    assert (
+        module.LABEL_MATCH_SESSION_SYNC_REQUEST_TIMEOUT_SECONDS * 2
+        + float(command[command.index("--max-drain-seconds") + 1])
+        < module.LABEL_MATCH_SESSION_SYNC_PROCESS_TIMEOUT_SECONDS
+        - module.LABEL_MATCH_SESSION_SYNC_TERMINATION_GRACE_SECONDS
+    )
     assert command[command.index("--min-source-file-age-seconds") + 1] == "0"
     assert "--source-glob" in command
     assert command[command.index("--source-glob") + 1] == "*.csv"
@@ -688,6 +698,78 @@ def test_session_direct_sync_reports_runner_backpressure_exit_as_fail(tmp_path,
     )
 
 
+RESIDENT_RUNNER_SCRIPT = """
+import json, os, sys
+assert sys.argv[1:] == ["--serve"]
+for line in sys.stdin:
+    request = json.loads(line)
+    print(json.dumps({"returncode": 0, "stdout": f"pid={os.getpid()} argv={request['argv']}"}), flush=True)
+"""
+
+
+def test_session_sync_command_reuses_one_resident_runner(tmp_path):
+    module = load_label_match_module()
+    script = tmp_path / "direct_sync_relay_runner.py"
+    script.write_text(RESIDENT_RUNNER_SCRIPT, encoding="utf-8")
+    command = [sys.executable, str(script), "--scan-source-dir", str(tmp_path)]
+    env = {**os.environ, module.LABEL_MATCH_SAVE_DIR_ENV: str(tmp_path)}
+
+    try:
+        first = module._label_match_run_session_sync_command(command, timeout_seconds=10, env=env)
+        second = module._label_match_run_session_sync_command(command, timeout_seconds=10, env=env)
+    finally:
+        closed = module._label_match_close_session_sync_helper()
+
+    assert first["transport"] == second["transport"] == "resident_helper"
+    assert first["returncode"] == 0 and not first["timed_out"]
+    assert first["stdout"].split()[0] == second["stdout"].split()[0]
+    assert f"argv=['--scan-source-dir', '{tmp_path}']" in second["stdout"]
+    assert closed["method"] == "stdin_closed"
+
+
+def test_session_sync_command_falls_back_for_runner_without_serve(tmp_path, monkeypatch):
+    module = load_label_match_module()
+    script = tmp_path / "direct_sync_relay_runner.py"
+    script.write_text("import sys\nsys.exit(2)\n", encoding="utf-8")
+    command = [sys.executable, str(script), "--db-path", "queue.sqlite3"]
+    one_shot = []
+
+    def fake_run(command, **kwargs):
+        one_shot.append(command)
+        return {"returncode": 0, "stdout": "", "stderr": "", "timed_out": False}
+
+    monkeypatch.setattr(module, "_label_match_run_bounded_subprocess", fake_run)
+
+    first = module._label_match_run_session_sync_command(command, timeout_seconds=10, env=dict(os.environ))
+    second = module._label_match_run_session_sync_command(command, timeout_seconds=10, env=dict(os.environ))
+
+    assert first["transport"] == second["transport"] == "subprocess"
+    assert one_shot == [command, command]
+    assert module._LABEL_MATCH_SESSION_SYNC_HELPER is None
+
+
+def test_session_direct_sync_records_trigger_latency(tmp_path, monkeypatch):
+    module = load_label_match_module()
+    context = {
+        "status_dir": str(tmp_path),
+        "source_host_id": "label-match-pack-03",
+        "scan_source_dir": str(tmp_path / "scan-data"),
+    }
+    monkeypatch.setattr(
+        module,
+        "_label_match_run_session_direct_sync_once",
+        lambda *args, **kwargs: {"status": "PASS", "reason": "TRAY_COMPLETE", "returncode": 0},
+    )
+
+    result = module._label_match_run_and_record_session_direct_sync(context, reason="TRAY_COMPLETE")
+    module._label_match_run_and_record_session_direct_sync(context, reason="TRAY_COMPLETE")
+
+    assert result["sync_latency_seconds"] >= 0
+    latest = json.loads((tmp_path / "label_match_session_direct_sync_trigger.json").read_text(encoding="utf-8"))
+    assert latest["session_sync_latency"]["TRAY_COMPLETE"]["count"] == 2
+    assert module._label_match_session_sync_latency_snapshot()["TRAY_COMPLETE"]["count"] == 2
+
+
 def test_current_delta_ack_report_rejects_missing_stale_and_wrong_target(tmp_path):
     module = load_label_match_module()
     status_path = tmp_path / "runtime-status.json"
@@ -2106,6 +2188,109 @@ def test_data_manager_fsyncs_local_completion_before_flush_returns(
     assert len(fsync_calls) == 1
 
 
+def test_data_manager_group_commits_a_queued_batch_with_one_fsync(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    fsync_calls = []
+    opened_paths = []
+    real_open = open
+    monkeypatch.setattr(
+        module.os, "fsync", lambda file_descriptor: fsync_calls.append(file_descriptor)
+    )
+
+    def counting_open(path, *args, **kwargs):
+        opened_paths.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(module, "open", counting_open, raising=False)
+    monkeypatch.setattr(module.DataManager, "_log_writer_thread", lambda self: None)
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    manager.log_thread.join()
+    futures = [
+        manager.log_event(module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "A"}),
+        manager.log_event("SCAN_OK", {"set_id": "B"}),
+        manager.log_event(module.Label_Match.Events.SET_DELETED, {"set_id": "A"}),
+    ]
+
+    batch = manager._drain_log_batch(manager.log_queue.get_nowait())
+    manager._write_log_batch(batch)
+
+    assert len(batch) == 3
+    assert all(future.result(timeout=0) is True for future in futures)
+    assert len(fsync_calls) == 1
+    assert [path for path in opened_paths if path.endswith(".csv")] == [
+        manager._get_log_filepath()
+    ]
+    manager._finish_log_handle()
+    with real_open(manager._get_log_filepath(), encoding="utf-8-sig", newline="") as handle:
+        assert [row["event"] for row in csv.DictReader(handle)] == [
+            module.Label_Match.Events.TRAY_COMPLETE,
+            "SCAN_OK",
+            module.Label_Match.Events.SET_DELETED,
+        ]
+
+
+def test_data_manager_flush_waits_on_a_barrier_without_polling(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    monkeypatch.setattr(
+        module.time,
+        "sleep",
+        lambda seconds: (_ for _ in ()).throw(AssertionError("flush polled")),
+    )
+
+    manager.log_event(module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "A"})
+    assert manager.flush(timeout=5.0) is True
+    assert manager.log_queue.unfinished_tasks == 0
+    manager.close(timeout=5.0)
+    assert manager.flush(timeout=0) is True
+
+
+def test_data_manager_flush_times_out_while_the_writer_is_stalled(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    release = threading.Event()
+    monkeypatch.setattr(
+        module.DataManager, "_log_writer_thread", lambda self: release.wait(5.0)
+    )
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        manager.flush(timeout=0.05)
+    assert time.monotonic() - started < 1.0
+    release.set()
+    manager.log_thread.join(5.0)
+
+
+def test_data_manager_durability_future_reports_writer_failure(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+
+    def failing_open(*args, **kwargs):
+        raise OSError("forced write failure")
+
+    monkeypatch.setattr(module, "open", failing_open, raising=False)
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    durability = manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "lost"}
+    )
+    app = object.__new__(module.Label_Match)
+    app.data_manager = manager
+
+    with pytest.raises(RuntimeError, match="forced write failure"):
+        module.Label_Match._flush_data_manager_if_supported(
+            app, durability=durability
+        )
+    with pytest.raises(RuntimeError, match="forced write failure"):
+        manager.close(timeout=5.0)
+
+
 def test_durable_event_manifest_includes_completion_replacement_and_review():
     module = load_label_match_module()
 
@@ -2118,6 +2303,155 @@ def test_durable_event_manifest_includes_completion_replacement_and_review():
     }
 
 
+def test_data_manager_keeps_event_index_in_sync_with_the_csv(tmp_path):
+    module = load_label_match_module()
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+
+    manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "SET-INDEXED"}
+    )
+    manager.flush(timeout=5.0)
+
+    assert manager.event_index.event_exists(
+        "set_id",
+        "SET-INDEXED",
+        event=module.Label_Match.Events.TRAY_COMPLETE,
+    )
+    manager.close(timeout=5.0)
+    assert (tmp_path / module.EVENT_INDEX_FILENAME).is_file()
+
+
+def test_durable_projection_lookups_use_the_shared_key_index(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    older_log = tmp_path / "포장실작업이벤트로그_PC01_20260701.csv"
+    with older_log.open("w", encoding="utf-8-sig", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["timestamp", "worker_name", "event", "details"])
+        writer.writerow(
+            [
+                "2026-07-01T10:00:00",
+                "worker-a",
+                "PHS_REPLACEMENT_WAITING_MARKED",
+                json.dumps({"intent_id": "WAIT-OLD"}),
+            ]
+        )
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    manager.log_event(
+        module.Label_Match.Events.POST_REVIEW_REQUIRED,
+        {"review_event_id": "REVIEW-NEW"},
+    )
+    manager.flush(timeout=5.0)
+
+    assert module._label_match_replacement_waiting_event_exists(
+        manager, "WAIT-OLD"
+    )
+
+    def csv_scan_forbidden(*args, **kwargs):
+        raise AssertionError("indexed lookups must not re-read the CSV logs")
+
+    monkeypatch.setattr(module, "open", csv_scan_forbidden, raising=False)
+    assert module._label_match_post_review_event_exists(manager, "REVIEW-NEW")
+    assert not module._label_match_local_completion_event_exists(
+        manager, "SET-MISSING"
+    )
+    monkeypatch.undo()
+    manager.close(timeout=5.0)
+
+
+def test_durable_projection_lookup_falls_back_to_csv_scan_without_index(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    monkeypatch.setenv(module.LABEL_MATCH_EVENT_INDEX_ENV, "off")
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "SET-CSV-ONLY"}
+    )
+    manager.close(timeout=5.0)
+
+    assert module._label_match_local_completion_event_exists(
+        manager, "SET-CSV-ONLY"
+    )
+    assert not module._label_match_local_completion_event_exists(
+        manager, "SET-MISSING"
+    )
+
+
+def test_data_manager_writes_csv_when_event_index_is_disabled(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    monkeypatch.setenv(module.LABEL_MATCH_EVENT_INDEX_ENV, "off")
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+
+    manager.log_event(module.Label_Match.Events.TRAY_COMPLETE, {"set_id": "S"})
+    manager.close(timeout=5.0)
+
+    assert manager.event_index is None
+    assert list(tmp_path.glob("포장실작업이벤트로그_PC01_*.csv"))
+    assert not (tmp_path / module.EVENT_INDEX_FILENAME).exists()
+
+
+def test_duplicate_index_keeps_completed_sets_across_days(tmp_path):
+    module = load_label_match_module()
+    manager = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE,
+        _completed_details(
+            "SET-YESTERDAY",
+            "ITEM-A",
+            "2026-06-23T10:00:00",
+            ["MASTER-A", "PROD-1", "PROD-2"],
+        ),
+    )
+    manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE,
+        _completed_details(
+            "SET-DELETED",
+            "ITEM-A",
+            "2026-06-23T10:05:00",
+            ["MASTER-B", "PROD-3"],
+        ),
+    )
+    manager.log_event(
+        module.Label_Match.Events.SET_DELETED, {"set_id": "SET-DELETED"}
+    )
+    manager.close(timeout=5.0)
+
+    next_day = module.DataManager(str(tmp_path), "포장실", "worker-a", "PC01")
+    app = object.__new__(module.Label_Match)
+    app.global_scanned_set = set()
+    app.data_manager = next_day
+
+    assert app._is_globally_scanned({"PROD-1"})
+    assert not app._is_globally_scanned({"PROD-3"})
+    assert not app._is_globally_scanned({"PROD-NEW"})
+    next_day.close(timeout=5.0)
+
+
+def test_duplicate_index_retention_zero_disables_the_index(tmp_path):
+    module = load_label_match_module()
+    manager = module.DataManager(
+        str(tmp_path),
+        "포장실",
+        "worker-a",
+        "PC01",
+        duplicate_index_retention_days=0,
+    )
+    manager.log_event(
+        module.Label_Match.Events.TRAY_COMPLETE,
+        _completed_details(
+            "SET-1", "ITEM-A", "2026-06-23T10:00:00", ["MASTER-A", "PROD-1"]
+        ),
+    )
+    manager.close(timeout=5.0)
+
+    assert manager.duplicate_index is None
+    assert not (tmp_path / module.DUPLICATE_INDEX_FILENAME).exists()
+
+
 def test_default_save_path_uses_programdata_durable_root(monkeypatch, tmp_path):
     module = load_label_match_module()
     program_data = tmp_path / "ProgramData"
@@ -2930,6 +3264,53 @@ def test_history_reload_sorts_completed_rows_without_end_time(tmp_path):
     ]
 
 
+def test_history_reload_keeps_compact_records_and_rereads_full_details(tmp_path):
+    module = load_label_match_module()
+    log_path = tmp_path / "events.csv"
+    details = _completed_details(
+        set_id="compact-set",
+        master_code="ITEM1",
+        end_time="2026-06-22T10:01:00",
+        raw_scans=["ITEM1", "PRODUCT_ITEM1_1"],
+    )
+    details["inspection_trace"] = {"line": "A-7", "notes": "줄\n바꿈"}
+    with log_path.open("w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.DictWriter(file, fieldnames=["timestamp", "worker_name", "event", "details"])
+        writer.writeheader()
+        writer.writerow(_event_row(module, "2026-06-22T10:01:00", details))
+    result_queue = queue.Queue()
+    app = object.__new__(module.Label_Match)
+    app.data_manager = _FakeDataManager(log_path)
+
+    module.Label_Match._async_load_history_task(app, result_queue)
+    record = result_queue.get_nowait()["set_details_map"]["compact-set"]
+    app.history_row_details_map = {"compact-set": record}
+
+    assert isinstance(record, module._HistorySetRecord)
+    assert not hasattr(record, "__dict__")
+    assert record.get("item_code") == "ITEM1"
+    assert record.get("scanned_product_barcodes") == ("ITEM1", "PRODUCT_ITEM1_1")
+    assert module._label_match_tray_complete_passed(record)
+    full = app._history_details_for_iid("compact-set")
+    assert type(full) is dict
+    assert full["inspection_trace"] == {"line": "A-7", "notes": "줄\n바꿈"}
+
+
+def test_history_record_degrades_to_compact_fields_when_log_is_replaced(tmp_path):
+    module = load_label_match_module()
+    log_path = tmp_path / "events.csv"
+    log_path.write_text("replaced", encoding="utf-8")
+    record = module._HistorySetRecord(
+        {"set_id": "gone", "item_code": "ITEM1", "inspection_trace": {"x": 1}},
+        str(log_path),
+        0,
+        400,
+    )
+
+    assert record.full_details() == {"set_id": "gone", "item_code": "ITEM1"}
+    assert record.get("inspection_trace") is None
+
+
 def test_history_reload_filters_deleted_cancelled_and_keeps_injection_payload_as_plain_data(tmp_path):
     module = load_label_match_module()
     malicious_item = '<script>alert("pc")</script>"; DROP TABLE local_history; --'
@@ -3016,6 +3397,82 @@ def test_history_reload_filters_deleted_cancelled_and_keeps_injection_payload_as
     assert "DROP TABLE" in inline_text
 
 
+def test_history_reload_decodes_only_rows_appended_since_the_last_load(
+    tmp_path, monkeypatch
+):
+    module = load_label_match_module()
+    log_path = tmp_path / "events.csv"
+    fieldnames = ["timestamp", "worker_name", "event", "details"]
+    with log_path.open("w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerow(_event_row(module, "2026-06-22T10:01:00", _completed_details(
+            set_id="first", master_code="ITEM1",
+            end_time="2026-06-22T10:01:00", raw_scans=["ITEM1", "P1"],
+        )))
+    app = object.__new__(module.Label_Match)
+    app.data_manager = _FakeDataManager(log_path)
+    result_queue = queue.Queue()
+    module.Label_Match._async_load_history_task(app, result_queue)
+    assert [sid for sid, _ in result_queue.get_nowait()["sorted_sets"]] == ["first"]
+
+    with log_path.open("a", newline="", encoding="utf-8-sig") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writerow(_event_row(module, "2026-06-22T10:02:00", _completed_details(
+            set_id="second", master_code="ITEM2",
+            end_time="2026-06-22T10:02:00", raw_scans=["ITEM2", "P2"],
+        )))
+        writer.writerow({
+            "timestamp": "2026-06-22T10:03:00",
+            "worker_name": "tester",
+            "event": module.Label_Match.Events.TRAY_COMPLETION_CANCELLED,
+            "details": json.dumps({"cancelled_set_id": "first"}),
+        })
+    decoded = []
+    real_loads = module.json.loads
+    monkeypatch.setattr(
+        module.json,
+        "loads",
+        lambda text, *args, **kwargs: decoded.append(text) or real_loads(text, *args, **kwargs),
+    )
+
+    module.Label_Match._async_load_history_task(app, result_queue)
+    result = result_queue.get_nowait()
+
+    assert len(decoded) == 2
+    assert [sid for sid, _ in result["sorted_sets"]] == ["second"]
+    assert "P1" not in result["global_scanned_set"]
+    assert "P2" in result["global_scanned_set"]
+
+
+def test_history_reload_rereads_a_replaced_log_from_the_start(tmp_path):
+    module = load_label_match_module()
+    log_path = tmp_path / "events.csv"
+    fieldnames = ["timestamp", "worker_name", "event", "details"]
+
+    def write_log(set_id):
+        with log_path.open("w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerow(_event_row(module, "2026-06-22T10:01:00", _completed_details(
+                set_id=set_id, master_code="ITEM1",
+                end_time="2026-06-22T10:01:00", raw_scans=["ITEM1", set_id],
+            )))
+
+    write_log("original-set")
+    app = object.__new__(module.Label_Match)
+    app.data_manager = _FakeDataManager(log_path)
+    result_queue = queue.Queue()
+    module.Label_Match._async_load_history_task(app, result_queue)
+    result_queue.get_nowait()
+
+    write_log("restored-set")
+    module.Label_Match._async_load_history_task(app, result_queue)
+
+    result = result_queue.get_nowait()
+    assert [sid for sid, _ in result["sorted_sets"]] == ["restored-set"]
+
+
 def test_view_only_history_load_does_not_replace_live_scan_state():
     module = load_label_match_module()
     app = object.__new__(module.Label_Match)
@@ -3151,6 +3608,63 @@ def test_view_only_history_poll_reschedules_while_async_load_pending():
     assert scheduled[0][0] == 100
 
 
+def _history_rows(count):
+    return [
+        (
+            f"set-{number}",
+            {
+                "values": (f"set-{number}", "", "", "", "", "", "통과", "10:00:00"),
+                "tags": ("success",),
+            },
+        )
+        for number in range(count)
+    ]
+
+
+def test_history_rows_insert_newest_slice_first_and_older_slices_per_tick():
+    module = load_label_match_module()
+    app = object.__new__(module.Label_Match)
+    app.HISTORY_TREE_CHUNK_SIZE = 2
+    app.history_tree = _OrderedTree()
+    app.history_load_generation = 1
+    rows = _history_rows(5)
+    app.history_row_details_map = {set_id: {} for set_id, _data in rows}
+    scheduled = []
+    app.after = lambda delay, callback: scheduled.append(callback) or f"after-{len(scheduled)}"
+
+    module.Label_Match._insert_history_rows(app, rows)
+
+    assert app.history_tree.get_children() == ("set-3", "set-4")
+    del app.history_row_details_map["set-1"]
+    while scheduled:
+        scheduled.pop(0)()
+
+    assert app.history_tree.get_children() == ("set-0", "set-2", "set-3", "set-4")
+    assert [app.history_tree.rows[iid]["values"][0] for iid in app.history_tree.get_children()] == [1, 3, 4, 5]
+
+
+def test_pending_history_slices_stop_when_a_new_load_starts():
+    module = load_label_match_module()
+    app = object.__new__(module.Label_Match)
+    app.HISTORY_TREE_CHUNK_SIZE = 2
+    app.history_tree = _OrderedTree()
+    app.history_load_generation = 1
+    rows = _history_rows(4)
+    app.history_row_details_map = {set_id: {} for set_id, _data in rows}
+    scheduled = []
+    app.after = lambda delay, callback: scheduled.append(callback) or "after-id"
+    cancelled = []
+    app.after_cancel = cancelled.append
+
+    module.Label_Match._insert_history_rows(app, rows)
+    app.history_load_generation = 2
+    module.Label_Match._cancel_history_tree_job(app, "insert")
+
+    assert cancelled == ["after-id"]
+    scheduled.pop(0)()
+    assert app.history_tree.get_children() == ("set-2", "set-3")
+
+
 def test_orphan_history_poll_does_not_reschedule_after_load_completed():
     module = load_label_match_module()
     app = object.__new__(module.Label_Match)
@@ -3969,6 +4483,37 @@ def test_package_worker_never_calls_tk_after_from_background_thread():
     ]
 
 
+def test_package_outbox_poll_rearms_timer_from_queue_metrics():
+    module = load_label_match_module()
+
+    class Outbox:
+        @staticmethod
+        def queue_metrics():
+            return {"depth": 3, "due_count": 0, "next_retry_in_seconds": 2.5}
+
+    app = object.__new__(module.Label_Match)
+    app.package_outbox = Outbox()
+    app.package_outbox_scheduler = module.PackageOutboxScheduler()
+    app.package_outbox_thread = None
+    app.package_outbox_after_id = "after-stale"
+    app._package_outbox_drain_result = ({"acked": 1}, False)
+    app._refresh_package_cancellation_review_notice = lambda: None
+    app._reconcile_pending_sealed_transfer_exchanges = lambda **_kwargs: None
+    app._reconcile_active_package_submission = lambda: None
+    cancelled = []
+    after_calls = []
+    app.after_cancel = cancelled.append
+    app.after = lambda delay, callback: after_calls.append(delay) or "after-next"
+
+    module.Label_Match._poll_package_outbox_drain(app)
+
+    assert cancelled == ["after-stale"]
+    assert after_calls == [2500]
+    assert app.package_outbox_after_id == "after-next"
+    assert app.package_outbox_metrics["depth"] == 3
+    assert app.package_outbox_metrics["queues"]["create_package"]["depth"] == 3
+
+
 def test_active_package_submission_recovers_local_completion_without_waiting_for_ack():
     module = load_label_match_module()
 
@@ -5241,6 +5786,27 @@ class _RecordingTree:
         return row_id
 
 
+class _OrderedTree(_RecordingTree):
+    def __init__(self):
+        super().__init__()
+        self.order = []
+
+    def delete(self, *iids):
+        super().delete(*iids)
+        self.order = [iid for iid in self.order if iid not in iids]
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        row_id = super().insert(parent, index, iid=iid, values=values, tags=tags)
+        if index == "end":
+            self.order.append(row_id)
+        else:
+            self.order.insert(index, row_id)
+        return row_id
+
+
 class _FakeEntry:
     def __init__(self, text):
         self.text = text
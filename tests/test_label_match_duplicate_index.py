@@ -0,0 +1,68 @@
+from datetime import date
+import json
+
+import label_match_duplicate_index
+from label_match_duplicate_index import (
+    DUPLICATE_INDEX_FILENAME,
+    DuplicateBarcodeIndex,
+)
+
+
+def test_persisted_sets_and_tombstones_survive_a_reload(tmp_path):
+    path = tmp_path / DUPLICATE_INDEX_FILENAME
+    index = DuplicateBarcodeIndex(path)
+    assert index.add_set("SET-1", {"PROD-1", "PROD-2"}, "2026-06-22")
+    assert index.add_set("SET-2", {"PROD-3"}, "2026-06-22")
+    assert not index.add_set("SET-1", {"PROD-2", "PROD-1"}, "2026-06-23")
+    assert index.remove_set("SET-2", "2026-06-23")
+    index.persist()
+
+    reloaded = DuplicateBarcodeIndex(path, today=date(2026, 6, 24))
+
+    assert reloaded.contains_any({"PROD-1"}, today=date(2026, 6, 24))
+    assert not reloaded.contains_any({"PROD-3"}, today=date(2026, 6, 24))
+    assert reloaded.owners("PROD-2") == {"SET-1"}
+
+
+def test_expired_sets_are_not_duplicates(tmp_path):
+    path = tmp_path / DUPLICATE_INDEX_FILENAME
+    index = DuplicateBarcodeIndex(path, retention_days=30)
+    index.add_set("SET-OLD", {"PROD-OLD"}, "2026-05-01")
+    index.persist()
+
+    assert not index.contains_any({"PROD-OLD"}, today=date(2026, 6, 24))
+    reloaded = DuplicateBarcodeIndex(path, retention_days=30, today=date(2026, 6, 24))
+    assert len(reloaded) == 0
+
+
+def test_load_ignores_a_torn_trailing_line(tmp_path):
+    path = tmp_path / DUPLICATE_INDEX_FILENAME
+    index = DuplicateBarcodeIndex(path)
+    index.add_set("SET-1", {"PROD-1"}, "2026-06-22")
+    index.persist()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('["A","2026-06-22","SET-2",["PR')
+
+    reloaded = DuplicateBarcodeIndex(path, today=date(2026, 6, 23))
+
+    assert reloaded.owners("PROD-1") == {"SET-1"}
+    assert len(reloaded) == 1
+
+
+def test_load_compacts_a_journal_dominated_by_dead_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(label_match_duplicate_index, "COMPACTION_MIN_RECORDS", 4)
+    path = tmp_path / DUPLICATE_INDEX_FILENAME
+    index = DuplicateBarcodeIndex(path)
+    for number in range(3):
+        index.add_set(f"SET-{number}", {f"PROD-{number}"}, "2026-06-22")
+        index.remove_set(f"SET-{number}", "2026-06-22")
+    index.add_set("SET-LIVE", {"PROD-LIVE"}, "2026-06-22")
+    index.persist()
+
+    DuplicateBarcodeIndex(path, today=date(2026, 6, 23))
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records == [
+        ["V", label_match_duplicate_index.DUPLICATE_INDEX_FORMAT],
+        ["A", "2026-06-22", "SET-LIVE", ["PROD-LIVE"]],
+    ]
@@ -0,0 +1,144 @@
+import csv
+import json
+
+import pytest
+
+from label_match_event_index import (
+    EVENT_INDEX_FILENAME,
+    EventIndexError,
+    LabelMatchEventIndex,
+    event_index_keys,
+    iter_csv_records,
+    read_csv_record,
+)
+
+
+HEADER = ["timestamp", "worker_name", "event", "details"]
+
+
+def _append_rows(path, rows, *, header=False):
+    with path.open("a", encoding="utf-8-sig", newline="") as handle:
+        writer = csv.writer(handle)
+        if header:
+            writer.writerow(HEADER)
+        for event, details in rows:
+            writer.writerow(
+                [
+                    "2026-08-01T09:00:00",
+                    "worker",
+                    event,
+                    json.dumps(details, ensure_ascii=False),
+                ]
+            )
+
+
+def test_sync_file_indexes_durable_keys_and_follows_appended_rows(tmp_path):
+    log_path = tmp_path / "포장실작업이벤트로그_PC01_20260801.csv"
+    _append_rows(
+        log_path,
+        [
+            ("TRAY_COMPLETE", {"set_id": "SET-1", "note": "줄\n바꿈"}),
+            ("PHS_REPLACEMENT_WAITING_MARKED", {"intent_id": "WAIT-1"}),
+        ],
+        header=True,
+    )
+    index = LabelMatchEventIndex(tmp_path / EVENT_INDEX_FILENAME)
+
+    assert index.sync_file(log_path) == 2
+    assert index.sync_file(log_path) == 0
+    assert index.event_exists("set_id", "SET-1", event="TRAY_COMPLETE")
+    assert index.event_exists(
+        "dedupe_key", "WAIT-1", event="PHS_REPLACEMENT_WAITING_MARKED"
+    )
+    assert not index.event_exists("set_id", "SET-2", event="TRAY_COMPLETE")
+
+    _append_rows(
+        log_path,
+        [("POST_REVIEW_REQUIRED", {"case_id": "CASE-1", "set_id": "SET-1"})],
+    )
+    assert index.sync_file(log_path) == 1
+    assert index.event_exists(
+        "review_event_id", "CASE-1", event="POST_REVIEW_REQUIRED"
+    )
+    [row] = index.find_events("set_id", "SET-1", event="TRAY_COMPLETE")
+    fields = read_csv_record(log_path, row["byte_offset"], row["byte_length"])
+    assert json.loads(fields[3])["note"] == "줄\n바꿈"
+    index.close()
+
+
+def test_sync_file_leaves_an_unterminated_tail_for_the_next_sync(tmp_path):
+    log_path = tmp_path / "포장실작업이벤트로그_PC01_20260801.csv"
+    _append_rows(log_path, [("TRAY_COMPLETE", {"set_id": "SET-1"})], header=True)
+    with log_path.open("ab") as handle:
+        handle.write(b'2026-08-01T09:01:00,worker,TRAY_COMPLETE,"{""set_id"": ""SET-2')
+    index = LabelMatchEventIndex(tmp_path / EVENT_INDEX_FILENAME)
+
+    assert index.sync_file(log_path) == 1
+    assert not index.event_exists("set_id", "SET-2", event="TRAY_COMPLETE")
+
+    with log_path.open("ab") as handle:
+        handle.write(b'""}"\r\n')
+    assert index.sync_file(log_path) == 1
+    assert index.event_exists("set_id", "SET-2", event="TRAY_COMPLETE")
+
+
+def test_sync_file_reindexes_a_replaced_log(tmp_path):
+    log_path = tmp_path / "포장실작업이벤트로그_PC01_20260801.csv"
+    _append_rows(log_path, [("TRAY_COMPLETE", {"set_id": "OLD-SET"})], header=True)
+    index = LabelMatchEventIndex(tmp_path / EVENT_INDEX_FILENAME)
+    index.sync_file(log_path)
+
+    log_path.unlink()
+    _append_rows(log_path, [("TRAY_COMPLETE", {"set_id": "NEW-SET"})], header=True)
+    index.sync_file(log_path)
+
+    assert not index.event_exists("set_id", "OLD-SET", event="TRAY_COMPLETE")
+    assert index.event_exists("set_id", "NEW-SET", event="TRAY_COMPLETE")
+
+
+def test_event_index_keys_match_the_recovery_reader_fallbacks():
+    assert event_index_keys(
+        "POST_REVIEW_REQUIRED", {"dedupe_key": "REVIEW-1"}
+    )["review_event_id"] == "REVIEW-1"
+    assert event_index_keys(
+        "TRAY_COMPLETION_CANCELLED", {"cancelled_set_id": " SET-9 "}
+    )["cancelled_set_id"] == "SET-9"
+
+
+def test_iter_csv_records_skips_the_utf8_bom(tmp_path):
+    log_path = tmp_path / "events.csv"
+    _append_rows(log_path, [("APP_START", {})], header=True)
+
+    with log_path.open("rb") as handle:
+        records = list(iter_csv_records(handle))
+
+    assert records[0][0] == 3
+    assert records[0][2] == HEADER
+
+
+def test_find_events_rejects_unknown_key_columns(tmp_path):
+    index = LabelMatchEventIndex(tmp_path / EVENT_INDEX_FILENAME)
+
+    with pytest.raises(EventIndexError):
+        index.find_events("details", "x")
+
+
+def test_ensure_directory_synced_catches_up_once_until_marked_stale(tmp_path):
+    first = tmp_path / "포장실작업이벤트로그_PC01_20260801.csv"
+    other_pc = tmp_path / "포장실작업이벤트로그_PC02_20260801.csv"
+    _append_rows(first, [("TRAY_COMPLETE", {"set_id": "SET-1"})], header=True)
+    _append_rows(other_pc, [("TRAY_COMPLETE", {"set_id": "SET-X"})], header=True)
+    index = LabelMatchEventIndex(tmp_path / EVENT_INDEX_FILENAME)
+    prefix = "포장실작업이벤트로그_PC01_"
+
+    index.ensure_directory_synced(tmp_path, prefix)
+    _append_rows(first, [("TRAY_COMPLETE", {"set_id": "SET-2"})])
+    index.ensure_directory_synced(tmp_path, prefix)
+
+    assert index.event_exists("set_id", "SET-1", event="TRAY_COMPLETE")
+    assert not index.event_exists("set_id", "SET-2", event="TRAY_COMPLETE")
+    assert not index.event_exists("set_id", "SET-X", event="TRAY_COMPLETE")
+
+    index.mark_stale()
+    index.ensure_directory_synced(tmp_path, prefix)
+    assert index.event_exists("set_id", "SET-2", event="TRAY_COMPLETE")
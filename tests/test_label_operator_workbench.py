@@ -512,6 +512,69 @@ def test_renderer_populates_actual_accepted_qa_rows_and_keeps_f4_rows_separate(o
     assert app.exact_rescan_frame.winfo_ismapped() is True
 
 
+def test_unchanged_render_skips_scan_list_rebuild_but_reapplies_gates(
+    operator_workbench,
+):
+    app = operator_workbench
+    app.current_set_info.update({"raw": ["ITEM-A"], "parsed": ["ITEM-A"]})
+    app._render_operator_workbench()
+    inserted = []
+    original_insert = app.qa_scan_tree.insert
+    app.qa_scan_tree.insert = lambda *args, **kwargs: inserted.append(kwargs.get("iid")) or original_insert(*args, **kwargs)
+    counters = dict(app.operator_render_counters)
+
+    app.entry.configure(state="disabled")
+    app._render_operator_workbench()
+
+    assert inserted == []
+    assert app.entry.cget("state") == "normal"
+    assert app.operator_render_counters["skipped"] == counters["skipped"] + 1
+
+    app.current_set_info.update({"raw": ["ITEM-A", "P-1"], "parsed": ["ITEM-A", "ITEM-A"]})
+    app._render_operator_workbench()
+
+    assert inserted
+    assert app.operator_render_counters["performed"] == counters["performed"] + 1
+
+
+def test_render_restores_headline_and_progress_written_by_a_lookup_notice(
+    operator_workbench,
+):
+    app = operator_workbench
+    app.current_set_info.update({"raw": ["ITEM-A"], "parsed": ["ITEM-A"]})
+    app._render_operator_workbench()
+    headline = app.big_display_label.cget("text")
+    progress = app.progress_bar["value"]
+
+    app.update_big_display("PHS2 이적·봉인 정보 확인 중", "primary")
+    app.progress_bar["value"] = 0
+    app._render_operator_workbench()
+
+    assert app.big_display_label.cget("text") == headline
+    assert app.progress_bar["value"] == progress
+
+
+def test_render_requests_coalesce_into_one_idle_pass(operator_workbench):
+    app = operator_workbench
+    idle = []
+    app.after_idle = lambda callback: idle.append(callback) or f"idle-{len(idle)}"
+    app.after_cancel = lambda _after_id: None
+    rendered = []
+    original_render = app._render_operator_workbench
+    app._render_operator_workbench = lambda: rendered.append(True) or original_render()
+
+    app._request_operator_workbench_render()
+    app._request_operator_workbench_render()
+    app._request_operator_workbench_render()
+
+    assert len(idle) == 1
+    assert app.operator_render_counters["coalesced"] == 2
+    idle.pop()()
+    assert rendered == [True]
+    app._request_operator_workbench_render()
+    assert len(idle) == 1
+
+
 def test_live_qa_list_exposes_readonly_wrapped_selected_raw_detail(operator_workbench):
     app = operator_workbench
     detail_frame = _required_widget(app, "qa_scan_detail_frame")
@@ -823,6 +886,47 @@ def test_tree_cell_fit_uses_realized_sibling_instead_of_hidden_page_width(
     assert fitted != stale
 
 
+def test_tree_cell_fit_reuses_measurements_until_the_scale_changes(monkeypatch):
+    measured = []
+
+    class CountingFont:
+        @staticmethod
+        def measure(value):
+            measured.append(str(value))
+            return len(str(value)) * 8
+
+    class FixedStyle:
+        @staticmethod
+        def lookup(_style_name, option):
+            return ("Consolas", 12)
+
+    monkeypatch.setattr(
+        label_match_module.tkFont,
+        "Font",
+        lambda *args, **kwargs: CountingFont(),
+    )
+    app = Label_Match.__new__(Label_Match)
+    app.style = FixedStyle()
+    app.scale_factor = 1.2
+    tree = FakeWidget(
+        kind="ttk.Treeview",
+        columns=("Stage", "Value"),
+        style="Operator.Treeview",
+    )
+    tree.column("Stage", width=120, stretch=False)
+    tree.column("Value", width=200, stretch=False)
+    value = "V" * 80
+
+    first = app._fit_operator_tree_cell_text(tree, "Value", value)
+    first_count = len(measured)
+    assert app._fit_operator_tree_cell_text(tree, "Value", value) == first
+    assert len(measured) == first_count
+
+    app.scale_factor = 1.3
+    assert app._fit_operator_tree_cell_text(tree, "Value", value) == first
+    assert len(measured) == 2 * first_count
+
+
 def test_tree_cell_fit_prefers_mapped_sibling_when_hidden_width_is_closer(
     monkeypatch,
 ):
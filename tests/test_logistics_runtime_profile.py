@@ -29,14 +29,14 @@ def test_gui_startup_builds_client_without_network_readiness_probe(monkeypatch):
     calls = []
     sentinel = object()
 
-    def fake_factory(*, probe_required=True):
-        calls.append(probe_required)
+    def fake_factory(*, probe_required=True, transport=None):
+        calls.append((probe_required, type(transport).__name__))
         return sentinel
 
     monkeypatch.setattr(label_module, "package_client_from_env", fake_factory)
 
     assert label_module.label_match_startup_package_client() is sentinel
-    assert calls == [False]
+    assert calls == [(False, "PooledHttpsTransport")]
 
 
 def test_production_test_commands_require_explicit_automation_switch(monkeypatch):
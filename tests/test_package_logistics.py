@@ -3,9 +3,11 @@ from __future__ import annotations
 import base64
 import copy
 import csv
+import http.client
 import io
 import json
 from pathlib import Path
+import socket
 import sqlite3
 import subprocess
 import sys
@@ -2463,6 +2465,82 @@ def test_legacy_exact_rescan_resolver_uses_package_source_lineage_role():
     assert command["payload"]["barcode_membership_hash"] == barcode_membership_hash(BARCODES)
 
 
+def test_scan_time_source_resolution_is_reused_only_while_versions_match():
+    calls = []
+    bundle_version = [7]
+
+    def transport(method, url, headers, body, timeout):
+        calls.append((method, urlsplit(url).path))
+        if "/bundles/resolve?" in url:
+            return {"ok": True, "data": _resolved_projection()}
+        if method == "POST":
+            return {"ok": True, "data": {}}
+        return {"ok": True, "data": {**_projection(), "entity_version": bundle_version[0]}}
+
+    client = PackageLogisticsClient(
+        PackageClientConfig("https://logistics.test", "token", SCOPE, "host", "device"),
+        transport=transport,
+    )
+
+    def draft(set_id):
+        return PackageCommandDraft.build(
+            set_id=set_id,
+            item_code="ITEM000000001",
+            source_input_tag_id="ITG-PREFETCH",
+            external_label="FINAL-LABEL",
+            membership_mode="INHERIT_ALL",
+            sample_barcodes=BARCODES[:3],
+        )
+
+    def prefetch(set_id):
+        client.prefetch_source_resolution(
+            set_id=set_id, item_id="ITEM000000001", input_tag_id="ITG-PREFETCH"
+        )
+
+    prefetch("SET-REUSED")
+    source_id, command = client.build_create_package_command(
+        draft("SET-REUSED"), idempotency_key="reused"
+    )
+    assert source_id == TRANSFER
+    assert command["expected_versions"] == {f"bundle:{TRANSFER}": 7}
+    assert [path for _method, path in calls] == [
+        "/logistics/api/v1/bundles/resolve",
+        f"/logistics/api/v1/bundles/{SCOPE}/{TRANSFER}",
+    ]
+
+    calls.clear()
+    prefetch("SET-STALE")
+    bundle_version[0] = 8
+    _source_id, command = client.build_create_package_command(
+        draft("SET-STALE"), idempotency_key="stale"
+    )
+    assert command["expected_versions"] == {f"bundle:{TRANSFER}": 8}
+    # The prefetch was served by the resolver TTL cache; the stale hint then
+    # costs one versioned read before the fresh resolve and final read.
+    assert [path.rsplit("/", 1)[-1] for _method, path in calls] == [
+        TRANSFER,
+        "resolve",
+        TRANSFER,
+    ]
+
+    calls.clear()
+    prefetch("SET-CANCELLED")
+    client.cancel_package(
+        {
+            "idempotency_key": "cancel-1",
+            "authority_scope_id": SCOPE,
+            "expected_versions": {f"bundle:{TRANSFER}": 7},
+        }
+    )
+    client.build_create_package_command(
+        draft("SET-CANCELLED"), idempotency_key="cancelled"
+    )
+    assert [method for method, _path in calls] == ["POST", "GET", "GET"]
+    stats = client.source_resolutions.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"], stats["invalidations"]) == (2, 1, 1, 1)
+    assert stats["entries"] == 0
+
+
 def test_default_transport_preserves_explicit_client_identity(monkeypatch):
     captured = {}
 
@@ -2493,6 +2571,179 @@ def test_default_transport_preserves_explicit_client_identity(monkeypatch):
     assert captured["timeout"] == 8.0
 
 
+def test_pooled_transport_reuses_connections_and_keeps_error_mapping(monkeypatch):
+    opened = []
+
+    class Response:
+        def __init__(self, status, payload, headers=None):
+            self.status = status
+            self.headers = headers or {}
+            self.payload = payload
+            self.will_close = False
+
+        def read(self):
+            return json.dumps(self.payload).encode("utf-8")
+
+    class Connection:
+        def __init__(self, host, port, *, timeout, context):
+            self.sock = None
+            self.timeout = timeout
+            self.closed = False
+            self.server_closed = False
+            self.targets = []
+            opened.append(self)
+
+        def request(self, method, target, *, body, headers):
+            assert headers["User-Agent"] == package_module.PACKAGE_HTTP_USER_AGENT
+            self.targets.append(target)
+
+        def getresponse(self):
+            if self.server_closed:
+                raise ConnectionResetError("keep-alive closed by server")
+            if self.targets[-1] == "/limited":
+                return Response(429, {"ok": False, "error": {"code": "PACKAGE_RATE_LIMITED"}}, {"Retry-After": "7"})
+            return Response(200, {"ok": True, "data": {"target": self.targets[-1]}})
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(package_module, "HTTPSConnection", Connection)
+    transport = package_module.PooledHttpsTransport()
+    headers = {"User-Agent": package_module.PACKAGE_HTTP_USER_AGENT}
+
+    assert transport("GET", "https://logistics.test/a?x=1", headers, None, 8.0) == {"ok": True, "data": {"target": "/a?x=1"}}
+    assert transport("POST", "https://logistics.test/b", headers, b"{}", 8.0)["data"]["target"] == "/b"
+    with pytest.raises(PackageApiError) as raised:
+        transport("GET", "https://logistics.test/limited", headers, None, 8.0)
+    assert (raised.value.status_code, raised.value.code, raised.value.retry_after_seconds) == (429, "PACKAGE_RATE_LIMITED", 7.0)
+    assert len(opened) == 1
+
+    opened[0].server_closed = True
+    assert transport("GET", "https://logistics.test/c", headers, None, 8.0)["data"]["target"] == "/c"
+    assert len(opened) == 2 and opened[0].closed
+    opened[1].server_closed = True
+    with pytest.raises(PackageTransportError, match="ConnectionResetError"):
+        transport("POST", "https://logistics.test/d", headers, b"{}", 8.0)
+
+    stats = transport.stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 2
+    assert stats["connections_reused"] == 4
+    assert stats["transport_errors"] == 1
+    assert sum(stats["latency_histogram"].values()) == 5
+
+
+def test_pooled_transport_replays_idempotent_post_after_server_closed_connection(monkeypatch):
+    opened = []
+    peers = []
+
+    class Response:
+        status = 200
+        headers = {}
+        will_close = False
+
+        def read(self):
+            return b'{"ok": true, "data": {}}'
+
+    class Connection:
+        def __init__(self, host, port, *, timeout, context):
+            self.sock, peer = socket.socketpair()
+            peers.append(peer)
+            self.timeout = timeout
+            self.server_closed = False
+            self.requests = []
+            opened.append(self)
+
+        def request(self, method, target, *, body, headers):
+            self.requests.append((method, target))
+
+        def getresponse(self):
+            if self.server_closed:
+                raise http.client.RemoteDisconnected("Remote end closed connection without response")
+            return Response()
+
+        def close(self):
+            self.sock.close()
+
+    monkeypatch.setattr(package_module, "HTTPSConnection", Connection)
+    transport = package_module.PooledHttpsTransport()
+    keyed = {"Idempotency-Key": "create-1"}
+    try:
+        transport("POST", "https://logistics.test/packages", keyed, b"{}", 8.0)
+
+        # The server closed the idle connection: the EOF is seen before reuse.
+        peers[0].close()
+        transport("POST", "https://logistics.test/packages", keyed, b"{}", 8.0)
+        assert len(opened) == 2 and opened[1].requests == [("POST", "/packages")]
+
+        # The close raced the request: a keyed POST is replayed once.
+        opened[1].server_closed = True
+        transport("POST", "https://logistics.test/packages", keyed, b"{}", 8.0)
+        assert len(opened) == 3 and opened[2].requests == [("POST", "/packages")]
+
+        opened[2].server_closed = True
+        with pytest.raises(PackageTransportError, match="RemoteDisconnected"):
+            transport("POST", "https://logistics.test/packages", {}, b"{}", 8.0)
+        assert len(opened) == 3
+    finally:
+        transport.close()
+        for peer in peers:
+            peer.close()
+
+
+def test_resolver_cache_reuses_reads_until_ttl_or_version_bump(monkeypatch):
+    calls = []
+    clock = [1000.0]
+    monkeypatch.setattr(package_module.time, "monotonic", lambda: clock[0])
+
+    def transport(method, url, headers, body, timeout):
+        calls.append((method, urlsplit(url).path))
+        if method == "POST":
+            return {"ok": True, "data": {"entity_versions": {f"bundle:{TRANSFER}": 2}}}
+        if url.endswith("/capabilities"):
+            return {"ok": True, "data": {"capability_ids": []}}
+        return {"ok": True, "data": {"bundle": {"bundle_id": TRANSFER}}}
+
+    client = PackageLogisticsClient(
+        PackageClientConfig("https://logistics.test", "token", SCOPE, "host", "device"),
+        transport=transport,
+    )
+
+    def resolve(**overrides):
+        return client.resolve_transfer_bundle(
+            external_label="",
+            input_tag_id="ITG-CACHE",
+            item_id="ITEM000000001",
+            authority_scope_id=SCOPE,
+            **overrides,
+        )
+
+    resolve()["bundle"]["bundle_id"] = "MUTATED-BY-CALLER"
+    assert resolve()["bundle"]["bundle_id"] == TRANSFER
+    client.get_capabilities()
+    client.get_capabilities()
+    assert resolve(use_cache=False)["bundle"]["bundle_id"] == TRANSFER
+    assert len(calls) == 3
+
+    clock[0] += package_module.PACKAGE_RESOLVER_CACHE_TTL_SECONDS + 1
+    resolve()
+    assert len(calls) == 4
+
+    client.cancel_package(
+        {"idempotency_key": "cancel-1", "authority_scope_id": SCOPE}
+    )
+    resolve()
+    client.get_capabilities()
+    assert [method for method, _path in calls[4:]] == ["POST", "GET"]
+    assert client.resolver_cache_stats() == {
+        "hits": 3,
+        "misses": 4,
+        "bypasses": 1,
+        "invalidations": 2,
+        "entries": 2,
+    }
+
+
 def test_minimal_itg_only_identity_resolves_without_raw_external_label():
     def transport(method, url, headers, body, timeout):
         if "/bundles/resolve?" in url:
@@ -2869,6 +3120,84 @@ def test_offline_retry_fairness_survives_limit_and_restart_without_starvation(
     assert set(keys).issubset(client.attempted_keys)
 
 
+def test_outbox_scheduler_drains_due_rows_sleeps_until_retry_and_backs_off(
+    tmp_path, monkeypatch
+):
+    outbox = PackageOutbox(tmp_path / "scheduler.sqlite3")
+    keys = []
+    for index in range(2):
+        row = outbox.enqueue(_draft_for_set(f"SET-SCHEDULED-{index}"))
+        outbox.mark_local_completion_committed(row["idempotency_key"])
+        keys.append(row["idempotency_key"])
+    waiting = outbox.enqueue(_draft_for_set("SET-NOT-COMMITTED"))
+
+    metrics = outbox.queue_metrics()
+    assert (metrics["depth"], metrics["due_count"], metrics["next_retry_at"]) == (2, 2, "")
+    assert metrics["oldest_age_seconds"] >= 0
+    assert waiting["idempotency_key"] not in keys
+
+    scheduler = package_module.PackageOutboxScheduler()
+    assert scheduler.next_delay_seconds({"create_package": metrics}) == pytest.approx(
+        package_module.PACKAGE_OUTBOX_BUSY_POLL_SECONDS
+    )
+
+    for key in keys:
+        assert outbox.claim_next()["idempotency_key"] == key
+        outbox.mark_retry(
+            key,
+            PackageApiError(429, "PACKAGE_RATE_LIMITED", "slow down", retry_after_seconds=12),
+        )
+    metrics = outbox.queue_metrics()
+    assert metrics["due_count"] == 0
+    assert 0 < metrics["next_retry_in_seconds"] <= 12
+    delay = scheduler.next_delay_seconds(
+        {"create_package": metrics}, drained={"acked": 0, "retry": 0, "conflict": 0}
+    )
+    assert delay == pytest.approx(metrics["next_retry_in_seconds"], abs=0.5)
+    assert scheduler.last_metrics["depth"] == 2
+
+    monkeypatch.setattr(package_module.random, "uniform", lambda low, high: high)
+    due = {"create_package": {"depth": 1, "due_count": 1}}
+    offline = {"acked": 0, "retry": 1, "conflict": 0}
+    delays = [scheduler.next_delay_seconds(due, drained=offline) for _ in range(3)]
+    assert delays == [1.0, 2.0, 4.0]
+    assert scheduler.consecutive_failures == 3
+    assert scheduler.next_delay_seconds(
+        due, drained={"acked": 1, "retry": 0, "conflict": 0}
+    ) == pytest.approx(package_module.PACKAGE_OUTBOX_BUSY_POLL_SECONDS)
+    assert scheduler.consecutive_failures == 0
+    assert scheduler.next_delay_seconds({}) == package_module.PACKAGE_OUTBOX_IDLE_POLL_SECONDS
+
+
+def test_outbox_scheduler_backs_off_when_only_deferred_cancellations_stand(
+    tmp_path, monkeypatch
+):
+    draft = _draft()
+    db_path = tmp_path / "scheduler-deferred.sqlite3"
+    package_outbox = PackageOutbox(db_path)
+    package_row = package_outbox.enqueue(draft)
+    package_outbox.mark_local_completion_committed(package_row["idempotency_key"])
+    cancellation_outbox = PackageCancellationOutbox(db_path)
+    intent = _cancellation_intent(draft)
+    assert cancellation_outbox.enqueue(intent)["status"] == "DEFERRED"
+    cancellation_outbox.mark_local_event_committed(intent.cancellation_event_id)
+
+    drained = PackageCancellationOutboxProcessor(cancellation_outbox, object()).drain()
+    assert drained == {"acked": 0, "retry": 0, "conflict": 0, "deferred": 1}
+    # A due row claim_next cannot return (e.g. no matching CREATE row).
+    metrics = {**cancellation_outbox.queue_metrics(), "due_count": 1}
+    assert metrics["deferred_count"] == 1
+
+    monkeypatch.setattr(package_module.random, "uniform", lambda low, high: high)
+    scheduler = package_module.PackageOutboxScheduler()
+    delays = [
+        scheduler.next_delay_seconds({"cancel_package": metrics}, drained=drained)
+        for _ in range(2)
+    ]
+    assert delays == [1.0, 2.0]
+    assert scheduler.consecutive_failures == 2
+
+
 def test_duplicate_replay_reuses_one_key_and_yields_one_central_effect(tmp_path):
     draft = _draft_for_set("SET-DUPLICATE-REPLAY")
     outbox = PackageOutbox(tmp_path / "duplicate-replay.sqlite3")
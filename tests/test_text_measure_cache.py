@@ -0,0 +1,54 @@
+from ui.text_measure_cache import TextMeasureCache, font_cache_key
+
+
+def test_width_is_measured_once_per_font_and_text():
+    cache = TextMeasureCache()
+    calls = []
+
+    def measure(text):
+        calls.append(text)
+        return len(text) * 7
+
+    assert cache.width(("Malgun Gothic", 14, "bold"), "PHS2", measure) == 28
+    assert cache.width(("Malgun Gothic", 14, "bold"), "PHS2", measure) == 28
+    assert cache.width(("Malgun Gothic", 15, "bold"), "PHS2", measure) == 28
+
+    assert calls == ["PHS2", "PHS2"]
+    assert cache.hits == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TextMeasureCache(max_entries=2)
+    calls = []
+
+    def measure(text):
+        calls.append(text)
+        return len(text)
+
+    cache.width("TkDefaultFont", "a", measure)
+    cache.width("TkDefaultFont", "bb", measure)
+    cache.width("TkDefaultFont", "a", measure)
+    cache.width("TkDefaultFont", "ccc", measure)
+    cache.width("TkDefaultFont", "a", measure)
+    cache.width("TkDefaultFont", "bb", measure)
+
+    assert calls == ["a", "bb", "ccc", "bb"]
+
+
+def test_scope_change_drops_widths_fitted_text_and_font_handles():
+    cache = TextMeasureCache()
+    cache.ensure_scope(("standard", 1.2, 14))
+    cache.width("font", "text", len)
+    cache.fitted("font", 100, "text", lambda: "te...xt")
+    cache.handle("font", object)
+
+    cache.ensure_scope(("standard", 1.2, 14))
+    assert len(cache) == 2
+    cache.ensure_scope(("compact", 1.2, 14))
+
+    assert len(cache) == 0
+    assert cache.handles == {}
+
+
+def test_font_cache_key_accepts_list_font_specs():
+    assert font_cache_key(["Consolas", 12, ["bold"]]) == ("Consolas", 12, ("bold",))
@@ -827,6 +827,14 @@ def _backpressure_config(args: argparse.Namespace) -> dict:
     }
 
 
+def _relay_drain_config(args: argparse.Namespace) -> dict:
+    return {
+        "max_batches": max(1, int(getattr(args, "max_batches", 50) or 1)),
+        "max_drain_seconds": max(0, int(getattr(args, "max_drain_seconds", 40) or 0)),
+        "max_concurrent_uploads": max(1, int(getattr(args, "max_concurrent_uploads", 2) or 1)),
+    }
+
+
 def build_install_plan(args: argparse.Namespace, run_preflight: bool = False) -> dict:
     app_root = Path(args.app_root).resolve()
     python_exe = str(Path(args.python_exe).resolve())
@@ -842,6 +850,7 @@ def build_install_plan(args: argparse.Namespace, run_preflight: bool = False) ->
     runtime_path_boundary = _runtime_path_boundary_report(args.program_data_root, paths)
     source_scan = _source_scan_config(args)
     backpressure = _backpressure_config(args)
+    relay_drain = _relay_drain_config(args)
     task_runtime_acl = _task_runtime_acl_plan(args)
     app_runtime_acl = _app_runtime_acl_plan(args)
     local_test_task_environment = _local_test_task_environment(args)
@@ -878,6 +887,12 @@ def build_install_plan(args: argparse.Namespace, run_preflight: bool = False) ->
         str(backpressure["max_active_queue_count"]),
         "--max-active-queue-age-seconds",
         str(backpressure["max_active_queue_age_seconds"]),
+        "--max-batches",
+        str(relay_drain["max_batches"]),
+        "--max-drain-seconds",
+        str(relay_drain["max_drain_seconds"]),
+        "--max-concurrent-uploads",
+        str(relay_drain["max_concurrent_uploads"]),
     ])
     _append_source_scan_args(runner_parts, source_scan)
     task_wrapper = _task_wrapper_path(args.program_data_root, args.task_name)
@@ -926,6 +941,7 @@ def build_install_plan(args: argparse.Namespace, run_preflight: bool = False) ->
         "source_scan": source_scan,
         "source_scan_baseline_command": _source_scan_baseline_command(runner_parts, source_scan),
         "backpressure": backpressure,
+        "relay_drain": relay_drain,
         "runner_script": str(runner_script),
         "runner_exe": str(runner_exe) if runner_exe is not None else "",
         "runner_command": runner_parts,
@@ -1153,6 +1169,10 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--min-source-file-age-seconds", type=int, default=60)
     parser.add_argument("--max-active-queue-count", type=int, default=1000)
     parser.add_argument("--max-active-queue-age-seconds", type=int, default=24 * 60 * 60)
+    # Each scheduled run catches up queued backlog within the task interval.
+    parser.add_argument("--max-batches", type=int, default=50)
+    parser.add_argument("--max-drain-seconds", type=int, default=40)
+    parser.add_argument("--max-concurrent-uploads", type=int, default=2)
     parser.add_argument("--report-path", required=True)
     parser.add_argument("--apply", action="store_true")
     parser.add_argument("--uninstall", action="store_true")
@@ -1,28 +1,68 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-"""Run one Label_Match direct-sync relay cycle."""
+"""Run one Label_Match direct-sync relay cycle.
+
+With ``--serve`` the runner stays resident and runs one cycle per JSON-line
+request read from stdin, answering each with a JSON line on stdout.  Label_Match
+keeps one such helper per session so a tray completion does not pay interpreter
+start-up and imports again.  While the relay queue still holds pending or
+retry-wait batches the helper keeps draining it between requests.
+"""
 
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import functools
 import hashlib
+import io
 import json
+import os
+import queue
 import sqlite3
 import sys
+import threading
 import time
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from direct_sync_runtime import DirectSyncRuntimeConfig, enqueue_completed_source_file, run_relay_once, utc_now_text  # noqa: E402
+try:  # Optional: native change notifications for --watch-source-dir on Windows.
+    import win32con
+    import win32file
+except ImportError:  # pragma: no cover - exercised only without pywin32
+    win32con = None
+    win32file = None
+
+from direct_sync_push import RelayQueue, SourceByteRange  # noqa: E402
+from direct_sync_runtime import (  # noqa: E402
+    DEFAULT_RELAY_IDLE_REUSE_SECONDS,
+    DEFAULT_RELAY_POOL_MAXSIZE,
+    DRAIN_CONTINUE_STATUSES,
+    DirectSyncRuntimeConfig,
+    RelayHttpSession,
+    enqueue_completed_source_file,
+    run_relay_drain,
+    run_relay_once,
+    run_relay_retention,
+    utc_now_text,
+)
 
 
 ALLOWED_SOURCE_PREFIX = "포장실작업이벤트로그_"
 ALLOWED_SOURCE_SUFFIX = ".csv"
 DELTA_PROGRESS_STATUSES = {"pending", "leased", "retry_wait", "acked"}
 SQLITE_BUSY_TIMEOUT_MS = 30000
+DELTA_TAIL_BLOCK_BYTES = 64 * 1024
+PREFIX_CHECKPOINT_BLOCK_BYTES = 1024 * 1024
+SERVE_FLAG = "--serve"
+SERVE_IDLE_DRAIN_SECONDS = 30.0
+SERVE_BACKLOG_STATUSES = ("pending", "retry_wait")
+RETENTION_IDLE_STATUSES = {"idle", "blocked_disk_pressure"}
+WATCH_NOTIFY_BUFFER_BYTES = 64 * 1024
 
 
 def _validate_source_glob(pattern: str) -> str:
@@ -75,6 +115,46 @@ def _file_prefix_sha256(path: Path, byte_count: int) -> str:
     return digest.hexdigest()
 
 
+def _prefix_block_digests(
+    path: Path,
+    byte_count: int,
+    reuse: list[str] | tuple[str, ...] = (),
+    reuse_byte_count: int = 0,
+) -> list[str]:
+    """SHA-256 of each checkpoint block in the first ``byte_count`` bytes.
+
+    Full blocks below ``reuse_byte_count`` are taken from ``reuse`` instead of
+    being read again, so extending a checkpoint only hashes its tail.
+    """
+    block_size = PREFIX_CHECKPOINT_BLOCK_BYTES
+    byte_count = max(0, int(byte_count))
+    digests = list(reuse[: min(int(reuse_byte_count), byte_count) // block_size])
+    offset = len(digests) * block_size
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        while offset < byte_count:
+            chunk = handle.read(min(block_size, byte_count - offset))
+            if not chunk:
+                break
+            digests.append(hashlib.sha256(chunk).hexdigest())
+            offset += len(chunk)
+    return digests
+
+
+def _prefix_checkpoint_sha256(block_digests: list[str]) -> str:
+    return hashlib.sha256("".join(block_digests).encode("ascii")).hexdigest()
+
+
+def _source_file_id(stat_result: os.stat_result) -> str:
+    # st_ino is the NTFS file index on Windows; 0 means the filesystem has none.
+    # The birth time, where the platform reports one, guards against index reuse.
+    if not stat_result.st_ino:
+        return ""
+    file_id = f"{stat_result.st_dev}:{stat_result.st_ino}"
+    birthtime_ns = getattr(stat_result, "st_birthtime_ns", None)
+    return f"{file_id}:{birthtime_ns}" if birthtime_ns else file_id
+
+
 def _scan_state_connect(db_path: str | Path) -> sqlite3.Connection:
     target = Path(db_path)
     target.parent.mkdir(parents=True, exist_ok=True)
@@ -98,20 +178,83 @@ def _scan_state_connect(db_path: str | Path) -> sqlite3.Connection:
     }
     if "sent_prefix_sha256" not in columns:
         conn.execute("ALTER TABLE direct_sync_source_scan_state ADD COLUMN sent_prefix_sha256 TEXT NOT NULL DEFAULT ''")
+    for column, definition in (
+        ("sent_block_digests", "TEXT NOT NULL DEFAULT ''"),
+        ("source_size", "INTEGER NOT NULL DEFAULT 0"),
+        ("source_mtime_ns", "INTEGER NOT NULL DEFAULT 0"),
+        ("source_file_id", "TEXT NOT NULL DEFAULT ''"),
+    ):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE direct_sync_source_scan_state ADD COLUMN {column} {definition}")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS direct_sync_source_catalog (
+            source_file_path TEXT PRIMARY KEY,
+            source_size INTEGER NOT NULL,
+            source_mtime_ns INTEGER NOT NULL,
+            updated_at_unix REAL NOT NULL
+        )
+        """
+    )
     conn.commit()
     return conn
 
 
-def _read_source_scan_state(db_path: str | Path, source_file: Path) -> tuple[int, str]:
+def _read_source_checkpoint(conn: sqlite3.Connection, source_file: Path) -> dict | None:
+    row = conn.execute(
+        "SELECT * FROM direct_sync_source_scan_state WHERE source_file_path = ?",
+        (_source_state_key(source_file),),
+    ).fetchone()
+    if row is None:
+        return None
+    try:
+        block_digests = json.loads(str(row["sent_block_digests"] or "[]"))
+    except ValueError:
+        block_digests = []
+    return {
+        "sent_byte_count": int(row["sent_byte_count"]),
+        "sent_prefix_sha256": str(row["sent_prefix_sha256"] or ""),
+        "block_digests": [str(digest) for digest in block_digests] if isinstance(block_digests, list) else [],
+        "source_size": int(row["source_size"] or 0),
+        "source_mtime_ns": int(row["source_mtime_ns"] or 0),
+        "source_file_id": str(row["source_file_id"] or ""),
+    }
+
+
+def _source_checkpoint_intact(source_file: Path, checkpoint: dict, stat_result: os.stat_result) -> bool:
+    """Return whether the checkpointed prefix of ``source_file`` is unchanged.
+
+    The same file grown in place only re-hashes the last checkpoint block; a
+    replaced or truncated file (or a legacy whole-prefix hash) is checked in full.
+    """
+    sent_byte_count = checkpoint["sent_byte_count"]
+    if not checkpoint["sent_prefix_sha256"] or stat_result.st_size < sent_byte_count:
+        return False
+    block_digests = checkpoint["block_digests"]
+    if not block_digests:
+        return _file_prefix_sha256(source_file, sent_byte_count) == checkpoint["sent_prefix_sha256"]
+    if _prefix_checkpoint_sha256(block_digests) != checkpoint["sent_prefix_sha256"]:
+        return False
+    file_id = _source_file_id(stat_result)
+    same_file = bool(file_id) and file_id == checkpoint["source_file_id"] and stat_result.st_size >= checkpoint["source_size"]
+    if not same_file:
+        return _prefix_block_digests(source_file, sent_byte_count) == block_digests
+    if stat_result.st_size == checkpoint["source_size"] and stat_result.st_mtime_ns == checkpoint["source_mtime_ns"]:
+        return True
+    tail_start = (len(block_digests) - 1) * PREFIX_CHECKPOINT_BLOCK_BYTES
+    return _prefix_block_digests(source_file, sent_byte_count, block_digests[:-1], tail_start) == block_digests
+
+
+def _read_source_scan_state(db_path: str | Path, source_file: Path) -> int:
+    """Return how many bytes of ``source_file`` are already sent or queued, verified."""
     conn = _scan_state_connect(db_path)
     try:
-        row = conn.execute(
-            "SELECT sent_byte_count, sent_prefix_sha256 FROM direct_sync_source_scan_state WHERE source_file_path = ?",
-            (_source_state_key(source_file),),
-        ).fetchone()
-        explicit_state = (int(row["sent_byte_count"]), str(row["sent_prefix_sha256"] or "")) if row else (0, "")
-        queued_state = _read_queued_delta_progress(conn, source_file)
-        return queued_state if queued_state[0] > explicit_state[0] else explicit_state
+        checkpoint = _read_source_checkpoint(conn, source_file)
+        sent_byte_count = 0
+        if checkpoint is not None and checkpoint["sent_byte_count"] > 0:
+            if _source_checkpoint_intact(source_file, checkpoint, source_file.stat()):
+                sent_byte_count = checkpoint["sent_byte_count"]
+        return _read_queued_delta_progress(conn, source_file, sent_byte_count)
     finally:
         conn.close()
 
@@ -153,12 +296,13 @@ def _delta_content_sha256_for_range(source_file: Path, start_byte: int, end_byte
     return hashlib.sha256(delta_content).hexdigest()
 
 
-def _read_queued_delta_progress(conn: sqlite3.Connection, source_file: Path) -> tuple[int, str]:
+def _read_queued_delta_progress(conn: sqlite3.Connection, source_file: Path, verified_byte_count: int = 0) -> int:
+    """Extend ``verified_byte_count`` through contiguous queued deltas whose bytes still match."""
     has_relay_table = conn.execute(
         "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'direct_sync_relay_batches'"
     ).fetchone()
     if not has_relay_table:
-        return 0, ""
+        return verified_byte_count
     source_delta_key = _source_delta_key(source_file)
     rows = conn.execute(
         """
@@ -173,24 +317,26 @@ def _read_queued_delta_progress(conn: sqlite3.Connection, source_file: Path) ->
         if status not in DELTA_PROGRESS_STATUSES and not _operator_review_committed(row):
             continue
         source_path = Path(str(row["source_file_path"] or ""))
-        if source_path.parent.name != source_delta_key:
+        # Range enqueues record the source CSV itself; older deltas recorded a
+        # per-source staging file named by the delta key.
+        if source_path.parent.name != source_delta_key and str(source_path) != _source_state_key(source_file):
             continue
         parsed_range = _parse_delta_range(str(row["relative_path"] or ""), source_file)
         if parsed_range is None:
             continue
         start_byte, end_byte = parsed_range
+        if start_byte < verified_byte_count:
+            continue
         delta_hash = _delta_content_sha256_for_range(source_file, start_byte, end_byte)
         if delta_hash and delta_hash == str(row["content_sha256"] or ""):
             matching_ranges[start_byte] = max(matching_ranges.get(start_byte, 0), end_byte)
-    best_end_byte = 0
+    best_end_byte = verified_byte_count
     while best_end_byte in matching_ranges:
         next_end_byte = matching_ranges[best_end_byte]
         if next_end_byte <= best_end_byte:
             break
         best_end_byte = next_end_byte
-    if best_end_byte <= 0:
-        return 0, ""
-    return best_end_byte, _file_prefix_sha256(source_file, best_end_byte)
+    return best_end_byte
 
 
 def _operator_review_committed(row: sqlite3.Row) -> bool:
@@ -215,19 +361,48 @@ def _last_result_advances_source_progress(last_result: dict) -> bool:
 
 
 def _record_source_sent_byte_count(db_path: str | Path, source_file: Path, sent_byte_count: int) -> None:
-    sent_prefix_sha256 = _file_prefix_sha256(source_file, sent_byte_count)
+    sent_byte_count = int(sent_byte_count)
     conn = _scan_state_connect(db_path)
     try:
+        stat_result = source_file.stat()
+        checkpoint = _read_source_checkpoint(conn, source_file)
+        reuse: list[str] = []
+        reuse_byte_count = 0
+        if (
+            checkpoint is not None
+            and checkpoint["block_digests"]
+            and checkpoint["sent_byte_count"] <= sent_byte_count
+            and _source_checkpoint_intact(source_file, checkpoint, stat_result)
+        ):
+            reuse = checkpoint["block_digests"]
+            reuse_byte_count = checkpoint["sent_byte_count"]
+        block_digests = _prefix_block_digests(source_file, sent_byte_count, reuse, reuse_byte_count)
         conn.execute(
             """
-            INSERT INTO direct_sync_source_scan_state (source_file_path, sent_byte_count, sent_prefix_sha256, updated_at_unix)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO direct_sync_source_scan_state (
+                source_file_path, sent_byte_count, sent_prefix_sha256, updated_at_unix,
+                sent_block_digests, source_size, source_mtime_ns, source_file_id
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(source_file_path) DO UPDATE SET
                 sent_byte_count = excluded.sent_byte_count,
                 sent_prefix_sha256 = excluded.sent_prefix_sha256,
-                updated_at_unix = excluded.updated_at_unix
+                updated_at_unix = excluded.updated_at_unix,
+                sent_block_digests = excluded.sent_block_digests,
+                source_size = excluded.source_size,
+                source_mtime_ns = excluded.source_mtime_ns,
+                source_file_id = excluded.source_file_id
             """,
-            (_source_state_key(source_file), int(sent_byte_count), sent_prefix_sha256, time.time()),
+            (
+                _source_state_key(source_file),
+                sent_byte_count,
+                _prefix_checkpoint_sha256(block_digests),
+                time.time(),
+                json.dumps(block_digests),
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+                _source_file_id(stat_result),
+            ),
         )
         conn.commit()
     finally:
@@ -286,15 +461,101 @@ def _complete_line_prefix(data: bytes) -> bytes:
     return data[: last_newline + 1]
 
 
-def _build_delta_source_file(config: DirectSyncRuntimeConfig, source_file: Path) -> tuple[Path, str, int] | None:
+def _complete_delta_end(handle, start_byte: int) -> int | None:
+    """Return the end of the last complete line after ``start_byte``.
+
+    Reads backwards from EOF, normally a single block, and returns None when
+    the complete lines in the range hold nothing but whitespace.
+    """
+    position = os.fstat(handle.fileno()).st_size
+    end_byte = None
+    while position > start_byte:
+        block_start = max(start_byte, position - DELTA_TAIL_BLOCK_BYTES)
+        handle.seek(block_start)
+        block = handle.read(position - block_start)
+        if end_byte is None:
+            last_newline = max(block.rfind(b"\n"), block.rfind(b"\r"))
+            if last_newline >= 0:
+                end_byte = block_start + last_newline + 1
+                block = block[: last_newline + 1]
+        if end_byte is not None and block.strip():
+            return end_byte
+        position = block_start
+    return None
+
+
+def _coalescible_delta_chain(db_path: str | Path, source_file: Path, end_byte: int) -> list[tuple[str, int]]:
+    """Return ``(relay_id, start_byte)`` of never-attempted pending deltas ending contiguously at ``end_byte``.
+
+    Only rows that were never posted are merged: an attempted row may already
+    be committed upstream under its own batch id.  Oldest first.
+    """
+    conn = _scan_state_connect(db_path)
+    try:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'direct_sync_relay_batches'"
+        ).fetchone():
+            return []
+        rows = conn.execute(
+            """
+            SELECT relay_id, relative_path, content_sha256
+            FROM direct_sync_relay_batches
+            WHERE source_file_path = ?
+              AND status = 'pending'
+              AND attempt_count = 0
+              AND relative_path LIKE 'legacy_csv_deltas/%'
+            """,
+            (_source_state_key(source_file),),
+        ).fetchall()
+    finally:
+        conn.close()
+    by_end_byte: dict[int, tuple[str, int]] = {}
+    for row in rows:
+        parsed_range = _parse_delta_range(str(row["relative_path"] or ""), source_file)
+        if parsed_range is None:
+            continue
+        start_byte, range_end_byte = parsed_range
+        if _delta_content_sha256_for_range(source_file, start_byte, range_end_byte) == str(row["content_sha256"] or ""):
+            by_end_byte[range_end_byte] = (str(row["relay_id"]), start_byte)
+    chain: list[tuple[str, int]] = []
+    while end_byte in by_end_byte:
+        relay_id, start_byte = by_end_byte.pop(end_byte)
+        chain.insert(0, (relay_id, start_byte))
+        end_byte = start_byte
+    return chain
+
+
+def _source_has_outstanding_delta(db_path: str | Path, source_file: Path, relay_id: str) -> bool:
+    conn = _scan_state_connect(db_path)
+    try:
+        return conn.execute(
+            """
+            SELECT 1
+            FROM direct_sync_relay_batches
+            WHERE source_file_path = ?
+              AND relay_id != ?
+              AND status IN ('pending', 'leased', 'retry_wait')
+            LIMIT 1
+            """,
+            (_source_state_key(source_file), relay_id),
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def _build_delta_source_range(
+    config: DirectSyncRuntimeConfig,
+    source_file: Path,
+    coalesce_max_bytes: int = 0,
+) -> tuple[SourceByteRange, int, tuple[str, ...]] | None:
+    """Describe the next delta of ``source_file`` and the pending deltas it supersedes.
+
+    With ``coalesce_max_bytes`` the delta is widened backwards over
+    contiguous never-attempted pending deltas, as long as the merged range
+    stays within the cap.
+    """
     source_size = source_file.stat().st_size
-    sent_byte_count, sent_prefix_sha256 = _read_source_scan_state(config.db_path, source_file)
-    if sent_byte_count > 0:
-        replaced_or_truncated = not sent_prefix_sha256 or source_size < sent_byte_count
-        if not replaced_or_truncated:
-            replaced_or_truncated = _file_prefix_sha256(source_file, sent_byte_count) != sent_prefix_sha256
-        if replaced_or_truncated:
-            sent_byte_count = 0
+    sent_byte_count = _read_source_scan_state(config.db_path, source_file)
     if source_size <= sent_byte_count:
         return None
 
@@ -304,27 +565,27 @@ def _build_delta_source_file(config: DirectSyncRuntimeConfig, source_file: Path)
             return None
         data_start = handle.tell()
         start_byte = sent_byte_count if sent_byte_count >= data_start else 0
-        handle.seek(start_byte)
-        delta_body = handle.read()
-
-    complete_delta_body = _complete_line_prefix(delta_body)
-    if not complete_delta_body.strip():
+        end_byte = _complete_delta_end(handle, start_byte)
+    if end_byte is None:
         return None
-    end_byte = start_byte + len(complete_delta_body)
     if start_byte == 0 and end_byte <= data_start:
         return None
-
-    delta_content = complete_delta_body if start_byte == 0 else header + complete_delta_body
-    delta_hash = hashlib.sha256(delta_content).hexdigest()
-    delta_source = (
-        Path(config.spool_dir)
-        / "_scan_delta_inputs"
-        / _source_delta_key(source_file)
-        / f"bytes-{start_byte}-{end_byte}-sha256-{delta_hash[:16]}.csv"
+    superseded: tuple[str, ...] = ()
+    if coalesce_max_bytes > 0 and start_byte:
+        chain = _coalescible_delta_chain(config.db_path, source_file, start_byte)
+        for index, (_relay_id, chain_start_byte) in enumerate(chain):
+            if end_byte - chain_start_byte <= coalesce_max_bytes:
+                start_byte = chain_start_byte
+                superseded = tuple(relay_id for relay_id, _start in chain[index:])
+                break
+    source_range = SourceByteRange(
+        source_file_path=str(source_file),
+        start_byte=start_byte,
+        end_byte=end_byte,
+        relative_path_for_sha256=functools.partial(_delta_relative_path, source_file, start_byte, end_byte),
+        prefix=header if start_byte else b"",
     )
-    delta_source.parent.mkdir(parents=True, exist_ok=True)
-    delta_source.write_bytes(delta_content)
-    return delta_source, _delta_relative_path(source_file, start_byte, end_byte, delta_hash), end_byte
+    return source_range, end_byte, superseded
 
 
 def _scan_source_files(
@@ -369,6 +630,194 @@ def _scan_source_files(
     return [path for _, _, path in files], deferred_count
 
 
+def _scan_changed_source_files(
+    db_path: str | Path,
+    scan_source_dir: str,
+    patterns: list[str],
+    min_file_age_seconds: int = 0,
+    changed_names: set[str] | None = None,
+    now: float | None = None,
+) -> tuple[list[Path], int, int, dict[str, tuple[int, int]]]:
+    """Return the source files whose (size, mtime_ns) differ from the catalog.
+
+    ``changed_names`` (from a directory watcher) limits the stat calls to the
+    notified file names; ``None`` lists the directory once with ``scandir``
+    and also forgets catalog rows of files that are gone.  Returns the
+    changed files oldest first, the deferred and unchanged counts, and the
+    observed ``{path: (size, mtime_ns)}`` of every changed file, deferred ones
+    included, to record once a file is handled.
+    """
+    root = Path(scan_source_dir)
+    if not root.is_dir():
+        raise SystemExit(f"scan source dir does not exist: {root}")
+    root_resolved = root.resolve()
+    scan_patterns = [_validate_source_glob(pattern) for pattern in (patterns or ["*.csv"])]
+    min_age = max(0, int(min_file_age_seconds or 0))
+    current_time = time.time() if now is None else float(now)
+    if changed_names is None:
+        try:
+            with os.scandir(root) as entries:
+                candidates = [(entry.name, entry) for entry in entries]
+        except OSError:
+            candidates = []
+    else:
+        candidates = [(name, None) for name in sorted(changed_names)]
+    conn = _scan_state_connect(db_path)
+    try:
+        catalog = {
+            str(row["source_file_path"]): (int(row["source_size"]), int(row["source_mtime_ns"]))
+            for row in conn.execute("SELECT source_file_path, source_size, source_mtime_ns FROM direct_sync_source_catalog")
+        }
+        observed: dict[str, tuple[int, int]] = {}
+        files: list[tuple[int, str, Path]] = []
+        listed: set[str] = set()
+        deferred_count = 0
+        unchanged_count = 0
+        for name, entry in candidates:
+            if not any(fnmatch.fnmatch(name, pattern) for pattern in scan_patterns):
+                continue
+            path = root / name
+            if not _is_allowed_source_file(path):
+                continue
+            try:
+                if entry is not None:
+                    if entry.is_symlink() or not entry.is_file():
+                        continue
+                    stat_result = entry.stat()
+                else:
+                    if path.is_symlink() or not path.is_file():
+                        continue
+                    stat_result = path.stat()
+            except OSError:
+                continue
+            key = str(root_resolved / name)
+            listed.add(key)
+            signature = (int(stat_result.st_size), int(stat_result.st_mtime_ns))
+            if catalog.get(key) == signature:
+                unchanged_count += 1
+                continue
+            observed[str(path)] = signature
+            if min_age and current_time - stat_result.st_mtime < min_age:
+                deferred_count += 1
+                continue
+            files.append((stat_result.st_mtime_ns, str(path), path))
+        if changed_names is None:
+            gone = [key for key in catalog if key not in listed and Path(key).parent == root_resolved]
+            if gone:
+                conn.executemany("DELETE FROM direct_sync_source_catalog WHERE source_file_path = ?", [(key,) for key in gone])
+                conn.commit()
+    finally:
+        conn.close()
+    files.sort(key=lambda item: (item[0], item[1]))
+    return [path for _, _, path in files], deferred_count, unchanged_count, observed
+
+
+def _record_source_catalog(db_path: str | Path, entries: dict[str, tuple[int, int]]) -> None:
+    if not entries:
+        return
+    now = time.time()
+    conn = _scan_state_connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO direct_sync_source_catalog (
+                source_file_path, source_size, source_mtime_ns, updated_at_unix
+            ) VALUES (?, ?, ?, ?)
+            ON CONFLICT(source_file_path) DO UPDATE SET
+                source_size = excluded.source_size,
+                source_mtime_ns = excluded.source_mtime_ns,
+                updated_at_unix = excluded.updated_at_unix
+            """,
+            [(_source_state_key(Path(path)), size, mtime_ns, now) for path, (size, mtime_ns) in entries.items()],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class SourceDirectoryWatcher:
+    """Collect change notifications for the direct children of a source folder.
+
+    Uses ``ReadDirectoryChangesW`` (pywin32) on a daemon thread.  ``take_changes``
+    returns the file names touched since the previous call, or ``None`` when
+    the caller must fall back to a catalog poll: before the first poll, after
+    a notification overflow or error, and where notifications are unavailable.
+    """
+
+    def __init__(self, scan_source_dir: str | Path) -> None:
+        self.root = Path(scan_source_dir)
+        self._lock = threading.Lock()
+        self._changes: set[str] = set()
+        self._needs_poll = True
+        self._handle = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> SourceDirectoryWatcher:
+        if win32file is None or self._thread is not None:
+            return self
+        try:
+            self._handle = win32file.CreateFile(
+                str(self.root),
+                0x0001,  # FILE_LIST_DIRECTORY
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                None,
+                win32con.OPEN_EXISTING,
+                win32con.FILE_FLAG_BACKUP_SEMANTICS,
+                None,
+            )
+        except Exception:
+            self._handle = None
+            return self
+        self._thread = threading.Thread(target=self._watch, name="direct-sync-source-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def _watch(self) -> None:
+        flags = (
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        while self._handle is not None:
+            try:
+                results = win32file.ReadDirectoryChangesW(self._handle, WATCH_NOTIFY_BUFFER_BYTES, False, flags, None, None)
+            except Exception:
+                with self._lock:
+                    self._needs_poll = True
+                return
+            with self._lock:
+                if not results:
+                    # The notification buffer overflowed; changes were lost.
+                    self._needs_poll = True
+                for _action, name in results or ():
+                    self._changes.add(str(name))
+
+    def take_changes(self) -> set[str] | None:
+        with self._lock:
+            changes, self._changes = self._changes, set()
+            if self._needs_poll or not self.active:
+                self._needs_poll = False
+                return None
+            return changes
+
+    def requeue(self, names: set[str]) -> None:
+        """Return notified names the cycle did not handle to the pending set."""
+        with self._lock:
+            self._changes.update(names)
+
+    def close(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is not None:
+            try:
+                handle.Close()
+            except Exception:
+                pass
+
+
 def _source_file_still_eligible_for_enqueue(
     path: Path,
     scan_source_dir: str,
@@ -406,6 +855,9 @@ def _build_config(args: argparse.Namespace) -> DirectSyncRuntimeConfig:
         operator_pause_path=args.operator_pause_path,
         max_active_queue_count=args.max_active_queue_count,
         max_active_queue_age_seconds=args.max_active_queue_age_seconds,
+        compress_spool=args.compress_spool,
+        acked_retention_seconds=args.acked_retention_seconds,
+        max_acked_spool_bytes=args.max_acked_spool_bytes,
     )
 
 
@@ -464,7 +916,7 @@ def _persist_scan_runtime_status(config: DirectSyncRuntimeConfig, status: dict)
         handle.write("\n")
 
 
-def main(argv: list[str] | None = None) -> int:
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Label_Match direct-sync relay runner")
     parser.add_argument("--db-path", required=True)
     parser.add_argument("--spool-dir", required=True)
@@ -487,13 +939,97 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--max-enqueue-files", type=int, default=100)
     parser.add_argument("--min-source-file-age-seconds", type=int, default=0)
     parser.add_argument("--baseline-existing-source-files", action="store_true")
+    parser.add_argument("--max-batches", type=int, default=1)
+    parser.add_argument("--max-drain-seconds", type=float, default=0)
+    parser.add_argument("--idle-reuse-seconds", type=float, default=DEFAULT_RELAY_IDLE_REUSE_SECONDS)
+    parser.add_argument("--max-concurrent-uploads", type=int, default=1)
+    parser.add_argument("--compress-spool", action="store_true")
+    parser.add_argument("--coalesce-max-bytes", type=int, default=0)
+    parser.add_argument("--acked-retention-seconds", type=int, default=0)
+    parser.add_argument("--max-acked-spool-bytes", type=int, default=0)
+    parser.add_argument("--watch-source-dir", action="store_true")
+    return parser
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = _build_parser()
     args = parser.parse_args(argv)
     if args.enqueue_source_file and args.scan_source_dir:
         parser.error("--enqueue-source-file and --scan-source-dir are mutually exclusive")
     if args.baseline_existing_source_files and not args.scan_source_dir:
         parser.error("--baseline-existing-source-files requires --scan-source-dir")
+    if args.watch_source_dir and not args.scan_source_dir:
+        parser.error("--watch-source-dir requires --scan-source-dir")
+    if args.max_batches < 1:
+        parser.error("--max-batches must be at least 1")
+    if args.max_concurrent_uploads < 1:
+        parser.error("--max-concurrent-uploads must be at least 1")
+
+    return args
+
+
+def _drain_relay_backlog(
+    config: DirectSyncRuntimeConfig,
+    args: argparse.Namespace,
+    session: RelayHttpSession,
+    max_batches: int,
+) -> dict:
+    if max_batches > 1 or args.max_drain_seconds:
+        return run_relay_drain(
+            config,
+            max_batches=max_batches,
+            max_seconds=args.max_drain_seconds,
+            session=session,
+            max_workers=args.max_concurrent_uploads,
+        )
+    return run_relay_once(config, session=session)
+
+
+def run_cycle(
+    config: DirectSyncRuntimeConfig,
+    args: argparse.Namespace,
+    session: RelayHttpSession | None = None,
+    watcher: SourceDirectoryWatcher | None = None,
+) -> dict:
+    """Run the enqueue/scan/drain cycle selected by ``args`` and return its status.
+
+    Every relay upload in the cycle shares ``session`` (one is opened for the
+    cycle when the caller does not pass its own), and queue access on this
+    thread shares one :class:`RelayQueue` connection.  With
+    ``--watch-source-dir`` only catalog-changed source files are scanned,
+    narrowed further to ``watcher``'s notifications when it has them.
+    """
+    owned_session = session is None and not (args.baseline_existing_source_files or args.enqueue_source_file)
+    if owned_session:
+        session = RelayHttpSession(
+            idle_reuse_seconds=args.idle_reuse_seconds,
+            pool_maxsize=max(DEFAULT_RELAY_POOL_MAXSIZE, args.max_concurrent_uploads),
+        )
+    try:
+        with RelayQueue(config.db_path):
+            status = _run_cycle(config, args, session, watcher)
+            if _relay_idle_phase(status):
+                status["retention_report"] = run_relay_retention(config)
+            return status
+    finally:
+        if owned_session:
+            session.close()
+
 
-    config = _build_config(args)
+def _relay_idle_phase(status: dict) -> bool:
+    """Whether the cycle left nothing to upload (or is blocked on disk), so retention may run."""
+    drain_report = status.get("drain_report")
+    if isinstance(drain_report, dict) and drain_report.get("stop_reason") == "queue_empty":
+        return True
+    return status.get("status") in RETENTION_IDLE_STATUSES
+
+
+def _run_cycle(
+    config: DirectSyncRuntimeConfig,
+    args: argparse.Namespace,
+    session: RelayHttpSession | None,
+    watcher: SourceDirectoryWatcher | None = None,
+) -> dict:
     if args.baseline_existing_source_files:
         try:
             status = _baseline_existing_source_files(
@@ -519,14 +1055,29 @@ def main(argv: list[str] | None = None) -> int:
             enqueued_count = 0
             attempted_count = 0
             no_new_count = 0
+            coalesced_count = 0
             preflight_status = None
             pending_delta_progress: dict[str, tuple[Path, int]] = {}
-            source_files, deferred_count = _scan_source_files(
-                args.scan_source_dir,
-                args.source_glob,
-                args.max_enqueue_files,
-                args.min_source_file_age_seconds,
-            )
+            unchanged_count = 0
+            catalog_observed: dict[str, tuple[int, int]] = {}
+            catalog_handled: dict[str, tuple[int, int]] = {}
+            if args.watch_source_dir:
+                changed_names = watcher.take_changes() if watcher is not None else None
+                source_files, deferred_count, unchanged_count, catalog_observed = _scan_changed_source_files(
+                    config.db_path,
+                    args.scan_source_dir,
+                    args.source_glob,
+                    args.min_source_file_age_seconds,
+                    changed_names=changed_names,
+                )
+                watch_mode = "notify" if changed_names is not None else "poll"
+            else:
+                source_files, deferred_count = _scan_source_files(
+                    args.scan_source_dir,
+                    args.source_glob,
+                    args.max_enqueue_files,
+                    args.min_source_file_age_seconds,
+                )
             for source_file in source_files:
                 if enqueued_count >= max_enqueue_files:
                     break
@@ -537,15 +1088,18 @@ def main(argv: list[str] | None = None) -> int:
                 ):
                     deferred_count += 1
                     continue
-                delta = _build_delta_source_file(config, source_file)
+                delta = _build_delta_source_range(config, source_file, args.coalesce_max_bytes)
                 if delta is None:
                     no_new_count += 1
+                    if str(source_file) in catalog_observed:
+                        catalog_handled[str(source_file)] = catalog_observed[str(source_file)]
                     continue
-                delta_source_file, relative_path, sent_byte_count = delta
+                source_range, sent_byte_count, superseded = delta
                 current = enqueue_completed_source_file(
                     config,
-                    source_file_path=delta_source_file,
-                    relative_path=relative_path,
+                    source_file_path=source_file,
+                    source_range=source_range,
+                    supersedes_relay_ids=superseded,
                 )
                 if current["status"] in {"paused_by_operator", "blocked_queue_backpressure", "blocked_disk_pressure"}:
                     preflight_status = current
@@ -554,9 +1108,16 @@ def main(argv: list[str] | None = None) -> int:
                 attempted_count += 1
                 if current["status"] == "enqueued":
                     enqueued_count += 1
+                    if str(source_file) in catalog_observed:
+                        catalog_handled[str(source_file)] = catalog_observed[str(source_file)]
                     last_result = current.get("last_result") if isinstance(current.get("last_result"), dict) else {}
                     relay_id = str(last_result.get("relay_id") or "")
-                    if relay_id:
+                    coalesced_count += len(last_result.get("coalesced_relay_ids") or ())
+                    # While coalescing, a delta queued behind an unsent one of
+                    # the same source waits so later scans can merge into it.
+                    if relay_id and not (
+                        args.coalesce_max_bytes and _source_has_outstanding_delta(config.db_path, source_file, relay_id)
+                    ):
                         pending_delta_progress[relay_id] = (source_file, sent_byte_count)
                 else:
                     current["scan_failed_source_file"] = str(source_file)
@@ -574,10 +1135,26 @@ def main(argv: list[str] | None = None) -> int:
                     )
                 }
             )
+            # Files are only marked seen once handled, so a deferred, failed or
+            # over-limit file is considered again on the next scan.
+            _record_source_catalog(config.db_path, catalog_handled)
+            if args.watch_source_dir and changed_names is not None:
+                # No further notification may arrive for those files, so the
+                # watcher has to report them again on the next cycle.
+                unhandled_names = {
+                    Path(path).name for path in catalog_observed if path not in catalog_handled
+                }
+                if unhandled_names:
+                    watcher.requeue(unhandled_names)
             status["scan_enqueued_count"] = enqueued_count
             status["scan_attempted_count"] = attempted_count
             status["scan_deferred_count"] = deferred_count
             status["scan_no_new_count"] = no_new_count
+            if coalesced_count:
+                status["scan_coalesced_count"] = coalesced_count
+            if args.watch_source_dir:
+                status["scan_unchanged_count"] = unchanged_count
+                status["scan_watch_mode"] = watch_mode
             status["scan_status"] = status["status"]
             recovery = (
                 status.get("queue_backpressure", {}).get("recovery", {})
@@ -597,7 +1174,7 @@ def main(argv: list[str] | None = None) -> int:
                 targeted_drain_results = []
                 relay_status = None
                 for relay_id in list(pending_delta_progress):
-                    current_status = run_relay_once(config, target_relay_id=relay_id)
+                    current_status = run_relay_once(config, session=session, target_relay_id=relay_id)
                     last_result = (
                         current_status.get("last_result")
                         if isinstance(current_status.get("last_result"), dict)
@@ -616,12 +1193,29 @@ def main(argv: list[str] | None = None) -> int:
                     targeted_drain_results.append(targeted_result)
                     relay_status = current_status
                 if relay_status is None:
-                    relay_status = run_relay_once(config)
+                    relay_status = _drain_relay_backlog(config, args, session, args.max_batches)
+                elif (
+                    args.max_batches > len(targeted_drain_results)
+                    and relay_status.get("status") in DRAIN_CONTINUE_STATUSES
+                ):
+                    backlog_status = run_relay_drain(
+                        config,
+                        max_batches=args.max_batches - len(targeted_drain_results),
+                        max_seconds=args.max_drain_seconds,
+                        session=session,
+                        max_workers=args.max_concurrent_uploads,
+                    )
+                    relay_status["drain_report"] = backlog_status["drain_report"]
                 relay_status["scan_status"] = status["scan_status"]
                 relay_status["scan_enqueued_count"] = enqueued_count
                 relay_status["scan_attempted_count"] = attempted_count
                 relay_status["scan_deferred_count"] = deferred_count
                 relay_status["scan_no_new_count"] = no_new_count
+                if coalesced_count:
+                    relay_status["scan_coalesced_count"] = coalesced_count
+                if args.watch_source_dir:
+                    relay_status["scan_unchanged_count"] = unchanged_count
+                    relay_status["scan_watch_mode"] = watch_mode
                 if targeted_drain_results:
                     relay_status["targeted_drain_results"] = targeted_drain_results
                 status = relay_status
@@ -630,7 +1224,11 @@ def main(argv: list[str] | None = None) -> int:
         if "scan_status" in status:
             _persist_scan_runtime_status(config, status)
     else:
-        status = run_relay_once(config)
+        status = _drain_relay_backlog(config, args, session, args.max_batches)
+    return status
+
+
+def _emit_status(status: dict) -> int:
     print(f"direct_sync_relay_status={status['status']}")
     if "scan_status" in status:
         print(f"direct_sync_scan_status={status['scan_status']}")
@@ -642,6 +1240,11 @@ def main(argv: list[str] | None = None) -> int:
         print(f"direct_sync_scan_deferred_count={status['scan_deferred_count']}")
     if "scan_no_new_count" in status:
         print(f"direct_sync_scan_no_new_count={status['scan_no_new_count']}")
+    if "scan_coalesced_count" in status:
+        print(f"direct_sync_scan_coalesced_count={status['scan_coalesced_count']}")
+    if "scan_unchanged_count" in status:
+        print(f"direct_sync_scan_unchanged_count={status['scan_unchanged_count']}")
+        print(f"direct_sync_scan_watch_mode={status.get('scan_watch_mode', '')}")
     if status.get("scan_failed_source_file"):
         print(f"direct_sync_scan_failed_source_file={status['scan_failed_source_file']}")
     targeted_drain_results = status.get("targeted_drain_results") or []
@@ -655,6 +1258,16 @@ def main(argv: list[str] | None = None) -> int:
         print(f"direct_sync_targeted_ack_count={targeted_ack_count}")
         print(f"direct_sync_targeted_attempt_count={len(targeted_drain_results)}")
         targeted_ack_incomplete = targeted_ack_count != len(targeted_drain_results)
+    drain_report = status.get("drain_report")
+    if isinstance(drain_report, dict):
+        for key in ("batches", "bytes", "batches_per_second", "bytes_per_second", "handshakes", "workers", "stop_reason"):
+            print(f"direct_sync_drain_{key}={drain_report.get(key, '')}")
+    retention_report = status.get("retention_report")
+    if isinstance(retention_report, dict) and retention_report.get("status") != "disabled":
+        print(f"direct_sync_retention_status={retention_report.get('status', '')}")
+        for key in ("compacted_count", "orphan_spool_count", "reclaimed_bytes"):
+            if key in retention_report:
+                print(f"direct_sync_retention_{key}={retention_report[key]}")
     if status["status"] in {"blocked_disk_pressure", "blocked_queue_backpressure"} or status.get("scan_status") in {
         "blocked_disk_pressure",
         "blocked_queue_backpressure",
@@ -667,5 +1280,132 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
+def _relay_backlog_remaining(status: dict | None) -> bool:
+    queue_status = status.get("queue") if isinstance(status, dict) else None
+    counts = queue_status.get("counts") if isinstance(queue_status, dict) else None
+    if not isinstance(counts, dict):
+        return False
+    return any(int(counts.get(name) or 0) > 0 for name in SERVE_BACKLOG_STATUSES)
+
+
+def _serve_request(
+    line: str,
+    session: RelayHttpSession | None = None,
+    watchers: dict[str, SourceDirectoryWatcher] | None = None,
+) -> tuple[dict, DirectSyncRuntimeConfig | None, dict | None]:
+    started = time.monotonic()
+    captured_stdout = io.StringIO()
+    captured_stderr = io.StringIO()
+    config = None
+    status = None
+    with redirect_stdout(captured_stdout), redirect_stderr(captured_stderr):
+        try:
+            request = json.loads(line)
+            args = _parse_args([str(value) for value in request["argv"]])
+            config = _build_config(args)
+            watcher = None
+            if watchers is not None and args.watch_source_dir:
+                watch_key = str(Path(args.scan_source_dir).resolve())
+                if watch_key not in watchers:
+                    watchers[watch_key] = SourceDirectoryWatcher(args.scan_source_dir).start()
+                watcher = watchers[watch_key]
+            status = run_cycle(config, args, session, watcher)
+            returncode = _emit_status(status)
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else 2
+        except Exception as exc:
+            print(f"direct_sync_serve_error={exc.__class__.__name__}: {exc}", file=sys.stderr)
+            returncode = 1
+    response = {
+        "returncode": returncode,
+        "stdout": captured_stdout.getvalue(),
+        "stderr": captured_stderr.getvalue(),
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+    }
+    return response, config, status
+
+
+def serve(stdin=None, stdout=None, *, idle_drain_seconds: float = SERVE_IDLE_DRAIN_SECONDS) -> int:
+    """Answer JSON-line cycle requests until stdin closes.
+
+    Each request is ``{"argv": [...]}`` with the same arguments as a one-shot
+    run; the response carries the exit code and the captured output.  When a
+    cycle leaves backlog in the relay queue, the helper keeps uploading it one
+    batch at a time until the backlog clears, checking for requests between
+    batches; after a batch that did not move (retry wait, pause, pressure,
+    error) it waits ``idle_drain_seconds`` or until a request arrives.
+    All cycles and drains share one keep-alive relay session, and
+    ``--watch-source-dir`` requests share one change watcher per source folder.
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    requests: queue.Queue = queue.Queue()
+
+    def read_requests() -> None:
+        try:
+            for request_line in stdin:
+                requests.put(request_line)
+        finally:
+            requests.put(None)
+
+    threading.Thread(target=read_requests, name="direct-sync-serve-reader", daemon=True).start()
+    session = RelayHttpSession()
+    watchers: dict[str, SourceDirectoryWatcher] = {}
+    try:
+        return _serve_loop(requests, stdout, session, idle_drain_seconds, watchers)
+    finally:
+        for watcher in watchers.values():
+            watcher.close()
+        session.close()
+
+
+def _serve_loop(
+    requests: queue.Queue,
+    stdout,
+    session: RelayHttpSession,
+    idle_drain_seconds: float,
+    watchers: dict[str, SourceDirectoryWatcher] | None = None,
+) -> int:
+    drain_config = None
+    drain_now = False
+    while True:
+        try:
+            if drain_config is None:
+                line = requests.get()
+            elif drain_now:
+                # Between batches: a waiting request is answered before the
+                # next upload starts.
+                line = requests.get_nowait()
+            else:
+                line = requests.get(timeout=idle_drain_seconds)
+        except queue.Empty:
+            try:
+                with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                    status = run_relay_once(drain_config, session=session)
+            except Exception:
+                status = None
+            if not _relay_backlog_remaining(status):
+                drain_config = None
+            drain_now = isinstance(status, dict) and status.get("status") in DRAIN_CONTINUE_STATUSES
+            continue
+        if line is None:
+            return 0
+        if not line.strip():
+            continue
+        response, config, status = _serve_request(line, session, watchers)
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+        drain_config = config if _relay_backlog_remaining(status) else None
+        drain_now = drain_config is not None
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == [SERVE_FLAG]:
+        return serve()
+    args = _parse_args(argv)
+    return _emit_status(run_cycle(_build_config(args), args))
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
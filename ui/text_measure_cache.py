@@ -0,0 +1,93 @@
+"""Bounded LRU cache for Tk text measurements and fitted cell text.
+
+Responsive relayouts and session-list refreshes measure the same strings in
+the same fonts over and over.  The cache is Tk-independent: the caller passes
+the measuring callable, and the whole cache is dropped whenever its *scope*
+(UI profile, zoom/DPI scale, base font size) changes, because every cached
+width is only valid for the font metrics in force when it was measured.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+DEFAULT_TEXT_MEASURE_CACHE_SIZE = 4096
+
+
+def font_cache_key(font_spec: object) -> Hashable:
+    """Return a hashable key for a Tk font description."""
+
+    if isinstance(font_spec, (list, tuple)):
+        return tuple(font_cache_key(part) for part in font_spec)
+    return font_spec if isinstance(font_spec, (str, int, float)) else str(font_spec)
+
+
+class TextMeasureCache:
+    """LRU of measured widths and fitted texts, keyed by font and text."""
+
+    def __init__(self, max_entries: int = DEFAULT_TEXT_MEASURE_CACHE_SIZE):
+        self.max_entries = max(1, int(max_entries))
+        self.scope: Hashable = None
+        self._widths: OrderedDict[Hashable, int] = OrderedDict()
+        self._fitted: OrderedDict[Hashable, str] = OrderedDict()
+        # Caller-owned per-font handles (Tk font objects) share the scope.
+        self.handles: dict[Hashable, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._widths) + len(self._fitted)
+
+    def invalidate(self) -> None:
+        self._widths.clear()
+        self._fitted.clear()
+        self.handles.clear()
+
+    def ensure_scope(self, scope: Hashable) -> None:
+        if scope != self.scope:
+            self.invalidate()
+            self.scope = scope
+
+    def _lookup(self, entries: OrderedDict, key: Hashable, compute: Callable[[], object]):
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            entries[key] = value
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            return value
+        self.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def handle(self, font_spec: object, create: Callable[[], object]) -> object:
+        key = font_cache_key(font_spec)
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.handles[key] = create()
+        return handle
+
+    def width(self, font_spec: object, text: str, measure: Callable[[str], int]) -> int:
+        text = str(text)
+        return self._lookup(
+            self._widths,
+            (font_cache_key(font_spec), text),
+            lambda: int(measure(text)),
+        )
+
+    def fitted(
+        self,
+        font_spec: object,
+        available_width: int,
+        text: str,
+        fit: Callable[[], str],
+    ) -> str:
+        return self._lookup(
+            self._fitted,
+            (font_cache_key(font_spec), int(available_width), str(text)),
+            fit,
+        )